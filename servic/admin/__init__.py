@@ -8,6 +8,8 @@ from ..models import (
     Service,
     ServiceImage,
     ServiceContract,
+    ProviderReputation,
+    MediaBlob,
 )
 from .user_admin import CustomUserAdmin
 from .provider_admin import ServiceProviderProfileAdmin, ProviderRequestAdmin
@@ -22,6 +24,8 @@ admin.site.register(ServiceCategory)
 admin.site.register(Service)
 admin.site.register(ServiceImage)
 admin.site.register(ServiceContract)
+admin.site.register(ProviderReputation)
+admin.site.register(MediaBlob)
 
 
 # Configuración del panel de administración
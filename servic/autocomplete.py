@@ -0,0 +1,214 @@
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import transaction
+
+from .cache import get_cache
+from .models import Service, ServiceCategory
+from .search.memory import tokenize
+
+# Versión compartida del índice (en la caché "catalog", común a los workers):
+# cada cambio la incrementa y los demás procesos reconstruyen su copia
+VERSION_KEY = "autocomplete:version"
+
+# Registro de cambios: cada versión guarda el cambio que la produjo, así los
+# demás procesos lo aplican sin reconstruir. Si falta alguno (vencido o
+# descartado) o hay más de MAX_CHANGES pendientes, se reconstruye completo.
+CHANGE_KEY = "autocomplete:change:{}"
+CHANGE_TIMEOUT = 60 * 60
+MAX_CHANGES = 500
+
+# Grupos de claves en orden de prioridad: categorías antes que servicios y,
+# dentro de cada tipo, coincidencias desde el inicio del texto antes que desde
+# otra palabra
+GROUPS = (
+    ("category", False),
+    ("category", True),
+    ("service", False),
+    ("service", True),
+)
+
+
+def normalize(text):
+    return " ".join(tokenize(text))
+
+
+def shared_version():
+    """
+    Versión actual del índice. Si la caché no la tiene (primer uso o
+    descartada) se crea a partir de la hora, así nunca repite un valor anterior.
+    """
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _log_change(change):
+    """Nueva versión con `change` en el registro de cambios"""
+    cache = get_cache()
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        # Sin versión: la nueva parte de la hora y los demás reconstruyen
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        return
+    cache.set(CHANGE_KEY.format(version), change, timeout=CHANGE_TIMEOUT)
+
+
+class PrefixIndex:
+    """
+    Índice de prefijos en memoria para autocompletar: listas ordenadas de
+    claves normalizadas (minúsculas, sin acentos) recorridas con bisect.
+
+    Cada título o nombre se indexa desde el inicio de cada palabra, así "plom"
+    encuentra "Reparación de plomería". Guarda servicios activos y categorías.
+    Cada proceso tiene su copia: se carga en la primera consulta y, cuando
+    cambia la versión compartida (shared_version), aplica los cambios del
+    registro. La versión se consulta a lo sumo una vez cada
+    AUTOCOMPLETE_SYNC_INTERVAL_MS; el proceso que hizo el cambio lo ve enseguida.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = {group: [] for group in GROUPS}
+        self._entries = {}
+        self._version = None
+        self._synced_at = 0.0
+
+    @property
+    def loaded(self):
+        return self._version is not None
+
+    def _keys_for(self, kind, pk, text):
+        words = normalize(text).split(" ")
+        return [
+            ((kind, position > 0), (" ".join(words[position:]), pk))
+            for position in range(len(words))
+            if words[position]
+        ]
+
+    def _add(self, kind, pk, text):
+        keys = self._keys_for(kind, pk, text)
+        for group, key in keys:
+            insort(self._keys[group], key)
+        self._entries[(kind, pk)] = (text, keys)
+
+    def _discard(self, kind, pk):
+        _, keys = self._entries.pop((kind, pk), (None, ()))
+        for group, key in keys:
+            group_keys = self._keys[group]
+            index = bisect_left(group_keys, key)
+            if index < len(group_keys) and group_keys[index] == key:
+                del group_keys[index]
+
+    def _apply(self, kind, pk, text, active):
+        self._discard(kind, pk)
+        if active:
+            self._add(kind, pk, text)
+
+    def update(self, kind, pk, text, active=True):
+        """Registrar un cambio ya confirmado y aplicarlo a la copia local"""
+        _log_change((kind, pk, text, active))
+        if self.loaded:
+            self.sync()
+
+    def remove(self, kind, pk):
+        self.update(kind, pk, None, active=False)
+
+    def update_on_commit(self, kind, pk, text, active=True):
+        # Un cambio deshecho por rollback no llega al índice
+        transaction.on_commit(lambda: self.update(kind, pk, text, active))
+
+    def remove_on_commit(self, kind, pk):
+        transaction.on_commit(lambda: self.remove(kind, pk))
+
+    def rebuild(self, version=None):
+        # La versión se lee antes de consultar: un cambio durante la carga
+        # provoca otra reconstrucción
+        version = shared_version() if version is None else version
+        services = Service.objects.filter(status="active").values_list("pk", "title")
+        categories = ServiceCategory.objects.values_list("pk", "name")
+        entries = {}
+        for kind, rows in (("service", services), ("category", categories)):
+            for pk, text in rows.iterator():
+                entries[(kind, pk)] = (text, self._keys_for(kind, pk, text))
+        keys = {group: [] for group in GROUPS}
+        for _, entry_keys in entries.values():
+            for group, key in entry_keys:
+                keys[group].append(key)
+        for group_keys in keys.values():
+            group_keys.sort()
+        with self._lock:
+            self._entries, self._keys, self._version = entries, keys, version
+
+    def sync(self):
+        """
+        Poner la copia local al día con la versión compartida: aplicar los
+        cambios registrados desde la versión local o, si no están todos,
+        reconstruir desde la base.
+        """
+        version = shared_version()
+        self._synced_at = time.monotonic()
+        with self._lock:
+            current = self._version
+            if version == current:
+                return
+            if current is not None and 0 < version - current <= MAX_CHANGES:
+                keys = [CHANGE_KEY.format(v) for v in range(current + 1, version + 1)]
+                changes = get_cache().get_many(keys)
+                if len(changes) == len(keys):
+                    for key in keys:
+                        self._apply(*changes[key])
+                    self._version = version
+                    return
+        self.rebuild(version)
+
+    def reset(self):
+        with self._lock:
+            self._keys = {group: [] for group in GROUPS}
+            self._entries, self._version = {}, None
+
+    def suggest(self, query, limit=10):
+        """
+        Hasta `limit` sugerencias: primero las categorías, luego las que
+        coinciden desde el inicio del texto y después por orden alfabético.
+        Cada grupo ya está ordenado, así que se recorren en orden de prioridad
+        y se corta al llegar a `limit`: el resultado es el mismo que ordenar
+        todas las coincidencias, sin importar cuántas sean.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        interval = settings.AUTOCOMPLETE_SYNC_INTERVAL_MS / 1000
+        if not self.loaded or time.monotonic() - self._synced_at >= interval:
+            self.sync()
+
+        with self._lock:
+            results, seen = [], set()
+            for group in GROUPS:
+                kind = group[0]
+                group_keys = self._keys[group]
+                index = bisect_left(group_keys, (prefix,))
+                while len(results) < limit and index < len(group_keys):
+                    key, pk = group_keys[index]
+                    if not key.startswith(prefix):
+                        break
+                    if (kind, pk) not in seen:
+                        seen.add((kind, pk))
+                        results.append(
+                            {
+                                "type": kind,
+                                "id": pk,
+                                "text": self._entries[(kind, pk)][0],
+                            }
+                        )
+                    index += 1
+            return results
+
+
+index = PrefixIndex()
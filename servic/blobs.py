@@ -0,0 +1,192 @@
+import os
+import re
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import MediaBlob, ServiceImage, ServiceProviderProfile
+from .renditions import rendition_names
+from .storage import INCOMING_DIR, content_storage
+
+# Campos guardados con ContentAddressedStorage cuyas referencias se cuentan
+FILE_FIELDS = (
+    (ServiceImage, "image"),
+    (ServiceProviderProfile, "certification_file"),
+)
+
+# Antigüedad mínima de un archivo sin referencias para borrarlo: cubre las
+# subidas guardadas en el storage cuya fila todavía no se confirmó
+DEFAULT_GRACE = timedelta(hours=1)
+
+# Nombre relativo a la carpeta de upload_to que genera ContentAddressedStorage
+# (<2 primeros>/<sha256><extensión>); los archivos anteriores no lo cumplen
+BLOB_PATH_RE = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$")
+
+# Nombres consultados por vez al buscar archivos sin fila
+SCAN_BATCH_SIZE = 500
+
+
+def register_blob(name, size):
+    """Registrar (o refrescar) un archivo recién guardado por el storage"""
+    MediaBlob.objects.update_or_create(
+        name=name, defaults={"size": size, "last_stored_at": timezone.now()}
+    )
+
+
+def retain(name, count=1):
+    # Archivos anteriores al storage deduplicado no tienen fila: se ignoran
+    if name:
+        MediaBlob.objects.filter(name=name).update(references=F("references") + count)
+
+
+def release(name):
+    if name:
+        MediaBlob.objects.filter(name=name).update(references=F("references") - 1)
+
+
+def _delete_files(name):
+    # Si el mismo contenido se volvió a subir mientras tanto, conservarlo
+    if MediaBlob.objects.filter(name=name).exists():
+        return
+    content_storage.delete(name)
+    if name.startswith("service_images/"):
+        for names in rendition_names(name).values():
+            for rendition in names.values():
+                content_storage.delete(rendition)
+
+
+def _is_referenced(name):
+    return any(
+        model.objects.filter(**{field: name}).exists() for model, field in FILE_FIELDS
+    )
+
+
+def _stored_files(cutoff):
+    """
+    (nombre, tamaño) de los archivos deduplicados del storage modificados
+    antes de `cutoff` (timestamp). El storage actualiza la fecha de un archivo
+    cada vez que vuelve a guardar su contenido.
+    """
+    directories = {
+        model._meta.get_field(field).upload_to.strip("/")
+        for model, field in FILE_FIELDS
+    }
+    for directory in sorted(directories):
+        base = content_storage.path(directory)
+        for root, _, files in os.walk(base):
+            for filename in files:
+                relative = os.path.relpath(os.path.join(root, filename), base)
+                relative = relative.replace(os.sep, "/")
+                if not BLOB_PATH_RE.match(relative):
+                    continue
+                stat = os.stat(os.path.join(root, filename))
+                if stat.st_mtime < cutoff:
+                    yield f"{directory}/{relative}", stat.st_size
+
+
+def _unregistered_files(cutoff):
+    """
+    Archivos sin fila MediaBlob: la fila se escribe en la transacción de quien
+    subió el archivo, y si esa transacción se deshizo el archivo queda en disco
+    sin registro. Tampoco se devuelven los que alguna fila todavía usa.
+    """
+    batch = []
+
+    def flush():
+        registered = set(
+            MediaBlob.objects.filter(name__in=[name for name, _ in batch]).values_list(
+                "name", flat=True
+            )
+        )
+        for name, size in batch:
+            if name not in registered and not _is_referenced(name):
+                yield name, size
+        batch.clear()
+
+    for item in _stored_files(cutoff):
+        batch.append(item)
+        if len(batch) == SCAN_BATCH_SIZE:
+            yield from flush()
+    yield from flush()
+
+
+def _stale_incoming(cutoff):
+    """Temporales de escrituras interrumpidas (por ejemplo, el proceso murió)"""
+    try:
+        entries = list(os.scandir(content_storage.path(INCOMING_DIR)))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        stat = entry.stat()
+        if entry.is_file() and stat.st_mtime < cutoff:
+            yield entry.path, stat.st_size
+
+
+def collect_orphans(grace=DEFAULT_GRACE, dry_run=False):
+    """
+    Borrar los archivos sin referencias guardados hace más de `grace`.
+    Cada fila se borra con la condición repetida, así un archivo que volvió a
+    usarse entre la consulta y el borrado se conserva.
+
+    También recorre el storage: borra los archivos sin fila MediaBlob (de
+    transacciones deshechas) y los temporales que quedaron en .incoming, con
+    la misma antigüedad mínima. Devuelve (cantidad, bytes liberados).
+    """
+    candidates = MediaBlob.objects.filter(
+        references__lte=0, last_stored_at__lt=timezone.now() - grace
+    ).values_list("name", "size")
+    collected, freed = 0, 0
+    handled = set()
+    for name, size in list(candidates):
+        handled.add(name)
+        if not dry_run:
+            with transaction.atomic():
+                deleted, _ = MediaBlob.objects.filter(
+                    name=name,
+                    references__lte=0,
+                    last_stored_at__lt=timezone.now() - grace,
+                ).delete()
+                if not deleted:
+                    continue
+                transaction.on_commit(lambda name=name: _delete_files(name))
+        collected += 1
+        freed += size
+
+    cutoff = (timezone.now() - grace).timestamp()
+    for name, size in _unregistered_files(cutoff):
+        if name in handled:
+            # Fila borrada arriba: su archivo se borra después del commit
+            continue
+        if not dry_run:
+            _delete_files(name)
+        collected += 1
+        freed += size
+    for path, size in _stale_incoming(cutoff):
+        if not dry_run:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+        collected += 1
+        freed += size
+    return collected, freed
+
+
+def recount_references():
+    """Recalcular `references` desde las tablas que usan los archivos"""
+    counts = {}
+    for model, field in FILE_FIELDS:
+        rows = model.objects.order_by().values(field).annotate(total=Count("pk"))
+        for row in rows:
+            counts[row[field]] = counts.get(row[field], 0) + row["total"]
+    with transaction.atomic():
+        blobs = list(MediaBlob.objects.select_for_update())
+        changed = [
+            blob for blob in blobs if blob.references != counts.get(blob.name, 0)
+        ]
+        for blob in changed:
+            blob.references = counts.get(blob.name, 0)
+        MediaBlob.objects.bulk_update(changed, ["references"], batch_size=1000)
+    return len(changed)
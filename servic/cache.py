@@ -0,0 +1,145 @@
+import hashlib
+import threading
+import uuid
+
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+CACHE_ALIAS = "catalog"
+
+# Parámetros que no cambian la respuesta del catálogo salvo por mayúsculas o espacios
+CASE_INSENSITIVE_PARAMS = {"search"}
+
+LIST_GENERATION = "catalog:gen:list"
+DETAIL_GENERATION = "catalog:gen:detail"
+
+
+def service_generation_key(service_id):
+    return f"catalog:gen:service:{service_id}"
+
+
+class CatalogCacheStats:
+    """Contadores de aciertos/fallos del proceso actual"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def as_dict(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+stats = CatalogCacheStats()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _generations(keys):
+    """
+    Devuelve el valor actual de cada generación. Las generaciones son tokens
+    aleatorios sin vencimiento: invalidar es reemplazarlas, y si el backend las
+    descarta se crea una nueva, así nunca se reutiliza una entrada vieja.
+    """
+    cache = get_cache()
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            values[key] = cache.get(key)
+    return [values[key] for key in keys]
+
+
+def invalidate(service_id=None, all_details=False):
+    """
+    Invalidar los listados y, según el caso, el detalle de un servicio o todos.
+
+    Las generaciones se renuevan al confirmarse la transacción: si se hiciera
+    antes, un GET concurrente podría guardar en la generación nueva filas
+    previas al commit, que quedarían hasta que venza el TTL. Fuera de una
+    transacción se renuevan en el momento.
+    """
+    keys = [LIST_GENERATION]
+    if all_details:
+        keys.append(DETAIL_GENERATION)
+    if service_id is not None:
+        keys.append(service_generation_key(service_id))
+    transaction.on_commit(
+        lambda: get_cache().set_many(
+            {key: uuid.uuid4().hex for key in keys}, timeout=None
+        )
+    )
+
+
+def normalized_params(request, allowed):
+    """Solo los parámetros que usa la vista, ordenados y sin valores vacíos"""
+    params = []
+    for name in sorted(set(request.query_params) & set(allowed)):
+        values = [v.strip() for v in request.query_params.getlist(name) if v.strip()]
+        if name in CASE_INSENSITIVE_PARAMS:
+            values = [" ".join(v.lower().split()) for v in values]
+        if values:
+            params.append((name, tuple(sorted(values))))
+    return params
+
+
+class CatalogCacheMixin:
+    """
+    Cachea la respuesta de GET del catálogo (datos ya serializados).
+
+    La clave combina la vista, el host, los parámetros normalizados y las
+    generaciones de las que depende: todos los listados comparten una, y cada
+    detalle depende de la del servicio y de la global de detalles. Las señales
+    de Service, ServiceImage y ServiceCategory las renuevan (ver signals.py).
+    """
+
+    cache_params = ()
+
+    def get_cache_generations(self):
+        if "pk" in self.kwargs:
+            return _generations(
+                [DETAIL_GENERATION, service_generation_key(self.kwargs["pk"])]
+            )
+        return _generations([LIST_GENERATION])
+
+    def get_cache_key(self, request):
+        raw = repr(
+            (
+                request.get_host(),
+                request.is_secure(),
+                normalized_params(request, self.cache_params),
+                self.kwargs,
+                self.get_cache_generations(),
+            )
+        )
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f"catalog:{self.__class__.__name__}:{digest}"
+
+    def get(self, request, *args, **kwargs):
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        stats.record(hit=data is not None)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,112 @@
+from django.db.models import Prefetch
+
+from .models import Service, ServiceCard, ServiceImage
+from .renditions import image_metadata, rendition_urls
+
+# Campos copiados tal cual desde Service
+SERVICE_FIELDS = (
+    "category_id",
+    "provider_id",
+    "title",
+    "price",
+    "price_type",
+    "location",
+    "status",
+    "created_at",
+    "city",
+    "state",
+    "country",
+    "available_weekdays",
+    "latitude",
+    "longitude",
+    "geohash",
+    "popularity",
+    "rating_avg",
+    "rating_count",
+)
+
+
+def provider_full_name(user):
+    return f"{user.first_name} {user.last_name}"
+
+
+def _primary_image_url(images):
+    return images[0].image.url if images else ""
+
+
+def _primary_image_renditions(images):
+    return rendition_urls(images[0]) if images else {}
+
+
+def _primary_image_metadata(images):
+    return image_metadata(images[0]) if images else None
+
+
+def _services_for_cards():
+    return Service.objects.select_related("category", "provider").prefetch_related(
+        Prefetch(
+            "images",
+            queryset=ServiceImage.objects.filter(is_primary=True),
+            to_attr="primary_images",
+        )
+    )
+
+
+def build_card(service):
+    """Arma la tarjeta de un servicio cargado con _services_for_cards()"""
+    card = ServiceCard(
+        service_id=service.pk,
+        category_name=service.category.name,
+        provider_name=provider_full_name(service.provider),
+        primary_image=_primary_image_url(service.primary_images),
+        primary_image_renditions=_primary_image_renditions(service.primary_images),
+        primary_image_metadata=_primary_image_metadata(service.primary_images),
+    )
+    for field in SERVICE_FIELDS:
+        setattr(card, field, getattr(service, field))
+    return card
+
+
+def sync_service_card(service_id):
+    """Crear o reemplazar la tarjeta de un servicio"""
+    service = _services_for_cards().filter(pk=service_id).first()
+    if service is None:
+        ServiceCard.objects.filter(pk=service_id).delete()
+        return
+    build_card(service).save()
+
+
+def sync_primary_image(service_id):
+    images = list(
+        ServiceImage.objects.filter(service_id=service_id, is_primary=True)[:1]
+    )
+    ServiceCard.objects.filter(pk=service_id).update(
+        primary_image=_primary_image_url(images),
+        primary_image_renditions=_primary_image_renditions(images),
+        primary_image_metadata=_primary_image_metadata(images),
+    )
+
+
+def sync_category_name(category):
+    ServiceCard.objects.filter(category=category).update(category_name=category.name)
+
+
+def sync_provider_name(user):
+    ServiceCard.objects.filter(provider=user).update(
+        provider_name=provider_full_name(user)
+    )
+
+
+def rebuild_service_cards(batch_size=1000):
+    """Regenerar todas las tarjetas desde las tablas de origen"""
+    ServiceCard.objects.all().delete()
+    total = 0
+    batch = []
+    for service in _services_for_cards().order_by("pk").iterator(chunk_size=batch_size):
+        batch.append(build_card(service))
+        if len(batch) == batch_size:
+            ServiceCard.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    ServiceCard.objects.bulk_create(batch)
+    return total + len(batch)
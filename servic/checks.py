@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends que guardan los datos en cada proceso: con varios workers cada uno
+# tendría su propia copia y sus propias generaciones (ver servic/cache.py)
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_catalog_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("catalog", {}).get("BACKEND")
+    if settings.DEBUG or backend not in PER_PROCESS_CACHES:
+        return []
+    return [
+        Error(
+            "La caché 'catalog' es local a cada proceso: las invalidaciones "
+            "no llegan a los demás workers.",
+            hint="Define CATALOG_CACHE_URL (redis://... o memcached://...).",
+            id="servic.E001",
+        )
+    ]
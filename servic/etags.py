@@ -0,0 +1,114 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Service, ServiceCategory
+
+
+def make_etag(*parts):
+    """ETag fuerte a partir de valores que cambian junto con la representación"""
+    return '"%s"' % hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+class ConditionalGetMixin:
+    """
+    Responde 304 Not Modified cuando If-None-Match coincide con la ETag actual.
+
+    Cada vista define `get_etag` usando solo marcas de tiempo o contadores
+    (una consulta liviana como mucho), nunca serializando la respuesta.
+    """
+
+    def get_etag(self, request):
+        raise NotImplementedError
+
+    def get_representation_parts(self, request):
+        # La misma versión cambia de bytes según el host (URLs absolutas), el
+        # formato y la selección de campos (?fields= / ?omit=)
+        return (
+            request.get_host(),
+            getattr(request, "accepted_media_type", ""),
+            request.query_params.get("fields", ""),
+            request.query_params.get("omit", ""),
+        )
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag is not None:
+            if_none_match = request.headers.get("If-None-Match")
+            if if_none_match:
+                candidates = {_strip_weak(tag) for tag in parse_etags(if_none_match)}
+                if "*" in candidates or etag in candidates:
+                    return Response(
+                        status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                    )
+
+        response = super().get(request, *args, **kwargs)
+        if etag is not None and response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+        return response
+
+
+class ServiceETagMixin(ConditionalGetMixin):
+    def get_etag(self, request):
+        version = (
+            Service.objects.filter(pk=self.kwargs["pk"])
+            .values_list("updated_at", "category__updated_at", "provider__email")
+            .first()
+        )
+        if version is None:
+            return None
+        return make_etag(
+            "service",
+            self.kwargs["pk"],
+            version,
+            self.get_representation_parts(request),
+        )
+
+
+class CategoryETagMixin(ConditionalGetMixin):
+    def get_etag(self, request):
+        if "pk" in self.kwargs:
+            version = (
+                ServiceCategory.objects.filter(pk=self.kwargs["pk"])
+                .values_list("updated_at", flat=True)
+                .first()
+            )
+            if version is None:
+                return None
+        else:
+            # Versión de la colección: cualquier alta, cambio o baja la modifica
+            version = ServiceCategory.objects.aggregate(
+                count=Count("id"), last_update=Max("updated_at")
+            )
+            version = (
+                version["count"],
+                version["last_update"],
+                sorted(request.GET.lists()),
+            )
+        return make_etag(
+            "category",
+            self.kwargs.get("pk"),
+            version,
+            self.get_representation_parts(request),
+        )
+
+
+class UserProfileETagMixin(ConditionalGetMixin):
+    def get_etag(self, request):
+        user = request.user
+        return make_etag(
+            "user",
+            user.pk,
+            user.email,
+            user.first_name,
+            user.last_name,
+            user.user_type,
+            self.get_representation_parts(request),
+        )
@@ -0,0 +1,47 @@
+from rest_framework import filters
+
+from .search import get_search_backend
+
+
+class ServiceSearchFilter(filters.BaseFilterBackend):
+    """Búsqueda de texto completo (?search=) delegada al motor configurado"""
+
+    search_param = "search"
+
+    def get_search_terms(self, request):
+        return request.query_params.get(self.search_param, "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_terms(request)
+        if not query:
+            return queryset
+        return get_search_backend().search(queryset, query)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Texto a buscar en título, descripción y ubicación",
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class ServiceOrderingFilter(filters.OrderingFilter):
+    """
+    Sin un orden explícito, ordenar por distancia si hay ?near= y luego por
+    relevancia si hay ?search=
+    """
+
+    def get_default_ordering(self, view):
+        ordering = super().get_default_ordering(view)
+        request = getattr(view, "request", None)
+        if request is None:
+            return ordering
+        if ServiceSearchFilter().get_search_terms(request):
+            ordering = ["-search_rank", *(ordering or [])]
+        if request.query_params.get("near"):
+            ordering = ["distance", *(ordering or [])]
+        return ordering
@@ -0,0 +1,103 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Exists, Subquery
+from django.utils import timezone
+
+from . import blobs, cache, cards, renditions
+from .models import Service, ServiceImage
+
+
+def lock_service(service_id):
+    """
+    Bloquear la fila del servicio hasta el fin de la transacción: los cambios
+    de la imagen principal de un mismo servicio se hacen de a uno.
+    """
+    Service.objects.select_for_update().filter(pk=service_id).exists()
+
+
+def _primary_changed(service_id):
+    # Lo que harían las señales de ServiceImage (queryset.update no las envía)
+    Service.objects.filter(pk=service_id).update(updated_at=timezone.now())
+    cards.sync_primary_image(service_id)
+    cache.invalidate(service_id=service_id)
+
+
+def promote_primary(service_id):
+    """
+    Si el servicio quedó sin imagen principal, marcar la más reciente con un
+    único UPDATE condicional. Devuelve True si marcó alguna.
+    """
+    images = ServiceImage.objects.filter(service_id=service_id)
+    newest = images.order_by("-created_at", "-pk").values("pk")[:1]
+    promoted = (
+        images.filter(pk=Subquery(newest))
+        .filter(~Exists(images.filter(is_primary=True)))
+        .update(is_primary=True)
+    )
+    if promoted:
+        _primary_changed(service_id)
+    return bool(promoted)
+
+
+def set_primary(image):
+    """
+    Marcar `image` como la imagen principal de su servicio.
+
+    La restricción service_image_one_primary se verifica fila por fila, así
+    que primero se desmarca la anterior y después se marca la nueva, con el
+    servicio bloqueado. Lanza ServiceImage.DoesNotExist si la imagen se borró.
+    """
+    with transaction.atomic():
+        lock_service(image.service_id)
+        images = ServiceImage.objects.filter(service_id=image.service_id)
+        images.filter(is_primary=True).exclude(pk=image.pk).update(is_primary=False)
+        if not images.filter(pk=image.pk).update(is_primary=True):
+            # Se borró mientras tanto: deshacer también el UPDATE anterior
+            raise ServiceImage.DoesNotExist
+        _primary_changed(image.service_id)
+    image.is_primary = True
+
+
+def delete_image(image):
+    """
+    Borrar `image`; si era la principal pasa a serlo la más reciente de las
+    que quedan. Lanza ServiceImage.DoesNotExist si ya se había borrado.
+    """
+    with transaction.atomic():
+        lock_service(image.service_id)
+        # Con el queryset las señales solo se envían si la fila todavía existe
+        deleted, _ = ServiceImage.objects.filter(pk=image.pk).delete()
+        if not deleted:
+            raise ServiceImage.DoesNotExist
+        promote_primary(image.service_id)
+
+
+def add_images(service, files, primary=0):
+    """
+    Agregar varias imágenes a `service` con un solo INSERT (bulk_create).
+
+    bulk_create no envía post_save, así que aquí se hace una vez por lote lo
+    que las señales de ServiceImage hacen por imagen: referencias de los
+    archivos, tarjeta del catálogo, caché, updated_at del servicio (ETag) y
+    versiones reducidas. Llamar dentro de una transacción con el servicio
+    bloqueado (lock_service).
+    """
+    # Solo una imagen principal: la de índice `primary`, si el servicio no tenía
+    has_primary = service.images.filter(is_primary=True).exists()
+    images = [
+        ServiceImage(
+            service=service, image=file, is_primary=not has_primary and i == primary
+        )
+        for i, file in enumerate(files)
+    ]
+    ServiceImage.objects.bulk_create(images)
+
+    for name, count in Counter(image.image.name for image in images).items():
+        blobs.retain(name, count)
+    Service.objects.filter(pk=service.pk).update(updated_at=timezone.now())
+    if not has_primary:
+        cards.sync_primary_image(service.pk)
+    cache.invalidate(service_id=service.pk)
+    transaction.on_commit(lambda: renditions.enqueue_renditions(images))
+    return images
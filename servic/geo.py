@@ -0,0 +1,119 @@
+import math
+
+from django.db.models import F, FloatField, IntegerField, Q, Value
+from django.db.models.functions import (
+    ASin,
+    Cast,
+    Cos,
+    Least,
+    Power,
+    Radians,
+    Sin,
+    Sqrt,
+)
+
+# Geohash: celdas rectangulares codificadas en base 32. Dos puntos cercanos
+# comparten prefijo, por lo que "puntos dentro de esta celda" es un rango
+# sobre una columna de texto indexada (sirve igual en PostgreSQL y SQLite).
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_LENGTH = 12
+EARTH_RADIUS_KM = 6371.0088
+
+
+def encode(latitude, longitude, precision=GEOHASH_LENGTH):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, bit_count, even = [], 0, 0, True
+    while len(geohash) < precision:
+        target, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            target[0] = middle
+        else:
+            target[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(geohash)
+
+
+def cell_size(precision):
+    """Alto y ancho (en grados) de una celda de la precisión dada"""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def precision_for_radius(latitude, radius_km):
+    """
+    Mayor precisión cuya celda mide al menos `radius_km` en ambos sentidos: así
+    la celda del centro y sus 8 vecinas cubren todo el círculo de búsqueda.
+    Devuelve None si el radio es tan grande que no conviene filtrar por celdas.
+    """
+    km_per_degree = math.pi * EARTH_RADIUS_KM / 180
+    lon_factor = max(math.cos(math.radians(latitude)), 1e-6)
+    for precision in range(GEOHASH_LENGTH, 0, -1):
+        height, width = cell_size(precision)
+        if min(height, width * lon_factor) * km_per_degree >= radius_km:
+            return precision
+    return None
+
+
+def neighbor_prefixes(latitude, longitude, precision):
+    """Prefijos de la celda que contiene el punto y de sus 8 vecinas"""
+    height, width = cell_size(precision)
+    prefixes = set()
+    for dlat in (-height, 0, height):
+        lat = min(max(latitude + dlat, -90.0), 90.0 - 1e-9)
+        for dlon in (-width, 0, width):
+            lon = (longitude + dlon + 180.0) % 360.0 - 180.0
+            prefixes.add(encode(lat, lon, precision))
+    return sorted(prefixes)
+
+
+def _prefix_upper_bound(prefix):
+    """Menor cadena mayor que todas las que empiezan con `prefix`"""
+    while prefix and prefix[-1] == BASE32[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+
+def geohash_prefix_q(prefixes, field="geohash"):
+    """Q con un rango por prefijo (usa el índice B-tree, no LIKE)"""
+    query = Q()
+    for prefix in prefixes:
+        condition = Q(**{f"{field}__gte": prefix})
+        upper = _prefix_upper_bound(prefix)
+        if upper is not None:
+            condition &= Q(**{f"{field}__lt": upper})
+        query |= condition
+    return query
+
+
+def distance_expression(latitude, longitude):
+    """Distancia haversine en metros (entera) desde el punto a cada fila"""
+    lat1 = Radians(Value(latitude, output_field=FloatField()))
+    lat2 = Radians(F("latitude"))
+    dlat = Radians(F("latitude") - Value(latitude, output_field=FloatField()))
+    dlon = Radians(F("longitude") - Value(longitude, output_field=FloatField()))
+    a = Power(Sin(dlat / 2), 2) + Cos(lat1) * Cos(lat2) * Power(Sin(dlon / 2), 2)
+    # Least evita que el redondeo deje a > 1 (fuera del dominio de asin)
+    meters = 2 * EARTH_RADIUS_KM * 1000 * ASin(Sqrt(Least(a, Value(1.0))))
+    return Cast(meters, IntegerField())
+
+
+def filter_near(queryset, latitude, longitude, radius_km):
+    """Servicios a menos de `radius_km`, anotados con `distance` en metros"""
+    queryset = queryset.filter(latitude__isnull=False, longitude__isnull=False)
+    precision = precision_for_radius(latitude, radius_km)
+    if precision is not None:
+        prefixes = neighbor_prefixes(latitude, longitude, precision)
+        queryset = queryset.filter(geohash_prefix_q(prefixes))
+    return queryset.annotate(distance=distance_expression(latitude, longitude)).filter(
+        distance__lte=radius_km * 1000
+    )
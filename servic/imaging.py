@@ -0,0 +1,183 @@
+"""
+Procesamiento de imágenes que corre en los procesos del pool de
+servic.renditions. Solo depende de Pillow y del sistema de archivos (no importa
+Django) para que los procesos hijos arranquen rápido y no abran conexiones.
+"""
+
+import math
+import os
+
+from PIL import ExifTags, Image, ImageOps
+
+# Formato de Pillow y opciones de guardado por extensión
+FORMATS = {
+    "jpg": ("JPEG", {"optimize": True, "progressive": True}),
+    "webp": ("WEBP", {"method": 4}),
+}
+
+# Orientaciones EXIF que giran la imagen 90°: el ancho y el alto se invierten
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+# Lado de la muestra usada para el color dominante y el placeholder
+SAMPLE_SIDE = 32
+
+# Componentes (horizontales, verticales) del placeholder BlurHash
+PLACEHOLDER_COMPONENTS = (4, 3)
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _flatten(image):
+    """JPEG no admite transparencia: componer sobre fondo blanco"""
+    if image.mode in ("RGB", "L"):
+        return image
+    image = image.convert("RGBA")
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def _encode83(value, length):
+    return "".join(
+        BASE83[value // 83 ** (length - i) % 83] for i in range(1, length + 1)
+    )
+
+
+def _to_linear(value):
+    value /= 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _to_srgb(value):
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(image, components=PLACEHOLDER_COMPONENTS):
+    """
+    Codificar una imagen RGB chica con el algoritmo BlurHash
+    (https://blurha.sh): ~30 caracteres que los clientes decodifican a un
+    difuminado de la foto mientras la descargan.
+    """
+    components_x, components_y = components
+    width, height = image.size
+    pixels = [tuple(_to_linear(c) for c in pixel) for pixel in image.getdata()]
+    cos_x = [
+        [math.cos(math.pi * i * x / width) for x in range(width)]
+        for i in range(components_x)
+    ]
+    cos_y = [
+        [math.cos(math.pi * j * y / height) for y in range(height)]
+        for j in range(components_y)
+    ]
+
+    factors = []
+    for j in range(components_y):
+        for i in range(components_x):
+            normalisation = 1 if i == j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                basis_y = normalisation * cos_y[j][y]
+                for x in range(width):
+                    basis = basis_y * cos_x[i][x]
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = 1 / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((components_x - 1) + (components_y - 1) * 9, 1)
+    if ac:
+        actual_maximum = max(abs(c) for factor in ac for c in factor)
+        quantised_maximum = max(0, min(82, int(actual_maximum * 166 - 0.5)))
+        maximum = (quantised_maximum + 1) / 166
+        result += _encode83(quantised_maximum, 1)
+    else:
+        maximum = 1
+        result += _encode83(0, 1)
+    r, g, b = dc
+    result += _encode83((_to_srgb(r) << 16) + (_to_srgb(g) << 8) + _to_srgb(b), 4)
+    for factor in ac:
+        r, g, b = (
+            max(
+                0,
+                min(
+                    18, math.floor(math.copysign(abs(c / maximum) ** 0.5, c) * 9 + 9.5)
+                ),
+            )
+            for c in factor
+        )
+        result += _encode83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+def dominant_color(image):
+    """Color más frecuente tras reducir la paleta a 5 colores, como #rrggbb"""
+    quantized = image.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    _, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3 : index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _metadata(source_path, size, image):
+    """
+    Datos para que los clientes armen la tarjeta antes de descargar la foto.
+    `size` es el tamaño del original y `image` la versión más chica ya
+    generada, de la que se saca la muestra.
+    """
+    sample = _flatten(image).convert("RGB")
+    sample.thumbnail((SAMPLE_SIDE, SAMPLE_SIDE), Image.BILINEAR)
+    width, height = size
+    return {
+        "width": width,
+        "height": height,
+        "file_size": os.path.getsize(source_path),
+        "dominant_color": dominant_color(sample),
+        "placeholder": blurhash(sample),
+    }
+
+
+def render_image(source_path, targets, quality):
+    """
+    Generar versiones reducidas de `source_path` y devolver sus metadatos
+    (ancho, alto, bytes, color dominante y placeholder).
+
+    `targets` es una lista de (ruta destino, lado máximo en píxeles, extensión).
+    Se decodifica el original una sola vez (JPEG con draft(), que reduce al
+    decodificar) y cada tamaño se obtiene achicando el anterior, de mayor a
+    menor. Nunca se agranda la imagen.
+    """
+    by_side = {}
+    for path, side, extension in targets:
+        by_side.setdefault(side, []).append((path, extension))
+
+    with Image.open(source_path) as original:
+        # Dimensiones reales, antes de que draft() reduzca la decodificación
+        width, height = original.size
+        orientation = original.getexif().get(ExifTags.Base.Orientation)
+        if orientation in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        largest = max(by_side)
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        for side in sorted(by_side, reverse=True):
+            image.thumbnail((side, side), Image.LANCZOS)
+            for path, extension in by_side[side]:
+                pil_format, options = FORMATS[extension]
+                output = _flatten(image) if pil_format == "JPEG" else image
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Escribir a un temporal propio del proceso y renombrar: nunca se
+                # sirve un archivo a medias aunque dos trabajos coincidan
+                partial = f"{path}.{os.getpid()}.part"
+                output.save(partial, pil_format, quality=quality, **options)
+                os.replace(partial, path)
+
+        return _metadata(source_path, (width, height), image)
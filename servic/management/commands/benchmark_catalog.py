@@ -0,0 +1,181 @@
+import json
+import random
+import re
+import statistics
+import time
+from datetime import time as dtime
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from servic.cards import rebuild_service_cards
+from servic.models import Service, ServiceCategory, User
+from servic.views import ServiceListView
+
+CITIES = [f"Ciudad {i}" for i in range(60)]
+STATES = [f"Provincia {i}" for i in range(24)]
+COUNTRIES = ["Argentina", "Chile", "Uruguay", "Paraguay", "Bolivia"]
+PRICE_TYPES = [choice for choice, _ in Service.PRICE_TYPE_CHOICES]
+STATUSES = ["active"] * 8 + ["inactive", "pending"]
+
+# Combinaciones de parámetros de ServiceListView que se miden
+SCENARIOS = [
+    {},
+    {"category": "{category}"},
+    {"city": "Ciudad 7"},
+    {"state": "Provincia 3"},
+    {"country": "Chile"},
+    {"country": "Chile", "state": "Provincia 3", "city": "Ciudad 7"},
+    {"category": "{category}", "city": "Ciudad 7"},
+    {"price_type": "hourly"},
+    {"price_type": "hourly", "ordering": "price"},
+    {"min_price": "100", "max_price": "200"},
+    {"min_price": "100", "max_price": "200", "ordering": "price"},
+    {"ordering": "-price"},
+    {"ordering": "-popularity"},
+    {"min_rating": "4"},
+    {"available_day": "Sábado"},
+]
+
+# Planes que recorren toda la tabla de servicios sin índice
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on servic_servicecard\b"),
+    "sqlite": re.compile(r"SCAN servic_servicecard(?! USING)"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga un catálogo grande de servicios y registra el plan (EXPLAIN) y el "
+        "tiempo de cada combinación de filtros del listado público"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--services", type=int, default=50000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--output", help="Ruta de un archivo JSON donde guardar los resultados"
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Conservar los datos generados (por defecto se revierten)",
+        )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Terminar con error si algún plan recorre la tabla completa",
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        with transaction.atomic():
+            categories = self.seed(options["services"], options["categories"])
+            results = [
+                self.measure(scenario, categories, options["repeat"])
+                for scenario in SCENARIOS
+            ]
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(results, fh, ensure_ascii=False, indent=2)
+
+        seq_scans = [r for r in results if r["seq_scan"]]
+        for result in results:
+            style = self.style.WARNING if result["seq_scan"] else self.style.SUCCESS
+            self.stdout.write(
+                style(
+                    f"{result['median_ms']:8.2f} ms  "
+                    f"{'SEQ SCAN' if result['seq_scan'] else 'índice  '}  "
+                    f"{result['params'] or '(sin filtros)'}"
+                )
+            )
+        if seq_scans and options["fail_on_seq_scan"]:
+            raise CommandError(
+                f"{len(seq_scans)} combinaciones de filtros usan un recorrido secuencial"
+            )
+
+    def seed(self, total, category_count):
+        provider, _ = User.objects.get_or_create(
+            email="benchmark@servic.local",
+            defaults={"username": "benchmark", "user_type": "provider"},
+        )
+        categories = [
+            ServiceCategory.objects.get_or_create(
+                name=f"Benchmark {i}", defaults={"description": "Benchmark"}
+            )[0]
+            for i in range(category_count)
+        ]
+        batch = []
+        for i in range(total):
+            batch.append(
+                Service(
+                    title=f"Servicio de prueba {i}",
+                    description="Servicio generado para el benchmark del catálogo",
+                    category=random.choice(categories),
+                    provider=provider,
+                    price=Decimal(random.randint(10, 1000)),
+                    price_type=random.choice(PRICE_TYPES),
+                    location="Centro",
+                    city=random.choice(CITIES),
+                    state=random.choice(STATES),
+                    country=random.choice(COUNTRIES),
+                    availability_start=dtime(9, 0),
+                    availability_end=dtime(18, 0),
+                    available_weekdays=random.randint(1, 127),
+                    status=random.choice(STATUSES),
+                )
+            )
+            if len(batch) == 1000:
+                Service.objects.bulk_create(batch)
+                batch = []
+        Service.objects.bulk_create(batch)
+        # bulk_create no dispara señales: generar las tarjetas del catálogo
+        rebuild_service_cards()
+
+        # Actualizar estadísticas para que el planificador conozca los datos nuevos
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        return categories
+
+    def build_queryset(self, params):
+        factory = APIRequestFactory()
+        view = ServiceListView()
+        view.request = Request(factory.get("/api/services/", params))
+        view.format_kwarg = None
+        view.args, view.kwargs = (), {}
+        queryset = view.filter_queryset(view.get_queryset())
+        paginator = view.paginator
+        ordering = paginator.get_ordering(view.request, queryset, view)
+        page_size = paginator.get_page_size(view.request)
+        return queryset.order_by(*ordering)[: page_size + 1]
+
+    def measure(self, scenario, categories, repeat):
+        params = {
+            key: value.format(category=categories[0].pk)
+            for key, value in scenario.items()
+        }
+        queryset = self.build_queryset(params)
+        plan = queryset.explain()
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - start) * 1000)
+
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        return {
+            "params": params,
+            "median_ms": round(statistics.median(timings), 3),
+            "max_ms": round(max(timings), 3),
+            "seq_scan": bool(pattern and pattern.search(plan)),
+            "plan": plan,
+        }
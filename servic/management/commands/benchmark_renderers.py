@@ -0,0 +1,98 @@
+import random
+import statistics
+import time
+from datetime import time as dtime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from servic.models import Service
+from servic.renderers import MessagePackRenderer, OrjsonRenderer
+
+PRICE_TYPES = [choice for choice, _ in Service.PRICE_TYPE_CHOICES]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el tiempo de codificación de listados grandes de servicios con el "
+        "JSONRenderer de DRF, OrjsonRenderer y MessagePackRenderer"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--services", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        total = options["services"]
+        payloads = {
+            # Como sale de los serializadores: todo ya convertido a texto
+            "serializado": [self.service(i, raw=False) for i in range(total)],
+            # Decimal, time y datetime sin convertir (pasan por el encoder)
+            "tipos Python": [self.service(i, raw=True) for i in range(total)],
+        }
+        renderers = {
+            "json (DRF)": JSONRenderer(),
+            "orjson": OrjsonRenderer(),
+            "msgpack": MessagePackRenderer(),
+        }
+        for name, payload in payloads.items():
+            data = {"next": None, "previous": None, "results": payload}
+            reference = None
+            for renderer_name, renderer in renderers.items():
+                elapsed, content = self.measure(renderer, data, options["repeat"])
+                if renderer_name == "json (DRF)":
+                    reference = (elapsed, content)
+                elif renderer_name == "orjson" and content != reference[1]:
+                    raise CommandError(f"orjson difiere del JSON de DRF ({name})")
+                self.stdout.write(
+                    f"{name:13} {renderer_name:11} {elapsed:9.2f} ms  "
+                    f"x{reference[0] / elapsed:5.2f}  {len(content):>10} bytes"
+                )
+
+    def measure(self, renderer, data, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            content = renderer.render(data, renderer.media_type)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), content
+
+    def service(self, i, raw):
+        price = Decimal(random.randint(1000, 100000)) / 100
+        created_at = timezone.localtime() - timedelta(minutes=random.randint(0, 10**6))
+        values = {
+            "price": price,
+            "availability_start": dtime(9, 0),
+            "availability_end": dtime(18, 30),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        if not raw:
+            values = {
+                key: value if isinstance(value, Decimal) else value.isoformat()
+                for key, value in values.items()
+            }
+            values["price"] = f"{price:.2f}"
+        return {
+            "id": i,
+            "title": f"Servicio de prueba {i}",
+            "description": "Reparación de cañerías, instalación de grifería y más",
+            "category": random.randint(1, 20),
+            "category_name": "Plomería",
+            "provider_email": f"prestador{i % 500}@ejemplo.com",
+            "price_type": random.choice(PRICE_TYPES),
+            "location": "Centro",
+            "city": "Córdoba",
+            "latitude": random.uniform(-55, -22),
+            "longitude": random.uniform(-73, -53),
+            "available_days": "Lunes,Martes,Miércoles",
+            "status": "active",
+            "images": [
+                {"id": i * 2, "image": f"/media/services/{i}.jpg", "is_primary": True}
+            ],
+            **values,
+        }
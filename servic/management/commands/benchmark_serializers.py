@@ -0,0 +1,150 @@
+import random
+import statistics
+import time
+from datetime import time as dtime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from servic.cards import rebuild_service_cards
+from servic.models import Service, ServiceCard, ServiceCategory, ServiceContract, User
+from servic.serializers import ServiceCardSerializer
+from servic.serializers.contract_serializers import ServiceContractSerializer
+from servic.serializers.values import (
+    ServiceCardValuesSerializer,
+    ServiceContractValuesSerializer,
+)
+
+PRICE_TYPES = [choice for choice, _ in Service.PRICE_TYPE_CHOICES]
+CONTRACT_STATUSES = [choice for choice, _ in ServiceContract.STATUS_CHOICES]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el serializador DRF con el camino rápido basado en .values() "
+        "para los listados de servicios y contratos (tiempo y bytes del JSON)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Conservar los datos generados (por defecto se revierten)",
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        renderer = JSONRenderer()
+        with transaction.atomic():
+            self.seed(options["rows"])
+            cards = ServiceCard.objects.order_by("-created_at", "-pk")
+            contracts = ServiceContract.objects.order_by("-created_at", "-id")
+            cases = [
+                (
+                    "servicios",
+                    lambda: ServiceCardSerializer(cards, many=True).data,
+                    lambda: self.values_path(ServiceCardValuesSerializer, cards),
+                ),
+                (
+                    "contratos",
+                    lambda: ServiceContractSerializer(
+                        contracts.select_related("service", "client", "provider"),
+                        many=True,
+                    ).data,
+                    lambda: self.values_path(
+                        ServiceContractValuesSerializer, contracts
+                    ),
+                ),
+            ]
+            for name, drf, fast in cases:
+                drf_ms, drf_bytes = self.measure(drf, renderer, options["repeat"])
+                fast_ms, fast_bytes = self.measure(fast, renderer, options["repeat"])
+                if drf_bytes != fast_bytes:
+                    raise CommandError(f"El JSON de {name} difiere entre ambos caminos")
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{name:10} DRF {drf_ms:9.2f} ms  values {fast_ms:9.2f} ms  "
+                        f"x{drf_ms / fast_ms:5.2f}  ({len(drf_bytes)} bytes idénticos)"
+                    )
+                )
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    def values_path(self, serializer_class, queryset):
+        serializer = serializer_class()
+        return serializer.many(serializer.get_queryset(queryset))
+
+    def measure(self, build, renderer, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            content = renderer.render(build())
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), content
+
+    def seed(self, total):
+        provider, _ = User.objects.get_or_create(
+            email="benchmark@servic.local",
+            defaults={
+                "username": "benchmark",
+                "user_type": "provider",
+                "first_name": "Prestador",
+                "last_name": "Benchmark",
+            },
+        )
+        client, _ = User.objects.get_or_create(
+            email="benchmark-cliente@servic.local",
+            defaults={"username": "benchmark-cliente", "user_type": "client"},
+        )
+        category, _ = ServiceCategory.objects.get_or_create(
+            name="Benchmark", defaults={"description": "Benchmark"}
+        )
+        services = Service.objects.bulk_create(
+            [
+                Service(
+                    title=f"Servicio de prueba {i}",
+                    description="Servicio generado para el benchmark de serialización",
+                    category=category,
+                    provider=provider,
+                    price=Decimal(random.randint(1000, 100000)) / 100,
+                    price_type=random.choice(PRICE_TYPES),
+                    location="Centro",
+                    city="Córdoba",
+                    state="Córdoba",
+                    country="Argentina",
+                    availability_start=dtime(9, 0),
+                    availability_end=dtime(18, 0),
+                    available_weekdays=random.randint(1, 127),
+                    status="active",
+                )
+                for i in range(total)
+            ],
+            batch_size=1000,
+        )
+        # bulk_create no dispara señales: generar las tarjetas del catálogo
+        rebuild_service_cards()
+
+        now = timezone.now()
+        ServiceContract.objects.bulk_create(
+            [
+                ServiceContract(
+                    service=service,
+                    client=client,
+                    provider=provider,
+                    status=random.choice(CONTRACT_STATUSES),
+                    start_date=now + timedelta(days=random.randint(1, 60)),
+                    end_date=random.choice([None, now]),
+                    description="Contrato generado para el benchmark",
+                    location="Centro",
+                    client_rating=random.choice([None, 3, 4, 5]),
+                )
+                for service in services
+            ],
+            batch_size=1000,
+        )
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from servic.blobs import DEFAULT_GRACE, collect_orphans, recount_references
+from servic.uploads import purge_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra las imágenes y certificados deduplicados que ya no usa ninguna "
+        "fila y las subidas por partes vencidas (programar periódicamente, por "
+        "ejemplo con cron)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=DEFAULT_GRACE.total_seconds() / 3600,
+            help="Antigüedad mínima en horas de un archivo sin referencias",
+        )
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recalcular antes las referencias desde la base",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informar qué se borraría",
+        )
+
+    def handle(self, *args, **options):
+        if not options["dry_run"]:
+            expired = purge_expired()
+            self.stdout.write(f"{expired} subidas por partes vencidas borradas")
+        if options["recount"]:
+            fixed = recount_references()
+            self.stdout.write(f"{fixed} conteos de referencias corregidos")
+        collected, freed = collect_orphans(
+            grace=timedelta(hours=options["grace_hours"]),
+            dry_run=options["dry_run"],
+        )
+        action = "se borrarían" if options["dry_run"] else "borrados"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{collected} archivos {action} ({freed / 1024 / 1024:.1f} MB)"
+            )
+        )
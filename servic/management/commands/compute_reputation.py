@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from servic.reputation import compute_provider_reputation
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula la reputación de los prestadores verificados para el ranking "
+        "(programar periódicamente, por ejemplo con cron)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = compute_provider_reputation(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} prestadores calificados"))
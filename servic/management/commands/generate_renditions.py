@@ -0,0 +1,36 @@
+from concurrent.futures import wait
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from servic.models import ServiceImage
+from servic.renditions import enqueue_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera las versiones reducidas (miniaturas y WebP) y los metadatos de "
+        "las imágenes de servicios que aún no los tienen, usando el pool de "
+        "procesos"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerar también las imágenes que ya tienen versiones",
+        )
+
+    def handle(self, *args, **options):
+        images = ServiceImage.objects.all()
+        if not options["all"]:
+            images = images.filter(Q(renditions={}) | Q(width__isnull=True))
+        images = list(images)
+        futures = enqueue_renditions(images)
+        wait(futures)
+        failed = sum(1 for future in futures if future.exception())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(images) - failed} imágenes procesadas, {failed} con error"
+            )
+        )
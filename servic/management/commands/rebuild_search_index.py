@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from servic.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de servicios con el motor configurado"
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Índice reconstruido con {backend.__class__.__name__}")
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from servic.cards import rebuild_service_cards
+
+
+class Command(BaseCommand):
+    help = "Regenera la tabla desnormalizada de tarjetas del catálogo (ServiceCard)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_service_cards(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} tarjetas regeneradas"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from servic.ratings import recompute_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula rating_avg y rating_count de todos los servicios desde las "
+        "calificaciones de sus contrataciones"
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = recompute_ratings()
+        self.stdout.write(self.style.SUCCESS(f"{total} servicios recalculados"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from servic.popularity import rebuild_popularity
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula la popularidad de todos los servicios desde sus contrataciones "
+        "completadas (las señales la mantienen al día; útil tras cargas masivas)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_popularity(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} servicios actualizados"))
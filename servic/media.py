@@ -0,0 +1,159 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+
+from .models import ServiceProviderProfile
+
+# Carpetas que solo ven los administradores y el dueño del archivo
+PRIVATE_PREFIXES = ("certifications/",)
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def resolve(path):
+    """
+    Ruta absoluta de `path` dentro de MEDIA_ROOT, o Http404. Rechaza `..`,
+    rutas absolutas y carpetas internas (.incoming, .uploads).
+    """
+    normalized = posixpath.normpath(path).lstrip("/")
+    parts = normalized.split("/")
+    if normalized != path or any(part.startswith(".") for part in parts):
+        raise Http404
+    full_path = os.path.join(settings.MEDIA_ROOT, *parts)
+    if not os.path.isfile(full_path):
+        raise Http404
+    return full_path
+
+
+def is_private(path):
+    return path.startswith(PRIVATE_PREFIXES)
+
+
+def can_read(user, path):
+    """Los archivos privados: administradores y el prestador que lo subió"""
+    if not is_private(path):
+        return True
+    if not user.is_authenticated:
+        return False
+    if user.is_staff:
+        return True
+    return ServiceProviderProfile.objects.filter(
+        user=user, certification_file=path
+    ).exists()
+
+
+def parse_range(header, size):
+    """
+    (inicio, fin inclusive) de un Range de un solo intervalo, None si no hay
+    que usarlo (ausente o varios intervalos: se envía completo) o "invalid" si
+    no se puede satisfacer.
+    """
+    match = RANGE_RE.match(header or "")
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        # Sufijo: los últimos N bytes
+        if not end or int(end) == 0:
+            return "invalid"
+        return max(size - int(end), 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or end < start:
+        return "invalid"
+    return start, end
+
+
+class RangeFile:
+    """Lectura limitada a [inicio, fin] de un archivo abierto, para FileResponse"""
+
+    def __init__(self, file, start, end):
+        self.file = file
+        self.remaining = end - start + 1
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _offloaded(path, full_path):
+    """Respuesta vacía que el proxy completa con el archivo, o None"""
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    response = HttpResponse()
+    if backend == "x-accel-redirect":
+        # nginx: location interna (internal;) con alias a MEDIA_ROOT
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(
+            path
+        )
+    elif backend == "x-sendfile":
+        response["X-Sendfile"] = full_path
+    else:
+        return None
+    # El proxy decide el tipo a partir del archivo
+    del response["Content-Type"]
+    return response
+
+
+def serve(request, path, full_path):
+    """
+    Enviar el archivo respondiendo If-None-Match / If-Modified-Since (304),
+    If-Match / If-Unmodified-Since (412) y Range (206/416). Con
+    MEDIA_SENDFILE_BACKEND el envío de los bytes lo hace el proxy; si no, se
+    usa FileResponse, que con el archivo completo usa wsgi.file_wrapper
+    (sendfile en gunicorn y uWSGI).
+    """
+    stat = os.stat(full_path)
+    etag = '"%x-%x"' % (stat.st_mtime_ns, stat.st_size)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _offloaded(path, full_path) or _file_response(
+            request, full_path, stat.st_size, etag
+        )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    if is_private(path):
+        response["Cache-Control"] = "private, no-cache"
+    else:
+        response["Cache-Control"] = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+    return response
+
+
+def _file_response(request, full_path, size, etag):
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    byte_range = parse_range(request.headers.get("Range"), size)
+    # If-Range: solo se envía el rango si el archivo no cambió
+    if_range = request.headers.get("If-Range")
+    if byte_range is not None and if_range and etag not in parse_etags(if_range):
+        byte_range = None
+
+    if byte_range == "invalid":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+    elif byte_range is not None:
+        start, end = byte_range
+        response = FileResponse(
+            RangeFile(open(full_path, "rb"), start, end),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+    response["Accept-Ranges"] = "bytes"
+    return response
@@ -1,3 +1,4 @@
 from .provider_middleware import ServiceProviderMiddleware
+from .compression_middleware import CompressionMiddleware
 
-__all__ = ["ServiceProviderMiddleware"]
+__all__ = ["ServiceProviderMiddleware", "CompressionMiddleware"]
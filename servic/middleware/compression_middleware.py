@@ -0,0 +1,304 @@
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+# brotli y zstd son opcionales: sin la librería el algoritmo no se ofrece
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class GzipStream:
+    def __init__(self, level):
+        # wbits=31: formato gzip (cabecera + CRC)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+# Orden de preferencia cuando el cliente acepta varios con la misma calidad
+ENCODINGS = {}
+if zstandard is not None:
+    ENCODINGS["zstd"] = ZstdStream
+if brotli is not None:
+    ENCODINGS["br"] = BrotliStream
+ENCODINGS["gzip"] = GzipStream
+
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Contenido que ya viene comprimido: recomprimirlo solo gasta CPU
+COMPRESSED_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/zstd",
+    "application/pdf",
+)
+
+
+def parse_accept_encoding(header):
+    """{"gzip": 1.0, "br": 0.8, ...} a partir de Accept-Encoding"""
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(header, available=ENCODINGS):
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name in available:
+        quality = accepted.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionStats:
+    """Bytes antes/después y tiempo de CPU por ruta y algoritmo (proceso actual)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, encoding, level, size_in, size_out, cpu_seconds):
+        with self._lock:
+            entry = self._routes.setdefault(route or "-", {}).setdefault(
+                encoding,
+                {
+                    "level": level,
+                    "responses": 0,
+                    "bytes_in": 0,
+                    "bytes_out": 0,
+                    "cpu_seconds": 0.0,
+                },
+            )
+            entry["level"] = level
+            entry["responses"] += 1
+            entry["bytes_in"] += size_in
+            entry["bytes_out"] += size_out
+            entry["cpu_seconds"] += cpu_seconds
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                route: {
+                    encoding: {
+                        "level": entry["level"],
+                        "responses": entry["responses"],
+                        "bytes_in": entry["bytes_in"],
+                        "bytes_out": entry["bytes_out"],
+                        "ratio": (
+                            round(entry["bytes_out"] / entry["bytes_in"], 4)
+                            if entry["bytes_in"]
+                            else 0.0
+                        ),
+                        "cpu_ms": round(entry["cpu_seconds"] * 1000, 3),
+                        "cpu_ms_per_mb": (
+                            round(
+                                entry["cpu_seconds"] * 1000 * 2**20 / entry["bytes_in"],
+                                3,
+                            )
+                            if entry["bytes_in"]
+                            else 0.0
+                        ),
+                    }
+                    for encoding, entry in encodings.items()
+                }
+                for route, encodings in self._routes.items()
+            }
+
+
+stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    Comprime las respuestas de la API con zstd, brotli o gzip según
+    Accept-Encoding (q-values incluidos), también las de streaming.
+
+    Configuración (settings):
+    - COMPRESSION_PATH_PREFIX: solo se comprimen rutas bajo este prefijo ("/api/")
+    - COMPRESSION_MIN_SIZE: bytes mínimos para comprimir una respuesta normal
+    - COMPRESSION_LEVELS: nivel por algoritmo, ej. {"gzip": 6, "br": 4, "zstd": 3}
+    - COMPRESSION_ROUTE_LEVELS: niveles por nombre de URL, ej.
+      {"list-contracts": {"gzip": 9}}; un nivel None desactiva ese algoritmo
+
+    Las métricas por ruta quedan en `stats` (panel de administración) y cada
+    respuesta normal informa el costo en el encabezado Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        prefix = getattr(settings, "COMPRESSION_PATH_PREFIX", "/api/")
+        if not request.path_info.startswith(prefix) or not self.compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        route = getattr(request.resolver_match, "url_name", None)
+        levels = self.get_levels(route)
+        available = {name: ENCODINGS[name] for name in ENCODINGS if levels.get(name)}
+        encoding = choose_encoding(
+            request.headers.get("Accept-Encoding", ""), available
+        )
+        if encoding is None:
+            return response
+
+        stream_class, level = ENCODINGS[encoding], levels[encoding]
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.compress_async_stream(
+                    response.streaming_content, stream_class, level, route, encoding
+                )
+            else:
+                response.streaming_content = self.compress_stream(
+                    response.streaming_content, stream_class, level, route, encoding
+                )
+            del response.headers["Content-Length"]
+        else:
+            content = response.content
+            start = time.thread_time()
+            stream = stream_class(level)
+            compressed = stream.compress(content) + stream.finish()
+            cpu_seconds = time.thread_time() - start
+            stats.record(
+                route, encoding, level, len(content), len(compressed), cpu_seconds
+            )
+            # Si no se gana nada se envía el original
+            if len(compressed) >= len(content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+            response.headers["Server-Timing"] = (
+                f'compress;dur={cpu_seconds * 1000:.3f};desc="{encoding} {level} '
+                f'{len(compressed) / len(content):.3f}"'
+            )
+
+        # Los bytes cambian con la codificación: la ETag deja de ser fuerte
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def get_levels(self, route):
+        levels = {**DEFAULT_LEVELS, **getattr(settings, "COMPRESSION_LEVELS", {})}
+        route_levels = getattr(settings, "COMPRESSION_ROUTE_LEVELS", {})
+        levels.update(route_levels.get(route, {}))
+        return levels
+
+    def compressible(self, response):
+        if response.status_code not in (200, 201, 203) or response.has_header(
+            "Content-Encoding"
+        ):
+            return False
+        content_type = response.get("Content-Type", "").lower()
+        if content_type.startswith(COMPRESSED_TYPES):
+            return False
+        if response.streaming:
+            return True
+        return len(response.content) >= getattr(settings, "COMPRESSION_MIN_SIZE", 512)
+
+    def compress_stream(self, chunks, stream_class, level, route, encoding):
+        stream = stream_class(level)
+        size_in = size_out = 0
+        cpu_seconds = 0.0
+        for chunk in chunks:
+            start = time.thread_time()
+            data = stream.compress(chunk) + stream.flush()
+            cpu_seconds += time.thread_time() - start
+            size_in += len(chunk)
+            size_out += len(data)
+            if data:
+                yield data
+        data = stream.finish()
+        stats.record(route, encoding, level, size_in, size_out + len(data), cpu_seconds)
+        if data:
+            yield data
+
+    async def compress_async_stream(self, chunks, stream_class, level, route, encoding):
+        stream = stream_class(level)
+        size_in = size_out = 0
+        cpu_seconds = 0.0
+        async for chunk in chunks:
+            start = time.thread_time()
+            data = stream.compress(chunk) + stream.flush()
+            cpu_seconds += time.thread_time() - start
+            size_in += len(chunk)
+            size_out += len(data)
+            if data:
+                yield data
+        data = stream.finish()
+        stats.record(route, encoding, level, size_in, size_out + len(data), cpu_seconds)
+        if data:
+            yield data
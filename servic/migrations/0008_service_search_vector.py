@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:15
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# El índice GIN y el cálculo inicial solo aplican en PostgreSQL; en otros
+# motores el campo queda vacío y se usa servic.search.memory.
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS servic_service_search_gin "
+        "ON servic_service USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "UPDATE servic_service SET search_vector = "
+        "setweight(to_tsvector('spanish', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('spanish', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('spanish', coalesce(location, '')), 'C')"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS servic_service_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servic', '0007_servicecontract'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:40
+
+import unicodedata
+
+from django.db import migrations, models
+
+DAY_NAMES = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+
+
+def _normalize(name):
+    name = unicodedata.normalize("NFKD", name.strip().lower())
+    return "".join(c for c in name if not unicodedata.combining(c))
+
+
+def days_to_mask(apps, schema_editor):
+    Service = apps.get_model("servic", "Service")
+    bits = {_normalize(name): 1 << i for i, name in enumerate(DAY_NAMES)}
+    services = Service.objects.only("id", "available_days")
+    for service in services.iterator():
+        mask = 0
+        for name in (service.available_days or "").split(","):
+            mask |= bits.get(_normalize(name), 0)
+        service.available_weekdays = mask
+        service.save(update_fields=["available_weekdays"])
+
+
+def mask_to_days(apps, schema_editor):
+    Service = apps.get_model("servic", "Service")
+    services = Service.objects.only("id", "available_weekdays")
+    for service in services.iterator():
+        service.available_days = ",".join(
+            name
+            for i, name in enumerate(DAY_NAMES)
+            if service.available_weekdays & (1 << i)
+        )
+        service.save(update_fields=["available_days"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servic', '0008_service_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='available_weekdays',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='available_days',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.RunPython(days_to_mask, mask_to_days),
+        migrations.RemoveField(
+            model_name='service',
+            name='available_days',
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servic', '0009_service_available_weekdays'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-created_at', '-id'], name='service_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['category', '-created_at', '-id'], name='service_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['country', 'state', 'city'], name='service_active_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['state', '-created_at', '-id'], name='service_active_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['city', '-created_at', '-id'], name='service_active_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['price_type', 'price'], name='service_active_price_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['price'], name='service_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['status', '-created_at'], name='service_status_idx'),
+        ),
+    ]
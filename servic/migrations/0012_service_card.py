@@ -0,0 +1,225 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_cards(apps, schema_editor):
+    Service = apps.get_model("servic", "Service")
+    ServiceCard = apps.get_model("servic", "ServiceCard")
+    ServiceImage = apps.get_model("servic", "ServiceImage")
+    copied = [
+        "category_id", "provider_id", "title", "price", "price_type", "location",
+        "status", "created_at", "city", "state", "country", "available_weekdays",
+        "latitude", "longitude", "geohash",
+    ]
+    primary_images = {
+        image.service_id: image.image.url
+        for image in ServiceImage.objects.filter(is_primary=True)
+    }
+    cards = []
+    for service in Service.objects.select_related("category", "provider").iterator():
+        card = ServiceCard(
+            service_id=service.pk,
+            category_name=service.category.name,
+            provider_name=f"{service.provider.first_name} {service.provider.last_name}",
+            primary_image=primary_images.get(service.pk, ""),
+        )
+        for field in copied:
+            setattr(card, field, getattr(service, field))
+        cards.append(card)
+    ServiceCard.objects.bulk_create(cards, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("servic", "0011_geo_location"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ServiceCard",
+            fields=[
+                (
+                    "service",
+                    models.OneToOneField(
+                        db_column="id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="card",
+                        serialize=False,
+                        to="servic.service",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("category_name", models.CharField(max_length=100)),
+                ("provider_name", models.CharField(max_length=301)),
+                ("price", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "price_type",
+                    models.CharField(
+                        choices=[
+                            ("hourly", "Por Hora"),
+                            ("fixed", "Precio Fijo"),
+                            ("negotiable", "Negociable"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("location", models.CharField(max_length=200)),
+                (
+                    "primary_image",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("active", "Activo"),
+                            ("inactive", "Inactivo"),
+                            ("pending", "Pendiente"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("city", models.CharField(max_length=100)),
+                ("state", models.CharField(max_length=100)),
+                ("country", models.CharField(max_length=100)),
+                ("available_weekdays", models.PositiveSmallIntegerField(default=0)),
+                ("latitude", models.FloatField(blank=True, null=True)),
+                ("longitude", models.FloatField(blank=True, null=True)),
+                ("geohash", models.CharField(blank=True, default="", max_length=12)),
+            ],
+            options={
+                "verbose_name": "Tarjeta de Servicio",
+                "verbose_name_plural": "Tarjetas de Servicios",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="service_active_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="service_active_category_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="service_active_location_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="service_active_state_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="service_active_city_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="service_active_price_type_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="service_active_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="service_active_geohash_idx",
+        ),
+        migrations.AddField(
+            model_name="servicecard",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="servic.servicecategory",
+            ),
+        ),
+        migrations.AddField(
+            model_name="servicecard",
+            name="provider",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["-created_at", "-service"],
+                name="card_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["category", "-created_at", "-service"],
+                name="card_active_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["country", "state", "city"],
+                name="card_active_location_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["state", "-created_at", "-service"],
+                name="card_active_state_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["city", "-created_at", "-service"],
+                name="card_active_city_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["price_type", "price"],
+                name="card_active_price_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["price"],
+                name="card_active_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["available_weekdays"],
+                name="card_active_weekdays_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["geohash"],
+                name="card_active_geohash_idx",
+            ),
+        ),
+        migrations.RunPython(build_cards, migrations.RunPython.noop),
+    ]
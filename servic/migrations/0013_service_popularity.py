@@ -0,0 +1,82 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:38
+
+import math
+from datetime import datetime, timezone as dt_timezone
+from itertools import groupby
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+# Copia de la fórmula de servic/popularity.py al momento de esta migración:
+# un cambio posterior en ese módulo no debe cambiar lo que hace
+HALF_LIFE_DAYS = 90
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+FLOOR = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+OFFSET = (EPOCH - FLOOR).total_seconds() / 86400 / HALF_LIFE_DAYS + math.log2(5)
+SCALE = 1000
+PRIOR_RATING = 3.5
+PRIOR_WEIGHT = 5
+
+
+def compute_popularity(contracts):
+    exponents, ratings = [], []
+    for completed_at, rating in contracts:
+        days = (completed_at - EPOCH).total_seconds() / 86400
+        exponents.append(days / HALF_LIFE_DAYS)
+        if rating is not None:
+            ratings.append(rating)
+    if not exponents:
+        return 0
+
+    top = max(exponents)
+    log_total = top + math.log2(sum(2 ** (e - top) for e in exponents))
+    rating = (PRIOR_RATING * PRIOR_WEIGHT + sum(ratings)) / (
+        PRIOR_WEIGHT + len(ratings)
+    )
+    return max(1, round(SCALE * (log_total + math.log2(rating / 5) + OFFSET)))
+
+
+def compute_scores(apps, schema_editor):
+    Service = apps.get_model("servic", "Service")
+    ServiceCard = apps.get_model("servic", "ServiceCard")
+    ServiceContract = apps.get_model("servic", "ServiceContract")
+    rows = (
+        ServiceContract.objects.filter(status="completed")
+        .order_by("service_id")
+        .values_list("service_id", Coalesce("end_date", "updated_at"), "client_rating")
+    )
+    for service_id, contracts in groupby(rows.iterator(), key=lambda row: row[0]):
+        popularity = compute_popularity(
+            (ended, rating) for _, ended, rating in contracts
+        )
+        Service.objects.filter(pk=service_id).update(popularity=popularity)
+        ServiceCard.objects.filter(pk=service_id).update(popularity=popularity)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("servic", "0012_service_card"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="service",
+            name="popularity",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="servicecard",
+            name="popularity",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["-popularity"],
+                name="card_active_popularity_idx",
+            ),
+        ),
+        migrations.RunPython(compute_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:40
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def compute_ratings(apps, schema_editor):
+    Service = apps.get_model("servic", "Service")
+    ServiceCard = apps.get_model("servic", "ServiceCard")
+    ServiceContract = apps.get_model("servic", "ServiceContract")
+    rows = (
+        ServiceContract.objects.filter(client_rating__isnull=False)
+        .values("service_id")
+        .annotate(total=Sum("client_rating"), count=Count("pk"))
+    )
+    for row in rows.iterator():
+        values = {
+            "rating_avg": row["total"] / row["count"],
+            "rating_count": row["count"],
+        }
+        Service.objects.filter(pk=row["service_id"]).update(
+            rating_sum=row["total"], **values
+        )
+        ServiceCard.objects.filter(pk=row["service_id"]).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("servic", "0013_service_popularity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="service",
+            name="rating_avg",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="service",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="service",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="servicecard",
+            name="rating_avg",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="servicecard",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="servicecard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["rating_avg"],
+                name="card_active_rating_idx",
+            ),
+        ),
+        migrations.RunPython(compute_ratings, migrations.RunPython.noop),
+    ]
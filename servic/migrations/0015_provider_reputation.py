@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("servic", "0014_service_ratings"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProviderReputation",
+            fields=[
+                (
+                    "provider",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="reputation",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("score", models.IntegerField(default=0)),
+                ("rating_avg", models.FloatField(blank=True, null=True)),
+                ("rating_count", models.PositiveIntegerField(default=0)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("completion_rate", models.FloatField(default=0)),
+                ("cancellation_rate", models.FloatField(default=0)),
+                ("years_of_experience", models.PositiveSmallIntegerField(default=0)),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Reputación de Prestador",
+                "verbose_name_plural": "Reputaciones de Prestadores",
+                "ordering": ["-score"],
+                "indexes": [
+                    models.Index(
+                        fields=["-score", "-provider"], name="reputation_score_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("servic", "0015_provider_reputation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="servicecard",
+            name="primary_image_renditions",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="serviceimage",
+            name="renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:51
+
+import servic.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("servic", "0016_service_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="serviceimage",
+            name="image",
+            field=models.ImageField(
+                storage=servic.storage.get_content_storage, upload_to="service_images/"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="serviceproviderprofile",
+            name="certification_file",
+            field=models.FileField(
+                storage=servic.storage.get_content_storage, upload_to="certifications/"
+            ),
+        ),
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("size", models.PositiveBigIntegerField(default=0)),
+                ("references", models.IntegerField(default=0)),
+                ("last_stored_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Archivo",
+                "verbose_name_plural": "Archivos",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("references__lte", 0)),
+                        fields=["last_stored_at"],
+                        name="blob_orphan_idx",
+                    )
+                ],
+            },
+        ),
+    ]
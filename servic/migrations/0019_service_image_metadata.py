@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("servic", "0018_upload_session"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="servicecard",
+            name="primary_image_metadata",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="serviceimage",
+            name="dominant_color",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=7
+            ),
+        ),
+        migrations.AddField(
+            model_name="serviceimage",
+            name="file_size",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="serviceimage",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="serviceimage",
+            name="placeholder",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=64
+            ),
+        ),
+        migrations.AddField(
+            model_name="serviceimage",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:08
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def keep_one_primary(apps, schema_editor):
+    # Antes de la restricción: si un servicio tiene varias principales se
+    # conserva la más reciente, que es la que muestra su tarjeta
+    ServiceImage = apps.get_model("servic", "ServiceImage")
+    duplicated = (
+        ServiceImage.objects.filter(is_primary=True)
+        .order_by()
+        .values("service_id")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    for row in duplicated.iterator():
+        primaries = ServiceImage.objects.filter(
+            service_id=row["service_id"], is_primary=True
+        ).order_by("-created_at", "-pk")
+        ServiceImage.objects.filter(
+            pk__in=list(primaries.values_list("pk", flat=True)[1:])
+        ).update(is_primary=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("servic", "0019_service_image_metadata"),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_one_primary, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="serviceimage",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_primary", True)),
+                fields=("service",),
+                name="service_image_one_primary",
+            ),
+        ),
+    ]
@@ -2,6 +2,10 @@ from .user import User, UserRoleChangeLog
 from .provider import ServiceProviderProfile, ProviderRequest
 from .service import ServiceCategory, Service, ServiceImage
 from .contract import ServiceContract
+from .card import ServiceCard
+from .reputation import ProviderReputation
+from .blob import MediaBlob
+from .upload import UploadSession
 
 __all__ = [
     "User",
@@ -12,4 +16,8 @@ __all__ = [
     "Service",
     "ServiceImage",
     "ServiceContract",
+    "ServiceCard",
+    "ProviderReputation",
+    "MediaBlob",
+    "UploadSession",
 ]
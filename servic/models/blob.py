@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    Archivo guardado por ContentAddressedStorage (servic/storage.py). Varias
+    filas de ServiceImage o ServiceProviderProfile pueden apuntar al mismo
+    archivo; `references` cuenta cuántas, y los que quedan en cero los borra
+    `collect_media_garbage` (ver servic/blobs.py).
+    """
+
+    name = models.CharField(max_length=255, primary_key=True)
+    size = models.PositiveBigIntegerField(default=0)
+    references = models.IntegerField(default=0)
+    # Última vez que se guardó este contenido: protege de la limpieza a los
+    # archivos recién subidos cuya fila todavía no se guardó
+    last_stored_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Archivo"
+        verbose_name_plural = "Archivos"
+        indexes = [
+            models.Index(
+                fields=["last_stored_at"],
+                condition=models.Q(references__lte=0),
+                name="blob_orphan_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
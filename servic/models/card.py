@@ -0,0 +1,120 @@
+from django.db import models
+from ..geo import GEOHASH_LENGTH
+from .user import User
+from .service import ServiceCategory, Service
+
+
+class ServiceCard(models.Model):
+    """
+    Modelo de lectura desnormalizado del catálogo público: una fila por
+    servicio con todo lo que muestra una tarjeta del listado y las columnas por
+    las que se filtra, para que ServiceListView consulte una sola tabla.
+
+    Se mantiene desde las señales de Service, ServiceCategory, User y
+    ServiceImage (ver servic/cards.py); `rebuild_service_cards` lo regenera.
+    """
+
+    # Comparte la columna "id" con el servicio: pk de la tarjeta = id del servicio
+    service = models.OneToOneField(
+        Service,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_column="id",
+        related_name="card",
+    )
+    category = models.ForeignKey(
+        ServiceCategory, on_delete=models.CASCADE, related_name="+"
+    )
+    provider = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+
+    # Datos mostrados en la tarjeta
+    title = models.CharField(max_length=200)
+    category_name = models.CharField(max_length=100)
+    provider_name = models.CharField(max_length=301)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    price_type = models.CharField(max_length=10, choices=Service.PRICE_TYPE_CHOICES)
+    location = models.CharField(max_length=200)
+    primary_image = models.CharField(max_length=255, blank=True, default="")
+    primary_image_renditions = models.JSONField(default=dict, blank=True)
+    primary_image_metadata = models.JSONField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=Service.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    popularity = models.IntegerField(default=0)
+    rating_avg = models.FloatField(null=True, blank=True)
+    rating_count = models.PositiveIntegerField(default=0)
+
+    # Columnas usadas solo para filtrar
+    city = models.CharField(max_length=100)
+    state = models.CharField(max_length=100)
+    country = models.CharField(max_length=100)
+    available_weekdays = models.PositiveSmallIntegerField(default=0)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=GEOHASH_LENGTH, blank=True, default="")
+
+    class Meta:
+        verbose_name = "Tarjeta de Servicio"
+        verbose_name_plural = "Tarjetas de Servicios"
+        ordering = ["-created_at"]
+        # Índices parciales sobre servicios activos: el catálogo público siempre
+        # filtra status="active" y luego por alguno de estos campos
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-service"],
+                name="card_active_created_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["category", "-created_at", "-service"],
+                name="card_active_category_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["country", "state", "city"],
+                name="card_active_location_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["state", "-created_at", "-service"],
+                name="card_active_state_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["city", "-created_at", "-service"],
+                name="card_active_city_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["price_type", "price"],
+                name="card_active_price_type_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["price"],
+                name="card_active_price_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["available_weekdays"],
+                name="card_active_weekdays_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["geohash"],
+                name="card_active_geohash_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["-popularity"],
+                name="card_active_popularity_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["rating_avg"],
+                name="card_active_rating_idx",
+                condition=models.Q(status="active"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Tarjeta de {self.title}"
@@ -1,9 +1,10 @@
 from django.db import models
+from .tracking import TrackedFieldsMixin
 from .user import User
 from .service import Service
 
 
-class ServiceContract(models.Model):
+class ServiceContract(TrackedFieldsMixin, models.Model):
     STATUS_CHOICES = (
         ("pending", "Pendiente"),
         ("accepted", "Aceptado"),
@@ -46,6 +47,9 @@ class ServiceContract(models.Model):
         verbose_name_plural = "Contratos de Servicios"
         ordering = ["-created_at"]
 
+    # Campos cuyo valor anterior consultan las señales (puntajes del servicio)
+    tracked_fields = ("status", "client_rating")
+
     def __str__(self):
         return f"Contrato de {self.service.title} - {self.client.email}"
 
@@ -1,8 +1,11 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from ..storage import get_content_storage
+from .tracking import TrackedFieldsMixin
 from .user import User
 
 
-class ServiceProviderProfile(models.Model):
+class ServiceProviderProfile(TrackedFieldsMixin, models.Model):
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, related_name="provider_profile"
     )
@@ -20,13 +23,28 @@ class ServiceProviderProfile(models.Model):
     city = models.CharField(max_length=100)
     state = models.CharField(max_length=100)
     country = models.CharField(max_length=100)
-    certification_file = models.FileField(upload_to="certifications/")
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    certification_file = models.FileField(
+        upload_to="certifications/", storage=get_content_storage
+    )
     certification_description = models.TextField()
     years_of_experience = models.PositiveIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_verified = models.BooleanField(default=False)
 
+    # Referencias del certificado en el storage deduplicado (servic/blobs.py)
+    tracked_fields = ("certification_file",)
+
     def __str__(self):
         return f"Perfil de {self.user.email}"
 
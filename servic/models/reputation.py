@@ -0,0 +1,36 @@
+from django.db import models
+from .user import User
+
+
+class ProviderReputation(models.Model):
+    """
+    Reputación precalculada de cada prestador verificado para el ranking
+    público. La genera en bloque `compute_provider_reputation` (ver
+    servic/reputation.py), pensado para ejecutarse periódicamente.
+    """
+
+    provider = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="reputation",
+    )
+    score = models.IntegerField(default=0)
+    rating_avg = models.FloatField(null=True, blank=True)
+    rating_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    completion_rate = models.FloatField(default=0)
+    cancellation_rate = models.FloatField(default=0)
+    years_of_experience = models.PositiveSmallIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Reputación de Prestador"
+        verbose_name_plural = "Reputaciones de Prestadores"
+        ordering = ["-score"]
+        indexes = [
+            models.Index(fields=["-score", "-provider"], name="reputation_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"Reputación de {self.provider.email}"
@@ -1,4 +1,9 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from ..geo import GEOHASH_LENGTH, encode as encode_geohash
+from ..storage import get_content_storage
+from .tracking import TrackedFieldsMixin
 from .user import User
 
 
@@ -49,40 +54,105 @@ class Service(models.Model):
     city = models.CharField(max_length=100)
     state = models.CharField(max_length=100)
     country = models.CharField(max_length=100)
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    geohash = models.CharField(
+        max_length=GEOHASH_LENGTH, blank=True, default="", editable=False
+    )  # Calculado desde latitude/longitude para las búsquedas por cercanía
 
     # Disponibilidad
     availability_start = models.TimeField()
     availability_end = models.TimeField()
-    available_days = models.CharField(
-        max_length=100
-    )  # Ejemplo: "Lunes,Martes,Miércoles"
+    available_weekdays = models.PositiveSmallIntegerField(
+        default=0, db_index=True
+    )  # Máscara de bits de servic.weekdays: lunes = 1, martes = 2, miércoles = 4...
 
     # Estado y fechas
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Popularidad precalculada (servic.popularity); se copia a ServiceCard
+    popularity = models.IntegerField(default=0, editable=False)
+
+    # Calificaciones de clientes (servic.ratings); rating_sum permite ajustar el
+    # promedio al editar una calificación sin volver a leer las contrataciones
+    rating_avg = models.FloatField(null=True, blank=True, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+
+    # Búsqueda de texto completo (mantenido por servic.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         verbose_name = "Servicio"
         verbose_name_plural = "Servicios"
         ordering = ["-created_at"]
+        # Los índices del catálogo público están en ServiceCard
+        indexes = [
+            models.Index(fields=["status", "-created_at"], name="service_status_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.provider.email}"
 
+    def save(self, *args, **kwargs):
+        # Mantener el geohash sincronizado con las coordenadas
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
 
-class ServiceImage(models.Model):
+
+class ServiceImage(TrackedFieldsMixin, models.Model):
     service = models.ForeignKey(
         Service, on_delete=models.CASCADE, related_name="images"
     )
-    image = models.ImageField(upload_to="service_images/")
+    image = models.ImageField(upload_to="service_images/", storage=get_content_storage)
     is_primary = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Versiones reducidas generadas en segundo plano (ver servic/renditions.py):
+    # {tamaño: {extensión: nombre en el storage}}, vacío mientras están pendientes
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    # Metadatos calculados junto con las versiones (nulos/vacíos mientras tanto)
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    file_size = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    dominant_color = models.CharField(
+        max_length=7, blank=True, default="", editable=False
+    )
+    # BlurHash de la imagen, para mostrar un difuminado mientras se descarga
+    placeholder = models.CharField(
+        max_length=64, blank=True, default="", editable=False
+    )
+
+    # El archivo se compara al guardar: versiones reducidas y referencias
+    tracked_fields = ("image",)
 
     class Meta:
         verbose_name = "Imagen de Servicio"
         verbose_name_plural = "Imágenes de Servicios"
         ordering = ["-is_primary", "-created_at"]
+        # Una sola imagen principal por servicio (ver servic/gallery.py)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["service"],
+                condition=models.Q(is_primary=True),
+                name="service_image_one_primary",
+            ),
+        ]
 
     def __str__(self):
         return f"Imagen de {self.service.title}"
@@ -0,0 +1,40 @@
+from django.db.models.fields.files import FieldFile
+
+
+def _raw(value):
+    # Los campos de archivo se comparan por nombre en el storage
+    return value.name if isinstance(value, FieldFile) else value
+
+
+class TrackedFieldsMixin:
+    """
+    Recuerda el valor de `tracked_fields` al cargar o guardar la fila, para que
+    las señales sepan qué cambió (valor anterior con previous()).
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def _snapshot(self):
+        self._original = {
+            name: _raw(self.__dict__.get(name)) for name in self.tracked_fields
+        }
+
+    def previous(self, name):
+        """Valor de `name` al cargar o guardar por última vez (None si es nuevo)"""
+        return getattr(self, "_original", {}).get(name)
+
+    def has_changed(self, name):
+        """True si `name` difiere del valor guardado (siempre, si la fila es nueva)"""
+        if not hasattr(self, "_original"):
+            return True
+        return self._original.get(name) != _raw(getattr(self, name))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot()
@@ -0,0 +1,45 @@
+import uuid
+
+from django.db import models
+from .user import User
+
+
+class UploadSession(models.Model):
+    """
+    Subida por partes de un archivo (ver servic/uploads.py). El cliente la
+    crea con el tamaño total, envía rangos con PUT y, al completarla, la usa en
+    lugar del archivo en la subida de imágenes o del certificado.
+    """
+
+    PURPOSE_CHOICES = (
+        ("service_image", "Imagen de servicio"),
+        ("certification", "Certificado de prestador"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    purpose = models.CharField(max_length=20, choices=PURPOSE_CHOICES)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    # Bytes recibidos de forma contigua desde el inicio
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Subida por Partes"
+        verbose_name_plural = "Subidas por Partes"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["expires_at"], name="upload_expires_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def is_complete(self):
+        return self.offset == self.size
@@ -0,0 +1,26 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Paginación por cursor (keyset) sobre "-created_at" con "-id" como desempate.
+    Cada página cuesta lo mismo sin importar la profundidad y es estable ante
+    nuevas inserciones. El tamaño de página se puede ajustar con ?page_size=.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+
+class NameCursorPagination(CreatedAtCursorPagination):
+    """Paginación por cursor para listados ordenados alfabéticamente (categorías)"""
+
+    ordering = ("name", "id")
+
+
+class ScoreCursorPagination(CreatedAtCursorPagination):
+    """Paginación por cursor para rankings por puntaje (mayor primero)"""
+
+    ordering = ("-score", "-provider")
@@ -0,0 +1,101 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+from itertools import groupby
+
+from django.db.models.functions import Coalesce
+
+from . import cache
+from .models import Service, ServiceCard, ServiceContract
+
+# Una contratación completada pierde la mitad de su peso cada HALF_LIFE_DAYS
+HALF_LIFE_DAYS = 90
+
+# Los pesos se expresan relativos a esta fecha fija (ver compute_popularity)
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# El puntaje se guarda como entero (sirve como posición del cursor)
+SCALE = 1000
+
+# Fecha anterior a cualquier contratación. El logaritmo es negativo para
+# contrataciones anteriores a EPOCH o con malas calificaciones; se le suma
+# OFFSET (el exponente de FLOOR y el de la peor calificación, 1 de 5) para que
+# siga siendo positivo sin perder el orden entre servicios
+FLOOR = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+OFFSET = (EPOCH - FLOOR).total_seconds() / 86400 / HALF_LIFE_DAYS + math.log2(5)
+
+# Promedio bayesiano: pocas calificaciones se acercan a PRIOR_RATING
+PRIOR_RATING = 3.5
+PRIOR_WEIGHT = 5
+
+
+def compute_popularity(contracts):
+    """
+    Puntaje a partir de (fecha de finalización, calificación del cliente) de
+    las contrataciones completadas de un servicio.
+
+    Cada contratación pesa 2 ** (días desde EPOCH / HALF_LIFE_DAYS): dividir
+    todos los pesos por el mismo factor no cambia el orden, así que este
+    decaimiento equivale a uno medido desde hoy sin tener que recalcular a
+    medida que pasa el tiempo. Se guarda log2 de la suma (cada +SCALE es el
+    doble de contrataciones recientes), multiplicada por el promedio bayesiano
+    de calificaciones sobre 5, más OFFSET.
+    """
+    exponents, ratings = [], []
+    for completed_at, rating in contracts:
+        days = (completed_at - EPOCH).total_seconds() / 86400
+        exponents.append(days / HALF_LIFE_DAYS)
+        if rating is not None:
+            ratings.append(rating)
+    if not exponents:
+        return 0
+
+    top = max(exponents)
+    log_total = top + math.log2(sum(2 ** (e - top) for e in exponents))
+    rating = (PRIOR_RATING * PRIOR_WEIGHT + sum(ratings)) / (
+        PRIOR_WEIGHT + len(ratings)
+    )
+    score = round(SCALE * (log_total + math.log2(rating / 5) + OFFSET))
+    # Cualquier servicio con contrataciones queda por encima de los que no
+    # tienen; con OFFSET el mínimo solo aplica a fechas anteriores a FLOOR
+    return max(1, score)
+
+
+def _completed_contracts():
+    return ServiceContract.objects.filter(status="completed").values_list(
+        "service_id", Coalesce("end_date", "updated_at"), "client_rating"
+    )
+
+
+def refresh_popularity(service_id):
+    """Recalcular el puntaje de un servicio (solo lee sus contrataciones)"""
+    rows = _completed_contracts().filter(service_id=service_id)
+    popularity = compute_popularity((ended, rating) for _, ended, rating in rows)
+    Service.objects.filter(pk=service_id).update(popularity=popularity)
+    ServiceCard.objects.filter(pk=service_id).update(popularity=popularity)
+    cache.invalidate(service_id)
+    return popularity
+
+
+def rebuild_popularity(batch_size=1000):
+    """Recalcular todos los puntajes en una pasada ordenada por servicio"""
+    scores = {
+        service_id: compute_popularity((ended, rating) for _, ended, rating in rows)
+        for service_id, rows in groupby(
+            _completed_contracts().order_by("service_id").iterator(),
+            key=lambda row: row[0],
+        )
+    }
+    services = []
+    for service in Service.objects.only("pk", "popularity").iterator():
+        popularity = scores.get(service.pk, 0)
+        if service.popularity != popularity:
+            service.popularity = popularity
+            services.append(service)
+    Service.objects.bulk_update(services, ["popularity"], batch_size=batch_size)
+    ServiceCard.objects.bulk_update(
+        [ServiceCard(service_id=s.pk, popularity=s.popularity) for s in services],
+        ["popularity"],
+        batch_size=batch_size,
+    )
+    cache.invalidate(all_details=True)
+    return len(services)
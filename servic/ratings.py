@@ -0,0 +1,72 @@
+from django.db.models import Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from . import cache
+from .models import Service, ServiceCard, ServiceContract
+
+
+def _average(total, count):
+    # NULL si el servicio no tiene calificaciones
+    return Cast(total, FloatField()) / NullIf(count, 0)
+
+
+def _copy_to_cards(services):
+    """Copiar los agregados de Service a sus tarjetas en una sola sentencia"""
+    source = Service.objects.filter(pk=OuterRef("pk"))
+    ServiceCard.objects.filter(pk__in=services.values("pk")).update(
+        rating_avg=Subquery(source.values("rating_avg")[:1]),
+        rating_count=Subquery(source.values("rating_count")[:1]),
+    )
+
+
+def apply_rating_change(service_id, old, new):
+    """
+    Actualizar los agregados de un servicio cuando la calificación del cliente
+    de una contratación pasa de `old` a `new` (cualquiera puede ser None).
+
+    Es un UPDATE atómico con F(): la suma y la cantidad se ajustan sobre los
+    valores actuales de la fila y el promedio se recalcula a partir de ellas,
+    así las ediciones concurrentes no se pisan ni acumulan redondeos.
+    """
+    if old == new:
+        return
+    delta_sum = (new or 0) - (old or 0)
+    delta_count = (new is not None) - (old is not None)
+    services = Service.objects.filter(pk=service_id)
+    services.update(
+        rating_sum=F("rating_sum") + delta_sum,
+        rating_count=F("rating_count") + delta_count,
+        rating_avg=_average(
+            F("rating_sum") + delta_sum, F("rating_count") + delta_count
+        ),
+    )
+    _copy_to_cards(services)
+    cache.invalidate(service_id)
+
+
+def recompute_ratings(services=None):
+    """Recalcular los agregados desde las contrataciones (todos los servicios)"""
+    services = Service.objects.all() if services is None else services
+    ratings = (
+        ServiceContract.objects.filter(
+            service=OuterRef("pk"), client_rating__isnull=False
+        )
+        .order_by()
+        .values("service")
+    )
+    total = Coalesce(
+        Subquery(ratings.annotate(total=Sum("client_rating")).values("total")),
+        0,
+        output_field=IntegerField(),
+    )
+    count = Coalesce(
+        Subquery(ratings.annotate(count=Count("pk")).values("count")),
+        0,
+        output_field=IntegerField(),
+    )
+    updated = services.update(
+        rating_sum=total, rating_count=count, rating_avg=_average(total, count)
+    )
+    _copy_to_cards(services)
+    cache.invalidate(all_details=True)
+    return updated
@@ -0,0 +1,54 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Mismas conversiones que el JSONRenderer de DRF para lo que no es JSON nativo:
+# Decimal -> float, datetime aware -> ISO con "Z" para UTC, time -> ISO,
+# textos traducibles, QuerySet, UUID, etc.
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    return _encoder.default(obj)
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSONRenderer con orjson. Produce los mismos bytes que el renderer de DRF
+    (compacto, UTF-8, fechas con el formato de DRF); si se pide indentación
+    (?format=api, Accept con indent=) se delega en el renderer original.
+    """
+
+    # Las fechas pasan por encode_default para conservar el formato de DRF
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=encode_default, option=self.options)
+        # Igual que DRF: escapar U+2028 y U+2029 para que sea JavaScript válido
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Respuesta en MessagePack cuando el cliente envía Accept: application/msgpack"""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
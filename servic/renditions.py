@@ -0,0 +1,157 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import connections
+
+from .imaging import render_image
+from .models import ServiceImage
+
+logger = logging.getLogger(__name__)
+
+# Carpeta (dentro del storage) donde se guardan las versiones reducidas
+RENDITIONS_DIR = "service_images/renditions"
+
+# Extensiones generadas para cada tamaño: JPEG como respaldo y WebP
+EXTENSIONS = ("jpg", "webp")
+
+# Campos de ServiceImage que devuelve render_image()
+METADATA_FIELDS = ("width", "height", "file_size", "dominant_color", "placeholder")
+
+_executor = None
+_writer = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Pool de procesos compartido, creado en el primer uso. Se usa "spawn" para
+    no heredar las conexiones ni los hilos del proceso web; los hijos solo
+    importan servic.imaging. Los resultados se guardan desde un único hilo
+    escritor con su propia conexión a la base.
+    """
+    global _executor, _writer
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_RENDITION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="renditions")
+        return _executor
+
+
+def rendition_names(source_name):
+    """
+    Nombres en el storage de cada versión: {tamaño: {extensión: nombre}}.
+    Dependen solo del archivo original (con el storage deduplicado, de su
+    hash), así dos imágenes con el mismo contenido comparten las versiones.
+    """
+    stem = os.path.splitext(os.path.basename(source_name))[0]
+    return {
+        size: {
+            extension: f"{RENDITIONS_DIR}/{stem}-{size}.{extension}"
+            for extension in EXTENSIONS
+        }
+        for size in settings.IMAGE_RENDITION_SIZES
+    }
+
+
+def rendition_urls(image, build_url=None):
+    """URLs de las versiones ya generadas ({} mientras están pendientes)"""
+    storage = image.image.storage
+    build_url = build_url or (lambda url: url)
+    return {
+        size: {
+            extension: build_url(storage.url(name)) for extension, name in names.items()
+        }
+        for size, names in image.renditions.items()
+    }
+
+
+def image_metadata(image):
+    """Metadatos de la imagen, o None mientras no se calcularon"""
+    if image.width is None:
+        return None
+    return {field: getattr(image, field) for field in METADATA_FIELDS}
+
+
+def _job(image):
+    names = rendition_names(image.image.name)
+    storage = image.image.storage
+    targets = [
+        (storage.path(name), settings.IMAGE_RENDITION_SIZES[size], extension)
+        for size, by_extension in names.items()
+        for extension, name in by_extension.items()
+    ]
+    return image.pk, image.image.name, image.image.path, names, targets
+
+
+def _save(image_id, source_name, names, metadata):
+    # Si la imagen se borró o se reemplazó mientras tanto, descartar el resultado
+    image = ServiceImage.objects.filter(pk=image_id, image=source_name).first()
+    if image is None:
+        return
+    image.renditions = names
+    for field in METADATA_FIELDS:
+        setattr(image, field, metadata[field])
+    # Las señales de ServiceImage actualizan la tarjeta, la caché y la ETag
+    image.save(update_fields=["renditions", *METADATA_FIELDS])
+
+
+def _write(image_id, source_name, names, rendered, done):
+    try:
+        _save(image_id, source_name, names, rendered.result())
+    except Exception as exc:
+        logger.exception(
+            "No se pudieron generar las versiones de la imagen %s", image_id
+        )
+        done.set_exception(exc)
+    else:
+        done.set_result(image_id)
+    finally:
+        connections.close_all()
+
+
+def _on_rendered(image_id, source_name, names, done, rendered):
+    _writer.submit(_write, image_id, source_name, names, rendered, done)
+
+
+def enqueue_renditions(images):
+    """
+    Generar las versiones reducidas (JPEG y WebP por tamaño) y los metadatos
+    de `images` fuera del ciclo de la petición. Devuelve un future por imagen que se completa
+    cuando sus versiones quedaron guardadas; con IMAGE_RENDITION_WORKERS = 0
+    se generan en el momento y se devuelve una lista vacía.
+    """
+    jobs = [_job(image) for image in images if image.image]
+    if settings.IMAGE_RENDITION_WORKERS == 0:
+        for image_id, source_name, source_path, names, targets in jobs:
+            try:
+                metadata = render_image(
+                    source_path, targets, settings.IMAGE_RENDITION_QUALITY
+                )
+            except Exception:
+                logger.exception(
+                    "No se pudieron generar las versiones de la imagen %s", image_id
+                )
+            else:
+                _save(image_id, source_name, names, metadata)
+        return []
+
+    executor = get_executor()
+    futures = []
+    for image_id, source_name, source_path, names, targets in jobs:
+        done = Future()
+        rendered = executor.submit(
+            render_image, source_path, targets, settings.IMAGE_RENDITION_QUALITY
+        )
+        rendered.add_done_callback(
+            partial(_on_rendered, image_id, source_name, names, done)
+        )
+        futures.append(done)
+    return futures
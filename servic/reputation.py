@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import ProviderReputation, ServiceContract, ServiceProviderProfile
+
+# Estados finales de una contratación (las pendientes o en curso no cuentan)
+FINISHED_STATUSES = ("completed", "cancelled", "rejected")
+
+# Promedios bayesianos: con pocos datos el valor se acerca al prior
+PRIOR_RATING, RATING_PRIOR_WEIGHT = 3.5, 5
+PRIOR_COMPLETION, COMPLETION_PRIOR_WEIGHT = 0.8, 5
+
+# Peso de cada componente del puntaje (suman 1) y tope de experiencia
+RATING_WEIGHT, COMPLETION_WEIGHT, EXPERIENCE_WEIGHT = 0.6, 0.3, 0.1
+MAX_EXPERIENCE_YEARS = 20
+
+# El puntaje se guarda como entero de 0 a SCALE
+SCALE = 1000
+
+
+def _contract_stats():
+    """Una sola consulta agrupada por prestador con todos los contadores"""
+    rows = (
+        ServiceContract.objects.order_by()
+        .values("provider")
+        .annotate(
+            finished=Count("pk", filter=Q(status__in=FINISHED_STATUSES)),
+            completed=Count("pk", filter=Q(status="completed")),
+            cancelled=Count("pk", filter=Q(status="cancelled")),
+            rating_sum=Sum("client_rating"),
+            rating_count=Count("client_rating"),
+        )
+    )
+    return {row["provider"]: row for row in rows}
+
+
+def build_reputation(provider_id, years, stats, computed_at):
+    """Combinar los contadores de un prestador en su fila de reputación"""
+    finished = stats.get("finished", 0)
+    completed = stats.get("completed", 0)
+    rating_count = stats.get("rating_count", 0)
+    rating_sum = stats.get("rating_sum") or 0
+
+    rating = (PRIOR_RATING * RATING_PRIOR_WEIGHT + rating_sum) / (
+        RATING_PRIOR_WEIGHT + rating_count
+    )
+    completion = (PRIOR_COMPLETION * COMPLETION_PRIOR_WEIGHT + completed) / (
+        COMPLETION_PRIOR_WEIGHT + finished
+    )
+    experience = min(years, MAX_EXPERIENCE_YEARS) / MAX_EXPERIENCE_YEARS
+    score = (
+        RATING_WEIGHT * rating / 5
+        + COMPLETION_WEIGHT * completion
+        + EXPERIENCE_WEIGHT * experience
+    )
+    return ProviderReputation(
+        provider_id=provider_id,
+        score=round(SCALE * score),
+        rating_avg=round(rating_sum / rating_count, 2) if rating_count else None,
+        rating_count=rating_count,
+        completed_count=completed,
+        completion_rate=round(completed / finished, 4) if finished else 0,
+        cancellation_rate=(
+            round(stats.get("cancelled", 0) / finished, 4) if finished else 0
+        ),
+        years_of_experience=min(years, 32767),
+        computed_at=computed_at,
+    )
+
+
+def compute_provider_reputation(batch_size=1000):
+    """
+    Regenerar la tabla de reputación de prestadores verificados. Los
+    contadores salen de una única agregación en la base; aquí solo se combinan.
+    """
+    computed_at = timezone.now()
+    stats = _contract_stats()
+    profiles = ServiceProviderProfile.objects.filter(is_verified=True).values_list(
+        "user_id", "years_of_experience"
+    )
+    reputations = [
+        build_reputation(user_id, years, stats.get(user_id, {}), computed_at)
+        for user_id, years in profiles.iterator()
+    ]
+    with transaction.atomic():
+        ProviderReputation.objects.all().delete()
+        ProviderReputation.objects.bulk_create(reputations, batch_size=batch_size)
+    return len(reputations)
@@ -0,0 +1,13 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    """Instancia única del motor configurado en SERVICE_SEARCH_BACKEND"""
+    return import_string(settings.SERVICE_SEARCH_BACKEND)()
+
+
+__all__ = ["get_search_backend"]
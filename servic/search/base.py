@@ -0,0 +1,35 @@
+class BaseSearchBackend:
+    """
+    Interfaz común de los motores de búsqueda del catálogo.
+
+    `search` recibe el queryset ya filtrado de la vista (de Service o de
+    ServiceCard, que comparten la pk) y debe devolverlo
+    restringido a los servicios que coinciden con la consulta, anotado con
+    `search_rank` (entero, mayor = más relevante) para poder ordenar y paginar
+    por cursor sobre la relevancia.
+    """
+
+    # Campos indexados y su peso relativo (A > B > C, como en Postgres)
+    fields = (("title", "A"), ("description", "B"), ("location", "C"))
+
+    def index(self, service):
+        """Indexar (o reindexar) un servicio recién creado o modificado"""
+        raise NotImplementedError
+
+    def remove(self, service_id):
+        """Quitar un servicio eliminado del índice"""
+        raise NotImplementedError
+
+    def rebuild(self):
+        """Reconstruir el índice completo desde la base de datos"""
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def needs_reindex(self, update_fields):
+        """Un save(update_fields=...) que no toca campos indexados ni el estado no reindexa"""
+        if update_fields is None:
+            return True
+        indexed = {name for name, _ in self.fields} | {"status"}
+        return bool(indexed & set(update_fields))
@@ -0,0 +1,125 @@
+import heapq
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from django.db.models import Case, IntegerField, Value, When
+
+from ..models import Service
+from .base import BaseSearchBackend
+
+# Mismos pesos por defecto que ts_rank para A, B y C (escalados a enteros)
+WEIGHTS = {"A": 1000, "B": 400, "C": 200}
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Minúsculas, sin acentos y separado en palabras"""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return TOKEN_RE.findall(text.lower())
+
+
+class InMemorySearchBackend(BaseSearchBackend):
+    """
+    Índice invertido en memoria del proceso: palabra -> {service_id: puntaje}.
+
+    Solo indexa servicios activos. Se carga completo en la primera búsqueda y
+    luego se mantiene con las señales de Service, por lo que es apto para tests
+    y despliegues de un solo proceso (cada worker tendría su propia copia).
+    Una búsqueda devuelve a lo sumo `max_candidates` servicios.
+    """
+
+    # Servicios más relevantes que se pasan a la base: la consulta lleva sus
+    # ids, así que su tamaño (y el número de parámetros) queda acotado aunque
+    # una palabra común aparezca en casi todo el catálogo
+    max_candidates = 200
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)
+        self._documents = {}
+        self._loaded = False
+
+    def _scores(self, service):
+        scores = defaultdict(int)
+        for name, weight in self.fields:
+            for token in tokenize(getattr(service, name)):
+                scores[token] += WEIGHTS[weight]
+        return scores
+
+    def _add(self, service):
+        scores = self._scores(service)
+        for token, score in scores.items():
+            self._postings[token][service.pk] = score
+        self._documents[service.pk] = set(scores)
+
+    def _discard(self, service_id):
+        for token in self._documents.pop(service_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(service_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def index(self, service):
+        with self._lock:
+            self._discard(service.pk)
+            if service.status == "active":
+                self._add(service)
+
+    def remove(self, service_id):
+        with self._lock:
+            self._discard(service_id)
+
+    def rebuild(self):
+        services = Service.objects.filter(status="active").only(
+            "id", "status", *(name for name, _ in self.fields)
+        )
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._documents = {}
+            for service in services.iterator():
+                self._add(service)
+            self._loaded = True
+
+    def match(self, query):
+        """Devuelve {service_id: puntaje} con los servicios que contienen todas las palabras"""
+        if not self._loaded:
+            self.rebuild()
+        terms = set(tokenize(query))
+        if not terms:
+            return {}
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+            postings.sort(key=len)
+            scores = dict(postings[0])
+            for posting in postings[1:]:
+                scores = {
+                    pk: score + posting[pk]
+                    for pk, score in scores.items()
+                    if pk in posting
+                }
+        return scores
+
+    def search(self, queryset, query):
+        scores = self.match(query)
+        if not scores:
+            return queryset.none().annotate(search_rank=Value(0))
+        # Los max_candidates de mayor puntaje (a igual puntaje, los más nuevos)
+        top = heapq.nlargest(self.max_candidates, scores.items(), key=lambda s: s[::-1])
+        by_score = defaultdict(list)
+        for pk, score in top:
+            by_score[score].append(pk)
+        return queryset.filter(pk__in=[pk for pk, _ in top]).annotate(
+            search_rank=Case(
+                *(
+                    When(pk__in=pks, then=Value(score))
+                    for score, pks in by_score.items()
+                ),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
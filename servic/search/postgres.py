@@ -0,0 +1,49 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, IntegerField
+from django.db.models.functions import Cast
+
+from ..models import Service
+from .base import BaseSearchBackend
+
+# SearchRank devuelve un real; se escala a entero para usarlo como cursor
+RANK_SCALE = 1_000_000
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Búsqueda con tsvector ponderado guardado en `Service.search_vector` e índice
+    GIN (ver migración 0008). Las consultas usan la sintaxis de websearch
+    ("plomero -gas", "\"aire acondicionado\"") y se ordenan con ts_rank.
+    """
+
+    config = "spanish"
+
+    def _vector(self):
+        vector = None
+        for name, weight in self.fields:
+            part = SearchVector(name, weight=weight, config=self.config)
+            vector = part if vector is None else vector + part
+        return vector
+
+    def index(self, service):
+        Service.objects.filter(pk=service.pk).update(search_vector=self._vector())
+
+    def remove(self, service_id):
+        # El vector vive en la misma fila, se elimina junto con el servicio
+        pass
+
+    def rebuild(self):
+        Service.objects.update(search_vector=self._vector())
+
+    def search(self, queryset, query):
+        search_query = SearchQuery(query, config=self.config, search_type="websearch")
+        # Sobre ServiceCard el vector se lee del servicio (misma pk, join 1 a 1)
+        vector = (
+            "search_vector" if queryset.model is Service else "service__search_vector"
+        )
+        return queryset.filter(**{vector: search_query}).annotate(
+            search_rank=Cast(
+                SearchRank(F(vector), search_query) * RANK_SCALE,
+                IntegerField(),
+            )
+        )
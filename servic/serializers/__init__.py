@@ -13,14 +13,17 @@ from .provider_serializers import (
     ProviderRequestSerializer,
     ProviderRequestCreateSerializer,
     ProviderRequestReviewSerializer,
+    ProviderReputationSerializer,
 )
 
 from .service_serializers import (
     ServiceCategorySerializer,
     ServiceSerializer,
     ServiceListSerializer,
+    ServiceCardSerializer,
     ServiceImageSerializer,
 )
+from .upload_serializers import UploadSessionSerializer
 
 __all__ = [
     "UserRegisterSerializer",
@@ -35,8 +38,11 @@ __all__ = [
     "ProviderRequestSerializer",
     "ProviderRequestCreateSerializer",
     "ProviderRequestReviewSerializer",
+    "ProviderReputationSerializer",
     "ServiceCategorySerializer",
     "ServiceSerializer",
     "ServiceListSerializer",
+    "ServiceCardSerializer",
     "ServiceImageSerializer",
+    "UploadSessionSerializer",
 ]
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from ..models import ServiceContract, Service
 from django.utils import timezone
+from ..weekdays import weekday_bit
+from .mixins import SparseFieldsetMixin
 
 
 class ServiceContractCreateSerializer(serializers.ModelSerializer):
@@ -22,26 +24,7 @@ class ServiceContractCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("La fecha de inicio debe ser futura")
 
         # Validar que la fecha esté dentro de los días disponibles del servicio
-        service_days = [day.strip() for day in service.available_days.split(",")]
-
-        # Mapeo de nombres de días de la semana de inglés a español
-        day_name_map = {
-            "Monday": "Lunes",
-            "Tuesday": "Martes",
-            "Wednesday": "Miércoles",
-            "Thursday": "Jueves",
-            "Friday": "Viernes",
-            "Saturday": "Sábado",
-            "Sunday": "Domingo",
-        }
-
-        # Obtener el nombre del día en inglés y convertirlo a español
-        start_day_english = start_date.strftime("%A")
-        start_day_spanish = day_name_map.get(
-            start_day_english, start_day_english
-        )  # Fallback to english if not found
-
-        if start_day_spanish not in service_days:
+        if not service.available_weekdays & weekday_bit(start_date.weekday()):
             raise serializers.ValidationError(
                 "La fecha seleccionada no está disponible"
             )
@@ -65,7 +48,7 @@ class ServiceContractCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ServiceContractSerializer(serializers.ModelSerializer):
+class ServiceContractSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     service_title = serializers.CharField(source="service.title", read_only=True)
     client_name = serializers.SerializerMethodField(read_only=True)
     provider_name = serializers.SerializerMethodField(read_only=True)
@@ -96,6 +79,23 @@ class ServiceContractSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+        # Columnas y relaciones que necesita cada campo (ver SparseFieldsetMixin)
+        field_dependencies = {
+            "id": {},
+            "service_title": {
+                "only": ["service", "service__title"],
+                "select_related": ["service"],
+            },
+            "client_name": {
+                "only": ["client", "client__first_name", "client__last_name"],
+                "select_related": ["client"],
+            },
+            "provider_name": {
+                "only": ["provider", "provider__first_name", "provider__last_name"],
+                "select_related": ["provider"],
+            },
+            "status_display": {"only": ["status"]},
+        }
 
     def get_client_name(self, obj):
         return f"{obj.client.first_name} {obj.client.last_name}"
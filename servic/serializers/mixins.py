@@ -0,0 +1,104 @@
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Selección de campos por query params en lecturas (GET):
+    ?fields=id,title  devuelve solo esos campos
+    ?omit=images      devuelve todos menos esos
+
+    `Meta.field_dependencies` indica qué columnas y relaciones necesita cada
+    campo de salida; `prune_queryset` las usa para cargar solo lo pedido
+    (only + select_related/prefetch_related). Un campo sin entrada depende de
+    la columna con su mismo nombre.
+    """
+
+    fields_param = "fields"
+    omit_param = "omit"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+        selected = set(self.selected_fields(request))
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def _param(cls, request, name):
+        value = request.query_params.get(name, "")
+        return {part.strip() for part in value.split(",") if part.strip()}
+
+    @classmethod
+    def selected_fields(cls, request):
+        requested = cls._param(request, cls.fields_param)
+        omitted = cls._param(request, cls.omit_param)
+        return [
+            name
+            for name in cls.Meta.fields
+            if (not requested or name in requested) and name not in omitted
+        ]
+
+    @classmethod
+    def prune_queryset(cls, queryset, request):
+        dependencies = getattr(cls.Meta, "field_dependencies", {})
+        only, select_related, prefetch_related = {"pk"}, set(), set()
+        for name in cls.selected_fields(request):
+            dependency = dependencies.get(name, {"only": [name]})
+            only.update(dependency.get("only", ()))
+            select_related.update(dependency.get("select_related", ()))
+            prefetch_related.update(dependency.get("prefetch_related", ()))
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(prefetch_related))
+        return queryset.only(*sorted(only))
+
+
+class CoordinatesMixin:
+    """
+    `latitude` y `longitude` van juntas: con una sola no se puede calcular el
+    geohash y el objeto quedaría fuera de las búsquedas por cercanía. En una
+    actualización parcial, la que no se envía se toma del objeto.
+    """
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        latitude, longitude = (
+            attrs.get(name, getattr(self.instance, name, None))
+            for name in ("latitude", "longitude")
+        )
+        if (latitude is None) != (longitude is None):
+            raise serializers.ValidationError(
+                {
+                    "latitude" if latitude is None else "longitude": [
+                        "Latitud y longitud deben enviarse juntas"
+                    ]
+                }
+            )
+        return attrs
+
+
+class NearFieldsMixin:
+    """
+    Campos que solo existen en las búsquedas por cercanía (?near=), como
+    `distance_km`: en una petición sin ese parámetro se quitan de la salida,
+    así el formato de los demás listados no cambia. Sin petición (por ejemplo
+    al serializar directamente) se conservan.
+    """
+
+    near_fields = ("distance_km",)
+
+    @classmethod
+    def omitted_fields(cls, request):
+        if request is None or request.query_params.get("near"):
+            return set()
+        return set(cls.near_fields)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.omitted_fields(self.context.get("request")):
+            fields.pop(name, None)
+        return fields
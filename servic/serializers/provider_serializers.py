@@ -1,8 +1,9 @@
 from rest_framework import serializers
-from ..models import ServiceProviderProfile, ProviderRequest
+from ..models import ServiceProviderProfile, ProviderRequest, ProviderReputation
+from .mixins import CoordinatesMixin
 
 
-class ServiceProviderProfileSerializer(serializers.ModelSerializer):
+class ServiceProviderProfileSerializer(CoordinatesMixin, serializers.ModelSerializer):
     certification_file = serializers.FileField(
         required=True,
         error_messages={
@@ -22,6 +23,8 @@ class ServiceProviderProfileSerializer(serializers.ModelSerializer):
             "city",
             "state",
             "country",
+            "latitude",
+            "longitude",
             "certification_file",
             "certification_description",
             "years_of_experience",
@@ -109,3 +112,25 @@ class ProviderRequestReviewSerializer(serializers.ModelSerializer):
                 {"admin_response": "Debe proporcionar una razón para el rechazo"}
             )
         return attrs
+
+
+class ProviderReputationSerializer(serializers.ModelSerializer):
+    provider_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProviderReputation
+        fields = [
+            "provider",
+            "provider_name",
+            "score",
+            "rating_avg",
+            "rating_count",
+            "completed_count",
+            "completion_rate",
+            "cancellation_rate",
+            "years_of_experience",
+            "computed_at",
+        ]
+
+    def get_provider_name(self, obj):
+        return f"{obj.provider.first_name} {obj.provider.last_name}"
@@ -1,7 +1,13 @@
 from rest_framework import serializers
-from ..models import ServiceCategory, Service, ServiceImage
+from ..models import ServiceCategory, Service, ServiceImage, ServiceCard
 from django.core.validators import MinValueValidator
+from django.db import transaction
+from django.db.models import Prefetch
 from django.utils import timezone
+from ..weekdays import days_from_mask, mask_from_days
+from ..renditions import image_metadata, rendition_urls
+from .. import gallery
+from .mixins import CoordinatesMixin, NearFieldsMixin, SparseFieldsetMixin
 
 
 class ServiceCategorySerializer(serializers.ModelSerializer):
@@ -12,11 +18,22 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
 
 
 class ServiceImageSerializer(serializers.ModelSerializer):
+    renditions = serializers.SerializerMethodField()
+    metadata = serializers.SerializerMethodField()
+
     class Meta:
         model = ServiceImage
-        fields = ["id", "image", "is_primary"]
+        fields = ["id", "image", "is_primary", "renditions", "metadata"]
         read_only_fields = ["id"]
 
+    def get_renditions(self, obj):
+        # URLs absolutas, igual que el campo image
+        request = self.context.get("request")
+        return rendition_urls(obj, request.build_absolute_uri if request else None)
+
+    def get_metadata(self, obj):
+        return image_metadata(obj)
+
     def validate_image(self, value):
         # Validar tamaño máximo (5MB)
         if value.size > 5 * 1024 * 1024:
@@ -32,8 +49,30 @@ class ServiceImageSerializer(serializers.ModelSerializer):
         return value
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class WeekdaysField(serializers.Field):
+    """Expone la máscara de días como texto: "Lunes,Martes,Miércoles" """
+
+    default_error_messages = {
+        "invalid": "Los días disponibles deben ser válidos (Lunes, Martes, etc.)"
+    }
+
+    def to_representation(self, value):
+        return days_from_mask(value)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str) or not data.strip():
+            self.fail("invalid")
+        try:
+            return mask_from_days(data)
+        except ValueError:
+            self.fail("invalid")
+
+
+class ServiceSerializer(
+    SparseFieldsetMixin, CoordinatesMixin, serializers.ModelSerializer
+):
     images = ServiceImageSerializer(many=True, required=False)
+    available_days = WeekdaysField(source="available_weekdays")
     provider_email = serializers.EmailField(source="provider.email", read_only=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
     status_display = serializers.CharField(source="get_status_display", read_only=True)
@@ -58,6 +97,8 @@ class ServiceSerializer(serializers.ModelSerializer):
             "city",
             "state",
             "country",
+            "latitude",
+            "longitude",
             "availability_start",
             "availability_end",
             "available_days",
@@ -68,6 +109,22 @@ class ServiceSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "provider", "created_at", "updated_at"]
+        # Columnas y relaciones que necesita cada campo (ver SparseFieldsetMixin)
+        field_dependencies = {
+            "id": {},
+            "category_name": {
+                "only": ["category", "category__name"],
+                "select_related": ["category"],
+            },
+            "provider_email": {
+                "only": ["provider", "provider__email"],
+                "select_related": ["provider"],
+            },
+            "price_type_display": {"only": ["price_type"]},
+            "available_days": {"only": ["available_weekdays"]},
+            "status_display": {"only": ["status"]},
+            "images": {"prefetch_related": ["images"]},
+        }
 
     def validate(self, attrs):
         # Validar que el prestador esté verificado
@@ -84,24 +141,7 @@ class ServiceSerializer(serializers.ModelSerializer):
                     "La hora de inicio debe ser anterior a la hora de fin"
                 )
 
-        # Validar días disponibles
-        if attrs.get("available_days"):
-            valid_days = [
-                "Lunes",
-                "Martes",
-                "Miércoles",
-                "Jueves",
-                "Viernes",
-                "Sábado",
-                "Domingo",
-            ]
-            days = [day.strip() for day in attrs["available_days"].split(",")]
-            if not all(day in valid_days for day in days):
-                raise serializers.ValidationError(
-                    "Los días disponibles deben ser válidos (Lunes, Martes, etc.)"
-                )
-
-        return attrs
+        return super().validate(attrs)
 
     def validate_price(self, value):
         if value <= 0:
@@ -110,11 +150,12 @@ class ServiceSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         images_data = validated_data.pop("images", [])
-        service = Service.objects.create(**validated_data)
+        with transaction.atomic():
+            service = Service.objects.create(**validated_data)
 
-        # Crear imágenes asociadas
-        for image_data in images_data:
-            ServiceImage.objects.create(service=service, **image_data)
+            # Crear imágenes asociadas
+            if images_data:
+                self._add_images(service, images_data)
 
         return service
 
@@ -128,19 +169,34 @@ class ServiceSerializer(serializers.ModelSerializer):
 
         # Actualizar imágenes si se proporcionan
         if images_data is not None:
-            # Eliminar imágenes existentes
-            instance.images.all().delete()
-            # Crear nuevas imágenes
-            for image_data in images_data:
-                ServiceImage.objects.create(service=instance, **image_data)
+            with transaction.atomic():
+                gallery.lock_service(instance.pk)
+                # Eliminar imágenes existentes
+                instance.images.all().delete()
+                # Crear nuevas imágenes
+                if images_data:
+                    self._add_images(instance, images_data)
 
         return instance
 
+    def _add_images(self, service, images_data):
+        # La principal es la primera marcada como tal (o la primera de todas)
+        primary = next(
+            (i for i, data in enumerate(images_data) if data.get("is_primary")), 0
+        )
+        gallery.add_images(
+            service, [data["image"] for data in images_data], primary=primary
+        )
 
-class ServiceListSerializer(serializers.ModelSerializer):
+
+class ServiceListSerializer(NearFieldsMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(source="category.name")
     provider_name = serializers.SerializerMethodField()
     primary_image = serializers.SerializerMethodField()
+    primary_image_renditions = serializers.SerializerMethodField()
+    primary_image_metadata = serializers.SerializerMethodField()
+    rating_avg = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = Service
@@ -153,15 +209,77 @@ class ServiceListSerializer(serializers.ModelSerializer):
             "price_type",
             "location",
             "primary_image",
+            "primary_image_renditions",
+            "primary_image_metadata",
+            "rating_avg",
+            "rating_count",
             "status",
             "created_at",
+            "distance_km",
         ]
 
     def get_provider_name(self, obj):
         return f"{obj.provider.first_name} {obj.provider.last_name}"
 
+    def _primary(self, obj):
+        # Usar la imagen precargada por la vista si existe (evita N+1)
+        if hasattr(obj, "primary_images"):
+            return obj.primary_images[0] if obj.primary_images else None
+        return obj.images.filter(is_primary=True).first()
+
     def get_primary_image(self, obj):
-        primary_image = obj.images.filter(is_primary=True).first()
+        primary_image = self._primary(obj)
         if primary_image:
             return primary_image.image.url
         return None
+
+    def get_primary_image_renditions(self, obj):
+        primary_image = self._primary(obj)
+        return rendition_urls(primary_image) if primary_image else {}
+
+    def get_primary_image_metadata(self, obj):
+        primary_image = self._primary(obj)
+        return image_metadata(primary_image) if primary_image else None
+
+    def get_rating_avg(self, obj):
+        if obj.rating_avg is None:
+            return None
+        return round(obj.rating_avg, 2)
+
+    def get_distance_km(self, obj):
+        # Solo en búsquedas por cercanía (?near=, ver NearFieldsMixin)
+        distance = getattr(obj, "distance", None)
+        if distance is None:
+            return None
+        return round(distance / 1000, 3)
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Carga categoría, prestador e imagen principal en un número fijo de consultas"""
+        queryset = queryset.defer("search_vector")
+        return queryset.select_related("category", "provider").prefetch_related(
+            Prefetch(
+                "images",
+                queryset=ServiceImage.objects.filter(is_primary=True),
+                to_attr="primary_images",
+            )
+        )
+
+
+class ServiceCardSerializer(NearFieldsMixin, serializers.ModelSerializer):
+    """Misma representación que ServiceListSerializer, leída desde ServiceCard"""
+
+    id = serializers.IntegerField(source="pk", read_only=True)
+    primary_image = serializers.SerializerMethodField()
+    rating_avg = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ServiceCard
+        fields = ServiceListSerializer.Meta.fields
+
+    def get_primary_image(self, obj):
+        return obj.primary_image or None
+
+    get_rating_avg = ServiceListSerializer.get_rating_avg
+    get_distance_km = ServiceListSerializer.get_distance_km
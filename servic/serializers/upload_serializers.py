@@ -0,0 +1,30 @@
+from django.conf import settings
+from rest_framework import serializers
+from ..models import UploadSession
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "purpose",
+            "filename",
+            "content_type",
+            "size",
+            "offset",
+            "created_at",
+            "expires_at",
+        ]
+        read_only_fields = ["id", "offset", "created_at", "expires_at"]
+
+    def validate_size(self, value):
+        # Rechazar antes de recibir datos lo que los validadores no aceptarían
+        if value <= 0:
+            raise serializers.ValidationError("El archivo está vacío")
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            limit = settings.CHUNKED_UPLOAD_MAX_SIZE // (1024 * 1024)
+            raise serializers.ValidationError(
+                f"El archivo no debe superar los {limit}MB"
+            )
+        return value
@@ -0,0 +1,181 @@
+from operator import itemgetter
+
+from django.utils import timezone
+
+from ..models import ServiceContract
+from .contract_serializers import ServiceContractSerializer
+from .service_serializers import ServiceCardSerializer
+
+
+# Conversores: reproducen el to_representation de los campos DRF equivalentes
+def decimal_string(places):
+    """DecimalField(decimal_places=places) con COERCE_DECIMAL_TO_STRING"""
+    exponent = f"1e-{places}"
+
+    def convert(value):
+        return format(value.quantize(type(value)(exponent)), "f")
+
+    return convert
+
+
+def iso_datetime(value):
+    """DateTimeField en ISO 8601, en la zona horaria activa y con "Z" para UTC"""
+    if timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    else:
+        value = timezone.make_aware(value)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def choice_display(choices):
+    """get_FOO_display() resuelto con un dict en lugar de recorrer las opciones"""
+    labels = {key: str(label) for key, label in choices}
+    return lambda value: labels.get(value, value)
+
+
+def full_name(first_name, last_name):
+    return f"{first_name} {last_name}"
+
+
+class column:
+    """Campo de salida leído de una columna de .values(); None se devuelve tal cual"""
+
+    def __init__(self, source, convert=None, optional=False):
+        self.source = source
+        self.convert = convert
+        # Anotaciones que solo existen en algunas consultas (ej. distance)
+        self.optional = optional
+
+    @property
+    def columns(self):
+        return () if self.optional else (self.source,)
+
+    def compile(self):
+        source, convert = self.source, self.convert
+        get = (lambda row: row.get(source)) if self.optional else itemgetter(source)
+        if convert is None:
+            return get
+
+        def mapper(row):
+            value = get(row)
+            return None if value is None else convert(value)
+
+        return mapper
+
+
+class combine:
+    """Campo calculado a partir de varias columnas (como un SerializerMethodField)"""
+
+    def __init__(self, function, *sources):
+        self.function = function
+        self.columns = sources
+
+    def compile(self):
+        function, sources = self.function, self.columns
+        if len(sources) == 1:
+            (source,) = sources
+            return lambda row: function(row[source])
+        get = itemgetter(*sources)
+        return lambda row: function(*get(row))
+
+
+class ValuesSerializer:
+    """
+    Camino rápido de solo lectura para listados: en lugar de instanciar un
+    ModelSerializer y recorrer sus campos por objeto, la consulta se hace con
+    .values() y cada fila se convierte con funciones precompiladas.
+
+    `fields` describe la salida en el mismo orden que `serializer_class`, que
+    sigue siendo la referencia (el JSON resultante debe ser idéntico) y define
+    ?fields= / ?omit= si usa SparseFieldsetMixin y los campos de ?near= si usa
+    NearFieldsMixin.
+    """
+
+    serializer_class = None
+    fields = {}
+
+    def __init__(self, request=None):
+        names = list(self.fields)
+        if request is not None and hasattr(self.serializer_class, "selected_fields"):
+            selected = set(self.serializer_class.selected_fields(request))
+            names = [name for name in names if name in selected]
+        if hasattr(self.serializer_class, "omitted_fields"):
+            omitted = self.serializer_class.omitted_fields(request)
+            names = [name for name in names if name not in omitted]
+        self.mappers = [(name, self.fields[name].compile()) for name in names]
+        self.columns = list(
+            dict.fromkeys(c for name in names for c in self.fields[name].columns)
+        )
+
+    def get_queryset(self, queryset, extra_columns=()):
+        # Las anotaciones (search_rank, distance) y las columnas de orden se
+        # conservan: el cursor de paginación y algunos campos las leen de la fila
+        columns = dict.fromkeys(
+            [*self.columns, *extra_columns, *queryset.query.annotations]
+        )
+        return queryset.values(*columns)
+
+    def to_representation(self, row):
+        return {name: mapper(row) for name, mapper in self.mappers}
+
+    def many(self, rows):
+        mappers = self.mappers
+        return [{name: mapper(row) for name, mapper in mappers} for row in rows]
+
+
+def _distance_km(distance):
+    return round(distance / 1000, 3)
+
+
+class ServiceCardValuesSerializer(ValuesSerializer):
+    serializer_class = ServiceCardSerializer
+    fields = {
+        "id": column("pk"),
+        "title": column("title"),
+        "category_name": column("category_name"),
+        "provider_name": column("provider_name"),
+        "price": column("price", decimal_string(2)),
+        "price_type": column("price_type"),
+        "location": column("location"),
+        "primary_image": combine(lambda url: url or None, "primary_image"),
+        "primary_image_renditions": column("primary_image_renditions"),
+        "primary_image_metadata": column("primary_image_metadata"),
+        "rating_avg": column("rating_avg", lambda avg: round(avg, 2)),
+        "rating_count": column("rating_count"),
+        "status": column("status"),
+        "created_at": column("created_at", iso_datetime),
+        "distance_km": column("distance", _distance_km, optional=True),
+    }
+
+
+class ServiceContractValuesSerializer(ValuesSerializer):
+    serializer_class = ServiceContractSerializer
+    fields = {
+        "id": column("id"),
+        "service": column("service"),
+        "service_title": column("service__title"),
+        "client": column("client"),
+        "client_name": combine(full_name, "client__first_name", "client__last_name"),
+        "provider": column("provider"),
+        "provider_name": combine(
+            full_name, "provider__first_name", "provider__last_name"
+        ),
+        "status": column("status"),
+        "status_display": column(
+            "status", choice_display(ServiceContract.STATUS_CHOICES)
+        ),
+        "start_date": column("start_date", iso_datetime),
+        "end_date": column("end_date", iso_datetime),
+        "description": column("description"),
+        "location": column("location"),
+        "rejection_reason": column("rejection_reason"),
+        "client_rating": column("client_rating"),
+        "client_review": column("client_review"),
+        "provider_rating": column("provider_rating"),
+        "provider_review": column("provider_review"),
+        "created_at": column("created_at", iso_datetime),
+        "updated_at": column("updated_at", iso_datetime),
+    }
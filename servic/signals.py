@@ -0,0 +1,178 @@
+import copy
+
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import autocomplete, blobs, cache, cards, popularity, ratings, renditions
+from .models import (
+    Service,
+    ServiceCategory,
+    ServiceContract,
+    ServiceImage,
+    ServiceProviderProfile,
+    User,
+)
+from .search import get_search_backend
+
+
+# Mantener sincronizado el índice de búsqueda del catálogo una vez confirmada
+# la transacción: un cambio deshecho por rollback no llega al índice en memoria
+@receiver(post_save, sender=Service)
+def index_service(sender, instance, update_fields=None, **kwargs):
+    backend = get_search_backend()
+    if backend.needs_reindex(update_fields):
+        # Copia con los valores guardados, por si la instancia cambia después
+        saved = copy.copy(instance)
+        transaction.on_commit(lambda: backend.index(saved))
+
+
+@receiver(post_delete, sender=Service)
+def unindex_service(sender, instance, **kwargs):
+    service_id = instance.pk
+    transaction.on_commit(lambda: get_search_backend().remove(service_id))
+
+
+# Mantener el índice de autocompletado (títulos activos y categorías) una vez
+# confirmada la transacción
+@receiver(post_save, sender=Service)
+def update_service_suggestions(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {"title", "status"} & set(update_fields):
+        autocomplete.index.update_on_commit(
+            "service", instance.pk, instance.title, instance.status == "active"
+        )
+
+
+@receiver(post_delete, sender=Service)
+def remove_service_suggestions(sender, instance, **kwargs):
+    autocomplete.index.remove_on_commit("service", instance.pk)
+
+
+@receiver(post_save, sender=ServiceCategory)
+def update_category_suggestions(sender, instance, **kwargs):
+    autocomplete.index.update_on_commit("category", instance.pk, instance.name)
+
+
+@receiver(post_delete, sender=ServiceCategory)
+def remove_category_suggestions(sender, instance, **kwargs):
+    autocomplete.index.remove_on_commit("category", instance.pk)
+
+
+# Recalcular la popularidad del servicio cuando una contratación se completa,
+# deja de estar completada o cambia su calificación
+@receiver(post_save, sender=ServiceContract)
+def refresh_service_popularity(sender, instance, **kwargs):
+    previous_status = instance.previous("status")
+    if "completed" not in (previous_status, instance.status):
+        return
+    if previous_status != instance.status or (
+        instance.previous("client_rating") != instance.client_rating
+    ):
+        popularity.refresh_popularity(instance.service_id)
+
+
+@receiver(post_delete, sender=ServiceContract)
+def refresh_popularity_on_contract_delete(sender, instance, **kwargs):
+    if instance.status == "completed":
+        popularity.refresh_popularity(instance.service_id)
+
+
+# Promedio y cantidad de calificaciones del servicio (incluye ediciones)
+@receiver(post_save, sender=ServiceContract)
+def update_service_rating(sender, instance, created, **kwargs):
+    previous = None if created else instance.previous("client_rating")
+    ratings.apply_rating_change(instance.service_id, previous, instance.client_rating)
+
+
+@receiver(post_delete, sender=ServiceContract)
+def remove_service_rating(sender, instance, **kwargs):
+    ratings.apply_rating_change(instance.service_id, instance.client_rating, None)
+
+
+# Mantener las tarjetas desnormalizadas del catálogo (ServiceCard)
+@receiver(post_save, sender=Service)
+def sync_service_card(sender, instance, **kwargs):
+    cards.sync_service_card(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ServiceImage)
+def sync_service_card_image(sender, instance, **kwargs):
+    cards.sync_primary_image(instance.service_id)
+
+
+# Generar miniaturas y WebP en el pool de procesos una vez confirmada la
+# transacción (el archivo ya está en el storage y la fila es visible)
+@receiver(post_save, sender=ServiceImage)
+def generate_image_renditions(sender, instance, **kwargs):
+    if instance.has_changed("image"):
+        transaction.on_commit(lambda: renditions.enqueue_renditions([instance]))
+
+
+# Conteo de referencias de los archivos deduplicados (servic/storage.py)
+@receiver(post_save, sender=ServiceImage)
+@receiver(post_save, sender=ServiceProviderProfile)
+def count_file_references(sender, instance, **kwargs):
+    for model, field in blobs.FILE_FIELDS:
+        if sender is model and instance.has_changed(field):
+            blobs.retain(getattr(instance, field).name)
+            blobs.release(instance.previous(field))
+
+
+@receiver(post_delete, sender=ServiceImage)
+@receiver(post_delete, sender=ServiceProviderProfile)
+def release_file_references(sender, instance, **kwargs):
+    for model, field in blobs.FILE_FIELDS:
+        if sender is model:
+            blobs.release(getattr(instance, field).name)
+
+
+@receiver(post_save, sender=ServiceCategory)
+def sync_service_card_category(sender, instance, **kwargs):
+    cards.sync_category_name(instance)
+
+
+@receiver(post_save, sender=User)
+def sync_service_card_provider(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {"first_name", "last_name"} & set(update_fields):
+        cards.sync_provider_name(instance)
+
+
+# Invalidar la caché del catálogo cuando cambian sus datos
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_service_cache(sender, instance, **kwargs):
+    cache.invalidate(service_id=instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ServiceImage)
+def invalidate_service_image_cache(sender, instance, **kwargs):
+    cache.invalidate(service_id=instance.service_id)
+
+
+# Las imágenes forman parte del detalle del servicio: actualizar su updated_at
+# para que la ETag (servic.etags) cambie
+@receiver([post_save, post_delete], sender=ServiceImage)
+def touch_service_on_image_change(sender, instance, **kwargs):
+    Service.objects.filter(pk=instance.service_id).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=ServiceCategory)
+def invalidate_category_cache(sender, instance, **kwargs):
+    cache.invalidate(all_details=True)
+
+
+# El nombre y el email del prestador se muestran en listados y detalles
+@receiver(post_save, sender=User)
+def invalidate_provider_cache(sender, instance, update_fields=None, **kwargs):
+    fields = {"first_name", "last_name", "email"}
+    if instance.user_type == "provider" and (
+        update_fields is None or fields & set(update_fields)
+    ):
+        cache.invalidate(all_details=True)
+
+
+@receiver(setting_changed)
+def reset_search_backend(sender, setting, **kwargs):
+    if setting == "SERVICE_SEARCH_BACKEND":
+        get_search_backend.cache_clear()
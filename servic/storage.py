@@ -0,0 +1,99 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+# Carpeta (dentro de MEDIA_ROOT) para escribir los archivos antes de renombrarlos;
+# en el mismo disco que el destino para que el renombre sea atómico
+INCOMING_DIR = ".incoming"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Guarda cada archivo una sola vez según su contenido: el nombre final es
+    `<upload_to>/<2 primeros>/<sha256><extensión>`, así una foto o certificado
+    subido varias veces ocupa un único archivo en disco.
+
+    Si el contenido se puede releer (subidas en memoria o en un temporal) se
+    calcula el hash primero y solo se escribe si el archivo no existe; si no,
+    se calcula mientras se escribe un temporal que se descarta si ya estaba.
+    Cada archivo tiene una fila MediaBlob con su conteo de referencias (ver
+    servic/blobs.py), que permite borrar los que ya nadie usa.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre definitivo depende del contenido y lo decide _save()
+        return name
+
+    def _blob_name(self, name, digest):
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], f"{digest}{extension}")
+
+    def _save(self, name, content):
+        # Importación diferida: servic.blobs importa los modelos, que usan este módulo
+        from .blobs import register_blob
+
+        if hasattr(content, "seek") and content.seekable():
+            digest = hashlib.sha256()
+            for chunk in content.chunks():
+                digest.update(chunk)
+            blob_name = self._blob_name(name, digest.hexdigest())
+            # Registrar antes de comprobar si existe: la limpieza no borra
+            # archivos con fila reciente
+            register_blob(blob_name, content.size)
+            if self.exists(blob_name):
+                self._touch(blob_name)
+            else:
+                self._store(name, content)
+        else:
+            blob_name = self._store(name, content)
+            register_blob(blob_name, self.size(blob_name))
+        return blob_name
+
+    def _touch(self, name):
+        """
+        Actualizar la fecha del archivo al volver a guardarlo. La fila MediaBlob
+        recién escrita no es visible hasta el commit, así la limpieza de
+        archivos sin fila (servic/blobs.py) respeta la espera mínima.
+        """
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            pass
+
+    def _store(self, name, content):
+        """
+        Escribir `content` en un temporal calculando su hash y enlazarlo con su
+        nombre definitivo. os.link falla si otro proceso ya guardó el mismo
+        contenido, en cuyo caso se conserva el existente.
+        """
+        incoming = self.path(INCOMING_DIR)
+        os.makedirs(incoming, exist_ok=True)
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=incoming, delete=False) as temporary:
+            for chunk in content.chunks():
+                digest.update(chunk)
+                temporary.write(chunk)
+        blob_name = self._blob_name(name, digest.hexdigest())
+        full_path = self.path(blob_name)
+        try:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary.name, self.file_permissions_mode)
+            os.link(temporary.name, full_path)
+        except FileExistsError:
+            self._touch(blob_name)
+        finally:
+            os.unlink(temporary.name)
+        return blob_name
+
+
+# Sin argumentos: toma MEDIA_ROOT y MEDIA_URL vigentes (también con override_settings)
+content_storage = ContentAddressedStorage()
+
+
+def get_content_storage():
+    return content_storage
@@ -1,3 +1,1681 @@
-from django.test import TestCase
+import copy
+import gzip
+import io
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
 
-# Create your tests here.
+import msgpack
+from PIL import ExifTags, Image
+
+from django.conf import settings
+from django.core.files import locks
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import caches
+from django.db import IntegrityError, connection, connections, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import (
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from . import autocomplete, uploads
+from .blobs import collect_orphans, recount_references
+from .cards import rebuild_service_cards
+from .checks import check_catalog_cache
+from .imaging import render_image
+from .models import (
+    User,
+    ServiceCategory,
+    Service,
+    ServiceImage,
+    ServiceCard,
+    ServiceContract,
+    ServiceProviderProfile,
+    MediaBlob,
+    UploadSession,
+)
+from .middleware import CompressionMiddleware
+from .middleware.compression_middleware import stats as compression_stats
+from .popularity import EPOCH, compute_popularity, rebuild_popularity
+from .ratings import recompute_ratings
+from .renderers import OrjsonRenderer
+from .renditions import image_metadata
+from .search import get_search_backend
+from .reputation import compute_provider_reputation
+from .serializers import (
+    ServiceCardSerializer,
+    ServiceListSerializer,
+    ServiceProviderProfileSerializer,
+    ServiceSerializer,
+)
+from .storage import INCOMING_DIR, content_storage
+from .weekdays import mask_from_days
+
+
+class TemporaryMediaMixin:
+    """
+    MEDIA_ROOT propio de cada clase de pruebas, borrado al terminar: los
+    archivos de una corrida (o de otra clase) no afectan la deduplicación ni
+    las comprobaciones de existencia de la siguiente.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp(prefix="servic-test-media-")
+        cls._media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        cls._media_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            cls._media_settings.disable()
+            shutil.rmtree(cls.media_root, ignore_errors=True)
+
+
+def crear_usuario(username="prestador", user_type="provider", **extra):
+    """Usuario de prueba con email <username>@example.com"""
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="clave-segura-123",
+        user_type=user_type,
+        **extra,
+    )
+
+
+def crear_servicios(cantidad, provider, category, status="active"):
+    """Crea servicios con una imagen principal y otra secundaria cada uno"""
+    services = []
+    for i in range(cantidad):
+        service = Service.objects.create(
+            title=f"Servicio {i}",
+            description="Descripción de prueba",
+            category=category,
+            provider=provider,
+            price=Decimal("100.00"),
+            price_type="fixed",
+            location="Centro",
+            city="Córdoba",
+            state="Córdoba",
+            country="Argentina",
+            availability_start=time(9, 0),
+            availability_end=time(18, 0),
+            available_weekdays=mask_from_days("Lunes,Martes"),
+            status=status,
+        )
+        for is_primary in (True, False):
+            ServiceImage.objects.create(
+                service=service,
+                image=SimpleUploadedFile("foto.jpg", b"x", content_type="image/jpeg"),
+                is_primary=is_primary,
+            )
+        services.append(service)
+    return services
+
+
+class ServiceListQueryCountTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.provider = crear_usuario(first_name="Ana", last_name="Pérez")
+        self.category = ServiceCategory.objects.create(
+            name="Plomería", description="Arreglos"
+        )
+
+    def contar_consultas(self, url):
+        caches["catalog"].clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_service_list_query_count_is_constant(self):
+        url = reverse("service-list")
+        crear_servicios(2, self.provider, self.category)
+        pocas = self.contar_consultas(url)
+        crear_servicios(20, self.provider, self.category)
+        muchas = self.contar_consultas(url)
+        self.assertEqual(pocas, muchas)
+
+    def test_admin_service_list_query_count_is_constant(self):
+        admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="clave-segura-123"
+        )
+        self.client.force_authenticate(admin)
+        url = reverse("admin-service-list")
+        crear_servicios(2, self.provider, self.category, status="pending")
+        pocas = self.contar_consultas(url)
+        crear_servicios(20, self.provider, self.category, status="pending")
+        muchas = self.contar_consultas(url)
+        self.assertEqual(pocas, muchas)
+
+
+class ServiceListPaginationTests(TemporaryMediaMixin, TestCase):
+    def test_cursor_pagination_walks_every_service_once(self):
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Gas", description="Gas")
+        services = crear_servicios(7, provider, category)
+
+        client = APIClient()
+        url = reverse("service-list") + "?page_size=3"
+        vistos = []
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 3)
+            vistos += [item["id"] for item in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(sorted(vistos), sorted(s.id for s in services))
+
+
+@override_settings(
+    SERVICE_SEARCH_BACKEND="servic.search.memory.InMemorySearchBackend",
+)
+class ServiceSearchTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Hogar", description="Hogar")
+        self.plomeria, self.electricidad = crear_servicios(2, provider, category)
+        self.plomeria.title = "Plomería urgente"
+        self.plomeria.save()
+        self.electricidad.title = "Electricidad"
+        self.electricidad.description = "Instalaciones y plomeria menor"
+        self.electricidad.save()
+
+    def buscar(self, texto):
+        response = APIClient().get(reverse("service-list"), {"search": texto})
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(
+            self.buscar("plomeria"), [self.plomeria.id, self.electricidad.id]
+        )
+        self.assertEqual(self.buscar("electricidad plomeria"), [self.electricidad.id])
+
+    def test_index_follows_status_changes(self):
+        self.plomeria.status = "inactive"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plomeria.save(update_fields=["status"])
+        self.assertEqual(self.buscar("urgente"), [])
+        self.plomeria.status = "active"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plomeria.save(update_fields=["status"])
+        self.assertEqual(self.buscar("urgente"), [self.plomeria.id])
+
+    def test_only_the_best_matches_reach_the_database(self):
+        backend = get_search_backend()
+        self.addCleanup(setattr, backend, "max_candidates", backend.max_candidates)
+        backend.max_candidates = 1
+        # La descripción pesa menos que el título: queda fuera
+        self.assertEqual(self.buscar("plomeria"), [self.plomeria.id])
+        self.assertEqual(self.buscar("instalaciones"), [self.electricidad.id])
+
+    def test_rolled_back_changes_are_not_indexed(self):
+        self.assertEqual(self.buscar("urgente"), [self.plomeria.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    self.plomeria.title = "Gasista matriculado"
+                    self.plomeria.save()
+                    raise ValueError("rollback")
+        self.assertEqual(self.buscar("gasista"), [])
+        self.assertEqual(self.buscar("urgente"), [self.plomeria.id])
+
+
+class ServiceAvailabilityTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Jardín", description="Poda")
+        self.semana, self.finde = crear_servicios(2, provider, category)
+        self.finde.available_weekdays = mask_from_days("Sábado,Domingo")
+        self.finde.save()
+
+    def test_available_day_filter(self):
+        url = reverse("service-list")
+        response = APIClient().get(url, {"available_day": "sabado"})
+        self.assertEqual([s["id"] for s in response.data["results"]], [self.finde.id])
+        response = APIClient().get(url, {"available_day": "Lunes"})
+        self.assertEqual([s["id"] for s in response.data["results"]], [self.semana.id])
+        response = APIClient().get(url, {"available_day": "feriado"})
+        self.assertEqual(response.data["results"], [])
+
+    def test_detail_renders_days_as_text(self):
+        response = APIClient().get(reverse("service-detail", args=[self.finde.id]))
+        self.assertEqual(response.data["available_days"], "Sábado,Domingo")
+
+
+class CatalogCacheTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        provider = crear_usuario()
+        self.category = ServiceCategory.objects.create(name="Pintura", description="-")
+        (self.service,) = crear_servicios(1, provider, self.category)
+
+    def test_list_is_cached_until_a_service_changes(self):
+        url = reverse("service-list")
+        self.assertEqual(self.client.get(url, {"city": "Córdoba"})["X-Cache"], "MISS")
+        # Mismos filtros con otro orden y parámetros ajenos: misma entrada
+        response = self.client.get(url, {"utm": "x", "city": " Córdoba "})
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        self.service.title = "Pintura de interiores"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.save()
+        response = self.client.get(url, {"city": "Córdoba"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["title"], "Pintura de interiores")
+
+    def test_category_change_invalidates_detail(self):
+        url = reverse("service-detail", args=[self.service.id])
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        self.category.name = "Pintura y empapelado"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["category_name"], "Pintura y empapelado")
+
+    def test_invalidation_waits_for_commit(self):
+        url = reverse("service-list")
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.service.title = "Pintura de interiores"
+            self.service.save()
+            # Mientras la transacción no se confirma sigue sirviéndose la entrada
+            self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+
+    def test_deploy_check_rejects_per_process_cache(self):
+        with self.settings(DEBUG=False):
+            self.assertEqual(
+                [error.id for error in check_catalog_cache(None)], ["servic.E001"]
+            )
+            caches_compartidas = {
+                **settings.CACHES,
+                "catalog": {
+                    "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                    "LOCATION": "redis://localhost:6379/0",
+                },
+            }
+            with self.settings(CACHES=caches_compartidas):
+                self.assertEqual(check_catalog_cache(None), [])
+
+
+class ConditionalGetTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        self.provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Mudanzas", description="-")
+        (self.service,) = crear_servicios(1, self.provider, category)
+
+    def assertNotModified(self, url, client=None):
+        client = client or APIClient()
+        etag = client.get(url)["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        return etag
+
+    def test_service_detail_etag_changes_with_images(self):
+        url = reverse("service-detail", args=[self.service.id])
+        etag = self.assertNotModified(url)
+        self.service.images.filter(is_primary=False).delete()
+        response = APIClient().get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_category_list_and_profile(self):
+        etag = self.assertNotModified(reverse("service-category-list"))
+        ServiceCategory.objects.create(name="Fletes", description="-")
+        response = APIClient().get(
+            reverse("service-category-list"), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+        client = APIClient()
+        client.force_authenticate(self.provider)
+        self.assertNotModified(reverse("user-profile"), client)
+
+
+class ServiceNearTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Cerrajería", description="-")
+        self.centro, self.cerca, self.lejos, self.sin_ubicacion = crear_servicios(
+            4, provider, category
+        )
+        # Centro de Córdoba, ~5 km al norte y Villa Carlos Paz (~30 km)
+        for service, coords in (
+            (self.centro, (-31.4167, -64.1833)),
+            (self.cerca, (-31.3717, -64.1833)),
+            (self.lejos, (-31.4241, -64.4978)),
+        ):
+            service.latitude, service.longitude = coords
+            service.save()
+
+    def test_near_returns_services_within_radius_sorted_by_distance(self):
+        for rapido in (False, True):
+            caches["catalog"].clear()
+            with self.settings(FAST_LIST_SERIALIZATION=rapido):
+                response = APIClient().get(
+                    reverse("service-list"),
+                    {"near": "-31.41,-64.18", "radius_km": "10"},
+                )
+                self.assertEqual(response.status_code, 200)
+                results = response.data["results"]
+                self.assertEqual(
+                    [s["id"] for s in results], [self.centro.id, self.cerca.id]
+                )
+                self.assertLess(results[0]["distance_km"], results[1]["distance_km"])
+                self.assertAlmostEqual(results[1]["distance_km"], 4.3, delta=0.5)
+
+                # Sin ?near= el listado no incluye distance_km
+                response = APIClient().get(reverse("service-list"))
+                self.assertTrue(response.data["results"])
+                for item in response.data["results"]:
+                    self.assertNotIn("distance_km", item)
+
+    def test_invalid_near_is_rejected(self):
+        response = APIClient().get(reverse("service-list"), {"near": "sur"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_coordinates_must_be_sent_together(self):
+        datos = {
+            "identification_type": "dni",
+            "identification_number": "30111222",
+            "phone_number": "351 555-1234",
+            "address": "Calle 1",
+            "city": "Córdoba",
+            "state": "Córdoba",
+            "country": "Argentina",
+            "certification_file": SimpleUploadedFile(
+                "cert.pdf", b"%PDF", content_type="application/pdf"
+            ),
+            "certification_description": "-",
+            "years_of_experience": 3,
+            "latitude": -31.4167,
+        }
+        serializer = ServiceProviderProfileSerializer(data=datos)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("longitude", serializer.errors)
+
+        # En una actualización parcial la otra coordenada sale del objeto
+        provider = self.cerca.provider
+        ServiceProviderProfile.objects.create(
+            user=provider, is_verified=True, **dict(datos, latitude=None)
+        )
+        request = APIRequestFactory().patch("/")
+        request.user = provider
+        context = {"request": request}
+        serializer = ServiceSerializer(
+            self.cerca, data={"latitude": -31.4}, partial=True, context=context
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer = ServiceSerializer(
+            self.cerca, data={"longitude": None}, partial=True, context=context
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("longitude", serializer.errors)
+        serializer = ServiceSerializer(
+            self.sin_ubicacion, data={"latitude": -31.4}, partial=True, context=context
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("longitude", serializer.errors)
+
+
+@override_settings(
+    SERVICE_SEARCH_BACKEND="servic.search.memory.InMemorySearchBackend",
+)
+class ServiceFacetsTests(TemporaryMediaMixin, TestCase):
+    def test_facets_follow_current_filters(self):
+        caches["catalog"].clear()
+        provider = crear_usuario()
+        gas = ServiceCategory.objects.create(name="Gas", description="-")
+        luz = ServiceCategory.objects.create(name="Luz", description="-")
+        crear_servicios(3, provider, gas)
+        (caro,) = crear_servicios(1, provider, luz)
+        caro.price, caro.city, caro.price_type = Decimal("750"), "Rosario", "hourly"
+        caro.save()
+        crear_servicios(1, provider, luz, status="inactive")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = APIClient().get(reverse("service-facets"))
+        # Una consulta por faceta; en PostgreSQL, una sola con GROUPING SETS
+        queries = [q["sql"] for q in ctx.captured_queries]
+        if connection.vendor == "postgresql":
+            self.assertEqual(len(queries), 1)
+            self.assertIn("GROUPING SETS", queries[0])
+        else:
+            self.assertEqual(len(queries), 5)
+            # Cada consulta agrupa solo las columnas de su faceta
+            self.assertTrue(all(q.count("GROUP BY") == 1 for q in queries))
+        data = response.data
+        self.assertEqual(data["total"], 4)
+        self.assertEqual(
+            data["category"],
+            [
+                {"value": gas.id, "label": "Gas", "count": 3},
+                {"value": luz.id, "label": "Luz", "count": 1},
+            ],
+        )
+        self.assertEqual(data["city"][0], {"value": "Córdoba", "count": 3})
+        self.assertEqual([b["count"] for b in data["price"]], [0, 0, 3, 0, 1, 0])
+
+        response = APIClient().get(
+            reverse("service-facets"), {"category": luz.id, "search": "servicio"}
+        )
+        self.assertEqual(response.data["total"], 1)
+        self.assertEqual(
+            response.data["price_type"],
+            [{"value": "hourly", "label": "Por Hora", "count": 1}],
+        )
+
+
+class ServiceCardTests(TemporaryMediaMixin, TestCase):
+    def assertCardsInSync(self):
+        services = ServiceListSerializer.setup_eager_loading(Service.objects.all())
+        esperado = ServiceListSerializer(services.order_by("pk"), many=True).data
+        tarjetas = ServiceCardSerializer(
+            ServiceCard.objects.order_by("pk"), many=True
+        ).data
+        self.assertEqual(tarjetas, esperado)
+
+    def test_cards_follow_source_rows(self):
+        provider = crear_usuario(first_name="Ana", last_name="Pérez")
+        category = ServiceCategory.objects.create(name="Limpieza", description="-")
+        primero, segundo = crear_servicios(2, provider, category)
+        self.assertCardsInSync()
+
+        category.name = "Limpieza profunda"
+        category.save()
+        provider.last_name = "Gómez"
+        provider.save()
+        segundo.price = Decimal("999.99")
+        segundo.status = "inactive"
+        segundo.save()
+        primero.images.filter(is_primary=True).delete()
+        nueva = primero.images.get()
+        nueva.is_primary = True
+        nueva.save()
+        self.assertCardsInSync()
+
+        segundo.delete()
+        self.assertCardsInSync()
+        rebuild_service_cards()
+        self.assertCardsInSync()
+
+
+class SparseFieldsetTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        self.client = APIClient()
+        self.provider = crear_usuario(first_name="Ana", last_name="Pérez")
+        self.cliente = crear_usuario("cliente", user_type="client")
+        category = ServiceCategory.objects.create(name="Gas", description="Gas")
+        (self.service,) = crear_servicios(1, self.provider, category)
+
+    def test_service_detail_fields_and_omit(self):
+        url = reverse("service-detail", args=[self.service.pk])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {"fields": "id,title,price_type_display"})
+        self.assertEqual(
+            response.data,
+            {
+                "id": self.service.pk,
+                "title": "Servicio 0",
+                "price_type_display": "Precio Fijo",
+            },
+        )
+        # Sin imágenes ni relaciones: solo la consulta del servicio (y la de la ETag)
+        self.assertFalse(
+            any("servic_serviceimage" in q["sql"] for q in ctx.captured_queries)
+        )
+
+        response = self.client.get(url, {"omit": "images,description"})
+        self.assertNotIn("images", response.data)
+        self.assertNotIn("description", response.data)
+        self.assertEqual(response.data["provider_email"], "prestador@example.com")
+
+    def test_contract_list_fields_prune_query(self):
+        for _ in range(3):
+            ServiceContract.objects.create(
+                service=self.service,
+                client=self.cliente,
+                provider=self.provider,
+                start_date=timezone.now(),
+                description="Trabajo",
+                location="Centro",
+            )
+        self.client.force_authenticate(self.cliente)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                reverse("list-contracts"), {"fields": "id,service_title,provider_name"}
+            )
+        self.assertEqual(response.status_code, 200)
+        results = response.data.get("results", response.data)
+        self.assertEqual(
+            results[0],
+            {
+                "id": results[0]["id"],
+                "service_title": "Servicio 0",
+                "provider_name": "Ana Pérez",
+            },
+        )
+        consulta = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if "servic_servicecontract" in q["sql"]
+        ]
+        self.assertEqual(len(consulta), 1)
+        self.assertNotIn("description", consulta[0])
+
+
+@override_settings(
+    SERVICE_SEARCH_BACKEND="servic.search.memory.InMemorySearchBackend",
+)
+class ValuesSerializationTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        self.provider = crear_usuario(first_name="Ana", last_name="Pérez")
+        self.cliente = crear_usuario("cliente", user_type="client")
+        category = ServiceCategory.objects.create(name="Gas", description="Gas")
+        services = crear_servicios(5, self.provider, category)
+        services[0].images.all().delete()
+        services[1].price = Decimal("1234.5")
+        services[1].latitude, services[1].longitude = -31.4167, -64.1833
+        services[1].save()
+        for i, service in enumerate(services):
+            ServiceContract.objects.create(
+                service=service,
+                client=self.cliente,
+                provider=self.provider,
+                status=["pending", "completed", "rejected"][i % 3],
+                start_date=timezone.now(),
+                end_date=timezone.now() if i % 2 else None,
+                description="Trabajo",
+                location="Centro",
+                client_rating=4 if i % 2 else None,
+            )
+
+    def assertSameBytes(self, url, params, user=None):
+        client = APIClient()
+        client.force_authenticate(user)
+        respuestas = []
+        for fast in (False, True):
+            caches["catalog"].clear()
+            with self.settings(FAST_LIST_SERIALIZATION=fast):
+                respuestas.append(client.get(url, params))
+        drf, rapido = respuestas
+        self.assertEqual(drf.status_code, 200)
+        self.assertEqual(rapido.content, drf.content)
+        return drf.data
+
+    def test_service_list_matches_drf_serializer(self):
+        url = reverse("service-list")
+        data = self.assertSameBytes(url, {"page_size": 2})
+        self.assertIsNotNone(data["next"])
+        self.assertSameBytes(url, {"ordering": "-price"})
+        self.assertSameBytes(url, {"search": "servicio"})
+        self.assertSameBytes(url, {"near": "-31.41,-64.18"})
+        cursor = data["next"].split("?", 1)[1]
+        self.assertSameBytes(f"{url}?{cursor}", {})
+
+    def test_contract_list_matches_drf_serializer(self):
+        url = reverse("list-contracts")
+        self.assertSameBytes(url, {}, user=self.cliente)
+        self.assertSameBytes(url, {"fields": "id,status_display"}, user=self.cliente)
+        self.assertSameBytes(url, {"page_size": 2}, user=self.provider)
+
+
+class RendererTests(TemporaryMediaMixin, TestCase):
+    def test_orjson_renderer_matches_drf_json(self):
+        data = ReturnDict(
+            {
+                "price": Decimal("1234.50"),
+                "availability_start": time(9, 30),
+                "created_at": datetime(2024, 3, 15, 10, 30, tzinfo=dt_timezone.utc),
+                "updated_at": timezone.localtime(
+                    datetime(2024, 3, 15, 10, 30, 0, 123456, tzinfo=dt_timezone.utc)
+                ),
+                "detail": gettext_lazy("Not found."),
+                "title": "Plomería ñandú",
+                "counts": {1: 2},
+                "images": [{"id": 1, "is_primary": True}, None],
+            },
+            serializer=None,
+        )
+        self.assertEqual(OrjsonRenderer().render(data), JSONRenderer().render(data))
+
+    def test_msgpack_and_json_negotiation(self):
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Gas", description="Gas")
+        (service,) = crear_servicios(1, provider, category)
+        url = reverse("service-detail", args=[service.pk])
+        client = APIClient()
+
+        json_response = client.get(url)
+        self.assertEqual(json_response["Content-Type"], "application/json")
+        packed = client.get(url, HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(packed["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(packed.content), json_response.json())
+        self.assertNotEqual(packed["ETag"], json_response["ETag"])
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        compression_stats.reset()
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Gas", description="Gas")
+        crear_servicios(5, provider, category)
+        caches["catalog"].clear()
+
+    def test_negotiates_encoding_and_records_metrics(self):
+        client = APIClient()
+        url = reverse("service-list")
+        plano = client.get(url)
+        self.assertNotIn("Content-Encoding", plano)
+
+        gzip_response = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(gzip_response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", gzip_response["Vary"])
+        self.assertEqual(gzip.decompress(gzip_response.content), plano.content)
+
+        preferido = client.get(url, HTTP_ACCEPT_ENCODING="gzip;q=0.5, br, zstd;q=0")
+        self.assertEqual(preferido["Content-Encoding"], "br")
+
+        metricas = compression_stats.as_dict()["service-list"]
+        self.assertEqual(metricas["gzip"]["responses"], 1)
+        self.assertLess(metricas["gzip"]["ratio"], 1)
+
+    @override_settings(COMPRESSION_MIN_SIZE=10**6)
+    def test_skips_small_bodies(self):
+        response = APIClient().get(reverse("service-list"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_streaming_response_is_compressed_incrementally(self):
+        chunks = [b'{"id": %d, "title": "Servicio"}\n' % i for i in range(200)]
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(
+                iter(chunks), content_type="application/x-ndjson"
+            )
+        )
+        request = RequestFactory().get("/api/export/", HTTP_ACCEPT_ENCODING="gzip")
+        response = middleware(request)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), b"".join(chunks)
+        )
+
+        imagen = CompressionMiddleware(
+            lambda request: HttpResponse(b"x" * 1000, content_type="image/jpeg")
+        )(request)
+        self.assertNotIn("Content-Encoding", imagen)
+
+
+class AutocompleteTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        autocomplete.index.reset()
+        provider = crear_usuario()
+        self.category = ServiceCategory.objects.create(name="Plomería", description="-")
+        self.service, self.inactivo = crear_servicios(2, provider, self.category)
+        self.service.title = "Reparación de plomería"
+        self.service.save()
+        self.inactivo.title = "Plomero de guardia"
+        self.inactivo.status = "inactive"
+        self.inactivo.save()
+
+    def sugerencias(self, query):
+        response = APIClient().get(reverse("service-autocomplete"), {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [(item["type"], item["text"]) for item in response.data["results"]]
+
+    def test_suggests_categories_and_active_titles_by_word_prefix(self):
+        self.assertEqual(
+            self.sugerencias("PLOM"),
+            [("category", "Plomería"), ("service", "Reparación de plomería")],
+        )
+        self.assertEqual(
+            self.sugerencias("repa"), [("service", "Reparación de plomería")]
+        )
+        self.assertEqual(self.sugerencias(""), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.sugerencias("a")  # cargar el índice
+        with self.captureOnCommitCallbacks(execute=True):
+            self.inactivo.status = "active"
+            self.inactivo.save()
+            self.service.title = "Gasista matriculado"
+            self.service.save()
+        self.assertEqual(
+            self.sugerencias("plom"),
+            [("category", "Plomería"), ("service", "Plomero de guardia")],
+        )
+        self.assertEqual(self.sugerencias("gas"), [("service", "Gasista matriculado")])
+        # Borrar la categoría elimina también sus servicios
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.delete()
+        self.assertEqual(self.sugerencias("plom"), [])
+
+    def test_rolled_back_changes_are_not_suggested(self):
+        self.sugerencias("a")
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.service.title = "Gasista matriculado"
+            self.service.save()
+        # Sin commit no se ejecutan los callbacks: equivale a un rollback
+        self.assertTrue(callbacks)
+        self.assertEqual(self.sugerencias("gas"), [])
+
+    def cambio_de_otro_proceso(self, titulo):
+        # Lo que registra otro worker: la base, la versión compartida y el
+        # cambio en el registro, no la copia de este proceso
+        Service.objects.filter(pk=self.service.pk).update(title=titulo)
+        version = caches["catalog"].incr(autocomplete.VERSION_KEY)
+        caches["catalog"].set(
+            autocomplete.CHANGE_KEY.format(version),
+            ("service", self.service.pk, titulo, True),
+        )
+        return version
+
+    @override_settings(AUTOCOMPLETE_SYNC_INTERVAL_MS=0)
+    def test_changes_from_other_processes_are_applied_incrementally(self):
+        self.sugerencias("a")
+        self.cambio_de_otro_proceso("Gasista")
+        # Sin reconstruir: no consulta la base
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                autocomplete.index.suggest("gas"),
+                [{"type": "service", "id": self.service.pk, "text": "Gasista"}],
+            )
+        self.assertEqual(autocomplete.index.suggest("repa"), [])
+
+        # Si falta un cambio del registro se reconstruye desde la base
+        version = self.cambio_de_otro_proceso("Cerrajero")
+        caches["catalog"].delete(autocomplete.CHANGE_KEY.format(version))
+        self.assertEqual(self.sugerencias("cerra"), [("service", "Cerrajero")])
+
+    @override_settings(AUTOCOMPLETE_SYNC_INTERVAL_MS=60 * 1000)
+    def test_shared_version_is_checked_at_most_once_per_interval(self):
+        self.sugerencias("a")
+        self.cambio_de_otro_proceso("Gasista")
+        self.assertEqual(self.sugerencias("gas"), [])
+        with self.settings(AUTOCOMPLETE_SYNC_INTERVAL_MS=0):
+            self.assertEqual(self.sugerencias("gas"), [("service", "Gasista")])
+
+    def test_ranking_covers_every_match_of_short_prefixes(self):
+        # Más coincidencias de las que se devuelven; la categoría ordena
+        # después de todos los títulos pero va primera
+        plantilla = Service.objects.get(pk=self.service.pk)
+        copias = []
+        for i in range(300):
+            plantilla.pk = None
+            plantilla.title = f"Aire {i:03d}"
+            copias.append(copy.copy(plantilla))
+        Service.objects.bulk_create(copias)
+        ServiceCategory.objects.create(name="Aire acondicionado", description="-")
+        autocomplete.index.reset()
+        self.assertEqual(
+            self.sugerencias("ai")[:3],
+            [
+                ("category", "Aire acondicionado"),
+                ("service", "Aire 000"),
+                ("service", "Aire 001"),
+            ],
+        )
+
+
+class PopularityTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        self.provider = crear_usuario()
+        self.cliente = crear_usuario("cliente", user_type="client")
+        category = ServiceCategory.objects.create(name="Gas", description="Gas")
+        self.nuevo, self.viejo, self.sin_contratos = crear_servicios(
+            3, self.provider, category
+        )
+
+    def completar(self, service, dias, rating=None):
+        contract = ServiceContract.objects.create(
+            service=service,
+            client=self.cliente,
+            provider=self.provider,
+            start_date=timezone.now(),
+            description="Trabajo",
+            location="Centro",
+        )
+        contract = ServiceContract.objects.get(pk=contract.pk)
+        contract.status = "completed"
+        contract.end_date = timezone.now() - timedelta(days=dias)
+        contract.client_rating = rating
+        contract.save()
+        return contract
+
+    def orden(self):
+        response = APIClient().get(reverse("service-list"), {"ordering": "-popularity"})
+        return [item["id"] for item in response.data["results"]]
+
+    def test_recent_completions_and_ratings_rank_first(self):
+        self.completar(self.viejo, dias=400)
+        self.completar(self.viejo, dias=380)
+        self.completar(self.nuevo, dias=2)
+        self.assertEqual(
+            self.orden(), [self.nuevo.pk, self.viejo.pk, self.sin_contratos.pk]
+        )
+
+        # Una mala calificación editada luego baja y vuelve a subir el puntaje
+        contract = self.completar(self.sin_contratos, dias=1, rating=1)
+        bajo = Service.objects.get(pk=self.sin_contratos.pk).popularity
+        contract.client_rating = 5
+        contract.save()
+        alto = Service.objects.get(pk=self.sin_contratos.pk).popularity
+        self.assertGreater(alto, bajo)
+        self.assertEqual(
+            ServiceCard.objects.get(pk=self.sin_contratos.pk).popularity, alto
+        )
+
+        Service.objects.update(popularity=0)
+        ServiceCard.objects.update(popularity=0)
+        rebuild_popularity()
+        self.assertEqual(Service.objects.get(pk=self.sin_contratos.pk).popularity, alto)
+
+    def test_completions_before_epoch_keep_their_order(self):
+        antes = EPOCH - timedelta(days=200)
+        puntajes = [
+            compute_popularity(contratos)
+            for contratos in (
+                [(antes, 5), (antes, 5)],
+                [(antes, 1), (antes, 1), (antes, 1)],
+                [(antes, 5)],
+                [(antes - timedelta(days=365), 5)],
+            )
+        ]
+        self.assertEqual(puntajes, sorted(puntajes, reverse=True))
+        self.assertEqual(len(set(puntajes)), len(puntajes))
+        self.assertGreater(min(puntajes), 0)
+        self.assertGreater(compute_popularity([(EPOCH, 5)]), puntajes[0])
+
+        # Lo mismo a través de las señales
+        self.completar(self.viejo, dias=(timezone.now() - antes).days)
+        self.completar(self.nuevo, dias=(timezone.now() - antes).days - 30)
+        self.assertEqual(
+            self.orden(), [self.nuevo.pk, self.viejo.pk, self.sin_contratos.pk]
+        )
+
+
+class ServiceRatingTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        self.provider = crear_usuario()
+        self.cliente = crear_usuario("cliente", user_type="client")
+        category = ServiceCategory.objects.create(name="Gas", description="Gas")
+        self.service, self.otro = crear_servicios(2, self.provider, category)
+        self.client = APIClient()
+        self.client.force_authenticate(self.cliente)
+
+    def calificar(self, contract, rating):
+        response = self.client.put(
+            reverse("contract-review", args=[contract.pk]),
+            {"client_rating": rating},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def contrato_completado(self):
+        return ServiceContract.objects.create(
+            service=self.service,
+            client=self.cliente,
+            provider=self.provider,
+            status="completed",
+            start_date=timezone.now(),
+            end_date=timezone.now(),
+            description="Trabajo",
+            location="Centro",
+        )
+
+    def test_review_edits_keep_aggregates_in_sync(self):
+        primero, segundo = self.contrato_completado(), self.contrato_completado()
+        self.calificar(primero, 4)
+        self.calificar(primero, 2)  # edición: reemplaza, no suma
+        self.calificar(segundo, 5)
+
+        service = Service.objects.get(pk=self.service.pk)
+        self.assertEqual((service.rating_count, service.rating_avg), (2, 3.5))
+
+        results = APIClient().get(reverse("service-list")).data["results"]
+        calificados = {item["id"]: item for item in results}
+        self.assertEqual(calificados[self.service.pk]["rating_avg"], 3.5)
+        self.assertEqual(calificados[self.service.pk]["rating_count"], 2)
+        self.assertIsNone(calificados[self.otro.pk]["rating_avg"])
+
+        response = APIClient().get(reverse("service-list"), {"min_rating": "3"})
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], [self.service.pk]
+        )
+        for valor in ("x", "nan", "inf", "-3", "9", "0.5"):
+            response = APIClient().get(reverse("service-list"), {"min_rating": valor})
+            self.assertEqual(response.status_code, 400, valor)
+            self.assertIn("min_rating", response.data)
+        response = APIClient().get(reverse("service-list"), {"min_rating": "5"})
+        self.assertEqual(response.status_code, 200)
+
+        Service.objects.update(rating_avg=None, rating_count=0, rating_sum=0)
+        recompute_ratings()
+        service.refresh_from_db()
+        self.assertEqual((service.rating_count, service.rating_avg), (2, 3.5))
+        self.assertEqual(ServiceCard.objects.get(pk=self.service.pk).rating_avg, 3.5)
+
+
+class ProviderLeaderboardTests(TemporaryMediaMixin, TestCase):
+    def crear_usuario(self, nombre, años):
+        user = crear_usuario(nombre, first_name=nombre.title(), last_name="Prestador")
+        ServiceProviderProfile.objects.create(
+            user=user,
+            identification_type="dni",
+            identification_number="123",
+            phone_number="123",
+            address="Calle 1",
+            city="Córdoba",
+            state="Córdoba",
+            country="Argentina",
+            certification_file=SimpleUploadedFile("cert.pdf", b"x"),
+            certification_description="-",
+            years_of_experience=años,
+            is_verified=True,
+        )
+        return user
+
+    def test_ranks_providers_and_filters_by_category(self):
+        cliente = crear_usuario("cliente", user_type="client")
+        gas = ServiceCategory.objects.create(name="Gas", description="-")
+        luz = ServiceCategory.objects.create(name="Electricidad", description="-")
+        bueno = self.crear_usuario("bueno", 10)
+        malo = self.crear_usuario("malo", 10)
+        (servicio_bueno,) = crear_servicios(1, bueno, gas)
+        (servicio_malo,) = crear_servicios(1, malo, luz)
+        for service, estados, rating in (
+            (servicio_bueno, ["completed", "completed", "completed"], 5),
+            (servicio_malo, ["completed", "cancelled", "cancelled"], 2),
+        ):
+            for estado in estados:
+                ServiceContract.objects.create(
+                    service=service,
+                    client=cliente,
+                    provider=service.provider,
+                    status=estado,
+                    start_date=timezone.now(),
+                    description="Trabajo",
+                    location="Centro",
+                    client_rating=rating if estado == "completed" else None,
+                )
+
+        self.assertEqual(compute_provider_reputation(), 2)
+        url = reverse("provider-leaderboard")
+        results = APIClient().get(url).data["results"]
+        self.assertEqual([r["provider"] for r in results], [bueno.pk, malo.pk])
+        self.assertEqual(results[0]["completion_rate"], 1.0)
+        self.assertEqual(results[1]["cancellation_rate"], 0.6667)
+        self.assertEqual(results[1]["rating_avg"], 2.0)
+
+        results = APIClient().get(url, {"category": luz.pk}).data["results"]
+        self.assertEqual([r["provider"] for r in results], [malo.pk])
+        self.assertEqual(APIClient().get(url, {"category": "x"}).status_code, 400)
+
+
+def imagen_png(ancho, alto):
+    contenido = io.BytesIO()
+    Image.new("RGBA", (ancho, alto), (200, 40, 40, 128)).save(contenido, "PNG")
+    return SimpleUploadedFile(
+        "foto.png", contenido.getvalue(), content_type="image/png"
+    )
+
+
+@override_settings(
+    IMAGE_RENDITION_SIZES={"thumb": 40, "card": 120},
+    IMAGE_RENDITION_WORKERS=0,
+)
+class ImageRenditionTests(TemporaryMediaMixin, TestCase):
+    def test_upload_generates_renditions_after_commit(self):
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Pintura", description="-")
+        (service,) = crear_servicios(1, provider, category)
+        service.images.all().delete()
+        client = APIClient()
+        client.force_authenticate(provider)
+
+        url = reverse("service-image-upload", args=[service.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(url, {"image": imagen_png(600, 300)})
+        self.assertEqual(response.status_code, 201)
+        # La respuesta sale antes de que existan las versiones
+        self.assertEqual(response.data["renditions"], {})
+
+        image = ServiceImage.objects.get()
+        self.assertEqual(set(image.renditions), {"thumb", "card"})
+        for size, lado in (("thumb", 40), ("card", 120)):
+            for extension, formato in (("jpg", "JPEG"), ("webp", "WEBP")):
+                with Image.open(
+                    image.image.storage.path(image.renditions[size][extension])
+                ) as reducida:
+                    self.assertEqual(reducida.format, formato)
+                    self.assertEqual(reducida.size, (lado, lado // 2))
+
+        card = ServiceCard.objects.get()
+        self.assertEqual(
+            card.primary_image_renditions["thumb"]["webp"],
+            image.image.storage.url(image.renditions["thumb"]["webp"]),
+        )
+        listado = APIClient().get(reverse("service-list")).data["results"]
+        self.assertEqual(
+            listado[0]["primary_image_renditions"], card.primary_image_renditions
+        )
+
+        # Guardar sin cambiar el archivo no vuelve a encolar el trabajo
+        with self.captureOnCommitCallbacks() as callbacks:
+            image.is_primary = False
+            image.save()
+        self.assertNotIn(
+            "generate_image_renditions",
+            [callback.__qualname__.split(".")[0] for callback in callbacks],
+        )
+
+    def test_worker_runs_in_spawned_process(self):
+        origen = os.path.join(self.media_root, "original.png")
+        os.makedirs(os.path.dirname(origen), exist_ok=True)
+        with open(origen, "wb") as archivo:
+            archivo.write(imagen_png(300, 600).read())
+        destino = os.path.join(
+            self.media_root, "renditions-test", "original-thumb.webp"
+        )
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            pool.submit(render_image, origen, [(destino, 50, "webp")], 80).result()
+        with Image.open(destino) as reducida:
+            self.assertEqual(reducida.size, (25, 50))
+
+
+@override_settings(
+    IMAGE_RENDITION_SIZES={"thumb": 40, "card": 120},
+    IMAGE_RENDITION_WORKERS=0,
+)
+class ImageMetadataTests(TemporaryMediaMixin, TestCase):
+    def test_metadata_is_computed_with_the_renditions(self):
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Pintura", description="-")
+        (service,) = crear_servicios(1, provider, category)
+        service.images.all().delete()
+        client = APIClient()
+        client.force_authenticate(provider)
+
+        url = reverse("service-image-upload", args=[service.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(url, {"image": imagen_png(600, 300)})
+        self.assertIsNone(response.data["metadata"])
+
+        image = ServiceImage.objects.get()
+        metadata = {
+            "width": 600,
+            "height": 300,
+            "file_size": image.image.size,
+            "dominant_color": image.dominant_color,
+            "placeholder": image.placeholder,
+        }
+        self.assertEqual(image_metadata(image), metadata)
+        # Rojo semitransparente sobre fondo blanco
+        self.assertEqual(image.dominant_color, "#e39393")
+        self.assertEqual(len(image.placeholder), 28)
+
+        self.assertEqual(ServiceCard.objects.get().primary_image_metadata, metadata)
+        for rapido in (False, True):
+            with self.settings(FAST_LIST_SERIALIZATION=rapido):
+                listado = APIClient().get(reverse("service-list")).json()["results"]
+            self.assertEqual(listado[0]["primary_image_metadata"], metadata)
+
+    def test_dimensions_follow_exif_orientation(self):
+        origen = os.path.join(self.media_root, "rotada.jpg")
+        os.makedirs(os.path.dirname(origen), exist_ok=True)
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = 6
+        Image.new("RGB", (300, 100), (10, 120, 200)).save(origen, exif=exif)
+        destino = os.path.join(self.media_root, "renditions-test", "rotada-thumb.jpg")
+
+        metadata = render_image(origen, [(destino, 60, "jpg")], 80)
+        self.assertEqual((metadata["width"], metadata["height"]), (100, 300))
+        self.assertEqual(metadata["file_size"], os.path.getsize(origen))
+        with Image.open(destino) as reducida:
+            self.assertEqual(reducida.size, (20, 60))
+
+
+class ContentAddressedStorageTests(TemporaryMediaMixin, TestCase):
+    def test_same_content_is_stored_once_and_collected_when_unused(self):
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Jardinería", description="-")
+        (service,) = crear_servicios(1, provider, category)
+        service.images.all().delete()
+
+        contenido = b"misma foto " + os.urandom(16)
+        primera, segunda = (
+            ServiceImage.objects.create(
+                service=service,
+                image=SimpleUploadedFile("foto.jpg", contenido),
+            )
+            for _ in range(2)
+        )
+        self.assertEqual(primera.image.name, segunda.image.name)
+        self.assertTrue(primera.image.name.startswith("service_images/"))
+        blob = MediaBlob.objects.get(name=primera.image.name)
+        self.assertEqual((blob.references, blob.size), (2, len(contenido)))
+
+        # Reemplazar el archivo suelta la referencia al anterior
+        segunda.image = SimpleUploadedFile("otra.jpg", b"otra foto")
+        segunda.save()
+        blob.refresh_from_db()
+        self.assertEqual(blob.references, 1)
+
+        primera.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.references, 0)
+        # Recién guardado: la espera mínima lo protege
+        self.assertEqual(collect_orphans(), (0, 0))
+
+        # También queda sin uso la foto de crear_servicios (b"x", un solo archivo)
+        MediaBlob.objects.update(references=5)
+        self.assertEqual(recount_references(), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(
+                collect_orphans(grace=timedelta(0)), (2, len(contenido) + 1)
+            )
+        self.assertFalse(content_storage.exists(blob.name))
+        self.assertEqual(
+            list(MediaBlob.objects.values_list("name", "references")),
+            [(segunda.image.name, 1)],
+        )
+
+    def test_files_left_by_rolled_back_uploads_are_collected(self):
+        contenido = b"foto descartada " + os.urandom(16)
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                name = content_storage.save(
+                    "service_images/foto.jpg", ContentFile(contenido)
+                )
+                raise ValueError("rollback")
+        self.assertTrue(content_storage.exists(name))
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+
+        # Temporal de una escritura interrumpida
+        incoming = content_storage.path(os.path.join(INCOMING_DIR, "tmp-cortado"))
+        os.makedirs(os.path.dirname(incoming), exist_ok=True)
+        with open(incoming, "wb") as archivo:
+            archivo.write(b"mitad")
+
+        # Recién escritos: la espera mínima los protege
+        self.assertEqual(collect_orphans(), (0, 0))
+        self.assertEqual(
+            collect_orphans(grace=timedelta(0), dry_run=True), (2, len(contenido) + 5)
+        )
+        self.assertTrue(content_storage.exists(name))
+        self.assertEqual(collect_orphans(grace=timedelta(0)), (2, len(contenido) + 5))
+        self.assertFalse(content_storage.exists(name))
+        self.assertFalse(os.path.exists(incoming))
+
+
+class ChunkedUploadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        self.provider = crear_usuario()
+        self.client = APIClient()
+        self.client.force_authenticate(self.provider)
+
+    def subir(self, contenido, purpose, content_type, partes):
+        response = self.client.post(
+            reverse("upload-session-create"),
+            {
+                "purpose": purpose,
+                "filename": "archivo." + content_type.split("/")[1],
+                "content_type": content_type,
+                "size": len(contenido),
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        url = reverse("upload-session", args=[response.data["id"]])
+        inicio = 0
+        for fin in partes:
+            response = self.client.put(
+                url,
+                contenido[inicio:fin],
+                content_type="application/octet-stream",
+                HTTP_CONTENT_RANGE=f"bytes {inicio}-{fin - 1}/{len(contenido)}",
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["offset"], fin)
+            inicio = fin
+        return url, response.data["id"]
+
+    def test_image_is_uploaded_in_ranges_and_attached(self):
+        category = ServiceCategory.objects.create(name="Fotografía", description="-")
+        (service,) = crear_servicios(1, self.provider, category)
+        service.images.all().delete()
+        contenido = imagen_png(64, 64).read()
+        mitad = len(contenido) // 2
+
+        url, upload_id = self.subir(contenido, "service_image", "image/png", [mitad])
+        # Un rango que no continúa lo recibido se rechaza con el offset actual
+        response = self.client.put(
+            url,
+            contenido[mitad + 1 :],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {mitad + 1}-{len(contenido) - 1}/{len(contenido)}",
+        )
+        self.assertEqual((response.status_code, response.data["offset"]), (409, mitad))
+
+        # Sin completar no se puede usar
+        upload_url = reverse("service-image-upload", args=[service.pk])
+        response = self.client.post(upload_url, {"upload": upload_id}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        self.client.put(
+            url,
+            contenido[mitad:],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {mitad}-{len(contenido) - 1}/{len(contenido)}",
+        )
+        self.assertEqual(self.client.get(url).data["offset"], len(contenido))
+        response = self.client.post(upload_url, {"upload": upload_id}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+        image = ServiceImage.objects.get()
+        self.assertTrue(image.is_primary)
+        with image.image.open("rb") as archivo:
+            self.assertEqual(archivo.read(), contenido)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(self.client.get(url).status_code, 404)
+        # Una subida se usa una sola vez
+        response = self.client.post(upload_url, {"upload": upload_id}, format="json")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(ServiceImage.objects.count(), 1)
+
+    def test_concurrent_ranges_and_bad_headers_are_rejected(self):
+        contenido = b"0123456789"
+        url, upload_id = self.subir(contenido, "certification", "application/pdf", [])
+        rango = {"HTTP_CONTENT_RANGE": f"bytes 0-9/{len(contenido)}"}
+
+        response = self.client.put(
+            url,
+            contenido,
+            content_type="application/octet-stream",
+            CONTENT_LENGTH="diez",
+            **rango,
+        )
+        self.assertEqual(response.status_code, 400)
+
+        # Otro PUT de la misma subida tiene el archivo bloqueado
+        session = UploadSession.objects.get(pk=upload_id)
+        with open(uploads.part_path(session), "r+b") as part:
+            self.assertTrue(locks.lock(part, locks.LOCK_EX | locks.LOCK_NB))
+            response = self.client.put(
+                url, contenido, content_type="application/octet-stream", **rango
+            )
+            self.assertEqual((response.status_code, response.data["offset"]), (409, 0))
+            locks.unlock(part)
+
+        response = self.client.put(
+            url, contenido, content_type="application/octet-stream", **rango
+        )
+        self.assertEqual((response.status_code, response.data["offset"]), (200, 10))
+
+    def test_assembled_file_goes_through_existing_validators(self):
+        _, upload_id = self.subir(
+            b"no es una imagen", "service_image", "image/png", [16]
+        )
+        category = ServiceCategory.objects.create(name="Fotografía", description="-")
+        (service,) = crear_servicios(1, self.provider, category)
+        response = self.client.post(
+            reverse("service-image-upload", args=[service.pk]),
+            {"upload": upload_id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("image", response.data)
+        # La subida se conserva para poder reintentar
+        self.assertTrue(UploadSession.objects.filter(pk=upload_id).exists())
+
+    def test_certification_upload_creates_profile(self):
+        contenido = b"%PDF-1.4 certificado"
+        _, upload_id = self.subir(
+            contenido, "certification", "application/pdf", [8, 20]
+        )
+        response = self.client.post(
+            reverse("provider-profile"),
+            {
+                "identification_type": "dni",
+                "identification_number": "30111222",
+                "phone_number": "351 555-1234",
+                "address": "Calle 1",
+                "city": "Córdoba",
+                "state": "Córdoba",
+                "country": "Argentina",
+                "certification_description": "Matrícula",
+                "years_of_experience": 5,
+                "upload": upload_id,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        profile = ServiceProviderProfile.objects.get(user=self.provider)
+        with profile.certification_file.open("rb") as archivo:
+            self.assertEqual(archivo.read(), contenido)
+
+        response = self.client.post(
+            reverse("upload-session-create"),
+            {
+                "purpose": "certification",
+                "filename": "grande.pdf",
+                "content_type": "application/pdf",
+                "size": 6 * 1024 * 1024,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(
+    IMAGE_RENDITION_SIZES={"thumb": 40},
+    IMAGE_RENDITION_WORKERS=0,
+)
+class ServiceImageBatchUploadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        self.provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Mudanzas", description="-")
+        (self.service,) = crear_servicios(1, self.provider, category)
+        self.service.images.all().delete()
+        self.client = APIClient()
+        self.client.force_authenticate(self.provider)
+        self.url = reverse("service-image-batch-upload", args=[self.service.pk])
+
+    def test_uploads_all_images_in_one_insert(self):
+        fotos = [imagen_png(80 + i, 60) for i in range(3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {"images": fotos})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 3)
+        inserts = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith('INSERT INTO "servic_serviceimage"')
+        ]
+        self.assertEqual(len(inserts), 1)
+
+        images = list(self.service.images.order_by("pk"))
+        self.assertEqual([image.is_primary for image in images], [True, False, False])
+        self.assertTrue(all(image.renditions for image in images))
+        self.assertEqual(ServiceCard.objects.get().primary_image, images[0].image.url)
+        self.assertEqual(MediaBlob.objects.get(name=images[1].image.name).references, 1)
+
+        # Un segundo lote no cambia la imagen principal
+        response = self.client.post(self.url, {"images": [imagen_png(10, 10)]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.service.images.filter(is_primary=True).count(), 1)
+
+    def test_one_invalid_file_rejects_the_whole_batch(self):
+        invalida = SimpleUploadedFile("b.png", b"x", content_type="image/png")
+        response = self.client.post(
+            self.url, {"images": [imagen_png(10, 10), invalida]}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.service.images.exists())
+
+        otro = crear_usuario("otro")
+        self.client.force_authenticate(otro)
+        response = self.client.post(self.url, {"images": [imagen_png(10, 10)]})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(MEDIA_SENDFILE_BACKEND=None)
+class MediaViewTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        self.dueño = crear_usuario("dueno")
+        self.profile = ServiceProviderProfile.objects.create(
+            user=self.dueño,
+            identification_type="dni",
+            identification_number="123",
+            phone_number="123",
+            address="Calle 1",
+            city="Córdoba",
+            state="Córdoba",
+            country="Argentina",
+            certification_file=SimpleUploadedFile("cert.pdf", b"%PDF certificado"),
+            certification_description="-",
+            years_of_experience=3,
+        )
+        self.nombre = content_storage.save(
+            "service_images/foto.jpg", ContentFile(b"0123456789")
+        )
+
+    def get(self, path, client=None, **headers):
+        return (client or APIClient()).get(reverse("media", args=[path]), **headers)
+
+    def test_ranges_and_conditional_requests(self):
+        response = self.get(self.nombre)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        etag = response["ETag"]
+
+        response = self.get(self.nombre, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        response = self.get(self.nombre, HTTP_RANGE="bytes=-3")
+        self.assertEqual(b"".join(response.streaming_content), b"789")
+        # Con If-Range de otra versión se envía el archivo completo
+        response = self.get(self.nombre, HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"x"')
+        self.assertEqual(response.status_code, 200)
+        response = self.get(self.nombre, HTTP_RANGE="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+        self.assertEqual(
+            self.get(self.nombre, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+        self.assertEqual(self.get(f"{self.nombre}/../../x").status_code, 404)
+        self.assertEqual(self.get(".uploads/algo.part").status_code, 404)
+
+    def test_image_only_accept_header_is_served(self):
+        # Lo que envía un navegador para <img>: sin */*
+        accept = {"HTTP_ACCEPT": "image/avif,image/webp,image/*"}
+        response = self.get(self.nombre, **accept)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        response = self.get("service_images/no-existe.jpg", **accept)
+        self.assertEqual(response.status_code, 404)
+        path = self.profile.certification_file.name
+        self.assertEqual(self.get(path, **accept).status_code, 401)
+
+    def test_certifications_are_private(self):
+        path = self.profile.certification_file.name
+        self.assertTrue(path.startswith("certifications/"))
+        self.assertEqual(self.get(path).status_code, 401)
+
+        client = APIClient()
+        client.force_authenticate(crear_usuario("otro"))
+        self.assertEqual(self.get(path, client).status_code, 403)
+        client.force_authenticate(self.dueño)
+        self.assertEqual(self.get(path, client).status_code, 200)
+        client.force_authenticate(
+            User.objects.create_user(
+                username="admin",
+                email="admin@example.com",
+                password="clave-segura-123",
+                is_staff=True,
+            )
+        )
+        response = self.get(path, client)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    @override_settings(MEDIA_SENDFILE_BACKEND="x-accel-redirect")
+    def test_sending_is_offloaded_to_the_proxy(self):
+        response = self.get(self.nombre, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.nombre}"
+        )
+        self.assertEqual(response.content, b"")
+
+
+@override_settings(IMAGE_RENDITION_WORKERS=0)
+class PrimaryImageTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        self.provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Pintura", description="-")
+        self.service, self.otro = crear_servicios(2, self.provider, category)
+        self.primera = self.service.images.get(is_primary=True)
+        self.nueva = ServiceImage.objects.create(
+            service=self.service,
+            image=SimpleUploadedFile("otra.jpg", b"y", content_type="image/jpeg"),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.provider)
+
+    def primary(self, service):
+        return service.images.get(is_primary=True)
+
+    def test_set_primary_moves_the_flag(self):
+        url = reverse("service-image-set-primary", args=[self.nueva.pk])
+        with self.assertNumQueries(9):
+            response = self.client.patch(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["is_primary"])
+        self.assertEqual(self.primary(self.service), self.nueva)
+        self.assertEqual(
+            ServiceCard.objects.get(pk=self.service.pk).primary_image,
+            self.nueva.image.url,
+        )
+
+        self.nueva.delete()
+        self.assertEqual(self.client.patch(url).status_code, 404)
+
+    def test_deleting_the_primary_promotes_the_newest_of_the_same_service(self):
+        otra_principal = self.primary(self.otro)
+        response = self.client.delete(
+            reverse("service-image-delete", args=[self.primera.pk])
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.primary(self.service), self.nueva)
+        self.assertEqual(self.primary(self.otro), otra_principal)
+        self.assertEqual(
+            ServiceCard.objects.get(pk=self.service.pk).primary_image,
+            self.nueva.image.url,
+        )
+
+        # Borrar una que no es la principal no cambia nada
+        for image in self.service.images.filter(is_primary=False):
+            self.client.delete(reverse("service-image-delete", args=[image.pk]))
+        self.assertEqual(self.primary(self.service), self.nueva)
+
+    def test_only_one_primary_per_service(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ServiceImage.objects.create(
+                service=self.service, image=self.primera.image, is_primary=True
+            )
+
+        # Una subida marcada como principal reemplaza a la anterior
+        response = self.client.post(
+            reverse("service-image-upload", args=[self.service.pk]),
+            {"image": imagen_png(20, 20), "is_primary": True},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data["is_primary"])
+        self.assertEqual(self.primary(self.service).pk, response.data["id"])
+
+
+@override_settings(IMAGE_RENDITION_WORKERS=0)
+@skipUnlessDBFeature("has_select_for_update")
+class PrimaryImageConcurrencyTests(TemporaryMediaMixin, TransactionTestCase):
+    """
+    Varios hilos, cada uno con su conexión, marcan y borran imágenes del mismo
+    servicio a la vez. Requiere una base con bloqueo de filas (PostgreSQL).
+    """
+
+    HILOS = 8
+    OPERACIONES = 6
+
+    def test_concurrent_set_primary_and_delete_keep_one_primary(self):
+        provider = crear_usuario()
+        category = ServiceCategory.objects.create(name="Pintura", description="-")
+        # Sin TestCase los on_commit se ejecutan y los archivos de prueba no son
+        # imágenes válidas: sus versiones reducidas fallan
+        with self.assertLogs("servic.renditions", "ERROR"):
+            (service,) = crear_servicios(1, provider, category)
+            for i in range(2 * self.HILOS):
+                ServiceImage.objects.create(
+                    service=service,
+                    image=SimpleUploadedFile(
+                        f"{i}.jpg", b"x", content_type="image/jpeg"
+                    ),
+                )
+        ids = list(service.images.values_list("pk", flat=True))
+
+        barrera = threading.Barrier(self.HILOS)
+        estados, errores = [], []
+
+        def trabajar(numero):
+            client = APIClient()
+            client.force_authenticate(provider)
+            azar = random.Random(numero)
+            try:
+                barrera.wait()
+                for _ in range(self.OPERACIONES):
+                    image_id = azar.choice(ids)
+                    if azar.random() < 0.3:
+                        url = reverse("service-image-delete", args=[image_id])
+                        estados.append(client.delete(url).status_code)
+                    else:
+                        url = reverse("service-image-set-primary", args=[image_id])
+                        estados.append(client.patch(url).status_code)
+            except Exception as exc:
+                errores.append(exc)
+            finally:
+                connections.close_all()
+
+        hilos = [
+            threading.Thread(target=trabajar, args=(numero,))
+            for numero in range(self.HILOS)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        self.assertLessEqual(set(estados), {200, 204, 404})
+        self.assertEqual(service.images.filter(is_primary=True).count(), 1)
+        self.assertEqual(
+            ServiceCard.objects.get(pk=service.pk).primary_image,
+            service.images.get(is_primary=True).image.url,
+        )
@@ -0,0 +1,167 @@
+import os
+import re
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import locks
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.utils import timezone
+
+from .models import UploadSession
+
+# Carpeta (dentro de MEDIA_ROOT) con los archivos de las subidas en curso
+UPLOADS_DIR = ".uploads"
+
+# Bytes leídos del cuerpo de la petición por iteración: la memoria usada por
+# un PUT no depende del tamaño del rango
+CHUNK_SIZE = 64 * 1024
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class OffsetMismatch(Exception):
+    """El rango enviado no empieza donde terminó lo ya recibido"""
+
+    def __init__(self, offset):
+        super().__init__(offset)
+        self.offset = offset
+
+
+class UploadInProgress(Exception):
+    """Otro PUT de la misma subida todavía se está recibiendo"""
+
+    def __init__(self, offset):
+        super().__init__(offset)
+        self.offset = offset
+
+
+def parse_content_range(header):
+    """`bytes inicio-fin/total` → (inicio, fin inclusive, total), o None"""
+    match = CONTENT_RANGE_RE.match(header or "")
+    if match is None:
+        return None
+    start, end, total = (int(group) for group in match.groups())
+    if end < start:
+        return None
+    return start, end, total
+
+
+def part_path(session):
+    return os.path.join(settings.MEDIA_ROOT, UPLOADS_DIR, f"{session.pk}.part")
+
+
+def create_part(session):
+    path = part_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+
+
+def expiration():
+    return timezone.now() + timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRATION_HOURS)
+
+
+def write_range(session_id, start, stream, length):
+    """
+    Copiar `length` bytes de `stream` al archivo de la subida a partir de
+    `start`, en bloques de CHUNK_SIZE.
+
+    El cliente puede enviar despacio, así que no se abre una transacción ni se
+    bloquea la fila mientras tanto: el rango se reserva con un bloqueo
+    exclusivo sobre el archivo de la subida (el segundo PUT simultáneo recibe
+    UploadInProgress) y el nuevo offset se guarda con un UPDATE condicional.
+    Lanza UploadSession.DoesNotExist si la subida se borró mientras tanto.
+
+    Si el cliente se desconecta a mitad del rango se guarda lo recibido hasta
+    ahí: el siguiente PUT continúa desde `offset`.
+    """
+    session = UploadSession.objects.get(pk=session_id)
+    with open(part_path(session), "r+b") as part:
+        if not locks.lock(part, locks.LOCK_EX | locks.LOCK_NB):
+            raise UploadInProgress(session.offset)
+        # Releer con el archivo bloqueado: el PUT anterior pudo haber terminado
+        session.refresh_from_db(fields=["offset"])
+        if start != session.offset:
+            raise OffsetMismatch(session.offset)
+
+        received = 0
+        part.seek(start)
+        # Descartar lo que haya quedado de un PUT interrumpido
+        part.truncate()
+        while received < length:
+            try:
+                chunk = stream.read(min(CHUNK_SIZE, length - received))
+            except OSError:
+                break
+            if not chunk:
+                break
+            part.write(chunk)
+            received += len(chunk)
+        part.flush()
+
+        session.offset = start + received
+        session.expires_at = expiration()
+        updated = UploadSession.objects.filter(pk=session_id, offset=start).update(
+            offset=session.offset, expires_at=session.expires_at
+        )
+        if not updated:
+            raise UploadSession.DoesNotExist
+    return session
+
+
+class AssembledUpload(UploadedFile):
+    """
+    Archivo de una subida completa. Como TemporaryUploadedFile, expone su ruta
+    para que la validación de imágenes lo abra desde disco sin copiarlo a memoria.
+    """
+
+    def __init__(self, session):
+        self._path = part_path(session)
+        super().__init__(
+            open(self._path, "rb"),
+            name=session.filename,
+            content_type=session.content_type,
+            size=session.size,
+        )
+
+    def temporary_file_path(self):
+        return self._path
+
+
+@contextmanager
+def completed_upload(session):
+    """El archivo armado, para pasarlo a los serializadores en lugar del multipart"""
+    with AssembledUpload(session) as file:
+        yield file
+
+
+def claim(session_id, **filters):
+    """
+    La subida `session_id` bloqueada hasta el fin de la transacción, para
+    usarla una sola vez: otra petición con el mismo id espera y, cuando esta
+    la borra con discard(), recibe UploadSession.DoesNotExist.
+    """
+    return UploadSession.objects.select_for_update().get(pk=session_id, **filters)
+
+
+def discard(session):
+    """Borrar la subida y su archivo (después de confirmar la transacción)"""
+    path = part_path(session)
+    session.delete()
+    transaction.on_commit(lambda: _remove(path))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def purge_expired():
+    """Borrar las subidas abandonadas; devuelve cuántas se borraron"""
+    expired = list(UploadSession.objects.filter(expires_at__lt=timezone.now()))
+    for session in expired:
+        discard(session)
+    return len(expired)
@@ -7,4 +7,5 @@ urlpatterns = [
     path("", include("servic.urls.service_urls")),
     path("", include("servic.urls.admin_urls")),
     path("", include("servic.urls.contract_urls")),
+    path("", include("servic.urls.upload_urls")),
 ]
@@ -4,6 +4,7 @@ from ..views import (
     ProviderRequestView,
     ProviderRequestListView,
     ProviderRequestDetailView,
+    ProviderLeaderboardView,
 )
 
 urlpatterns = [
@@ -27,4 +28,9 @@ urlpatterns = [
         ProviderRequestDetailView.as_view(),
         name="review-provider-request",
     ),
+    path(
+        "provider/leaderboard/",
+        ProviderLeaderboardView.as_view(),
+        name="provider-leaderboard",
+    ),
 ]
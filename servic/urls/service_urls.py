@@ -4,8 +4,11 @@ from ..views import (
     ServiceCategoryDetailView,
     ServiceCreateView,
     ServiceListView,
+    ServiceFacetsView,
+    ServiceAutocompleteView,
     ServiceDetailView,
     ServiceImageUploadView,
+    ServiceImageBatchUploadView,
     ServiceImageDeleteView,
     ServiceImageSetPrimaryView,
 )
@@ -24,6 +27,14 @@ urlpatterns = [
     path(
         "services/", ServiceListView.as_view(), name="service-list"
     ),  # listar todos los servicios
+    path(
+        "services/facets/", ServiceFacetsView.as_view(), name="service-facets"
+    ),  # conteos por categoría, ciudad, provincia y precio para los filtros actuales
+    path(
+        "services/autocomplete/",
+        ServiceAutocompleteView.as_view(),
+        name="service-autocomplete",
+    ),  # sugerencias de títulos y categorías mientras se escribe
     path(
         "services/create/", ServiceCreateView.as_view(), name="service-create"
     ),  # crear un servicio
@@ -36,6 +47,11 @@ urlpatterns = [
         ServiceImageUploadView.as_view(),
         name="service-image-upload",
     ),  # subir imagenes a un servicio
+    path(
+        "services/<int:service_id>/images/batch/",
+        ServiceImageBatchUploadView.as_view(),
+        name="service-image-batch-upload",
+    ),  # subir varias imagenes en una sola peticion
     path(
         "services/images/<int:pk>/",
         ServiceImageDeleteView.as_view(),
@@ -0,0 +1,15 @@
+from django.urls import path
+from ..views import UploadSessionCreateView, UploadSessionView
+
+urlpatterns = [
+    path(
+        "uploads/",
+        UploadSessionCreateView.as_view(),
+        name="upload-session-create",
+    ),  # iniciar una subida por partes
+    path(
+        "uploads/<uuid:pk>/",
+        UploadSessionView.as_view(),
+        name="upload-session",
+    ),  # consultar, enviar un rango (PUT) o cancelar una subida
+]
@@ -11,14 +11,18 @@ from .provider_views import (
     ProviderRequestView,
     ProviderRequestListView,
     ProviderRequestDetailView,
+    ProviderLeaderboardView,
 )
 from .service_views import (
     ServiceCategoryListView,
     ServiceCategoryDetailView,
     ServiceCreateView,
     ServiceListView,
+    ServiceFacetsView,
+    ServiceAutocompleteView,
     ServiceDetailView,
     ServiceImageUploadView,
+    ServiceImageBatchUploadView,
     ServiceImageDeleteView,
     ServiceImageSetPrimaryView,
 )
@@ -30,6 +34,7 @@ from .admin_views import (
     AdminServiceListView,
     AdminServiceApprovalView,
 )
+from .upload_views import UploadSessionCreateView, UploadSessionView
 
 __all__ = [
     "RegisterView",
@@ -44,12 +49,16 @@ __all__ = [
     "ProviderRequestView",
     "ProviderRequestListView",
     "ProviderRequestDetailView",
+    "ProviderLeaderboardView",
     "ServiceCategoryListView",
     "ServiceCategoryDetailView",
     "ServiceCreateView",
     "ServiceListView",
+    "ServiceFacetsView",
+    "ServiceAutocompleteView",
     "ServiceDetailView",
     "ServiceImageUploadView",
+    "ServiceImageBatchUploadView",
     "ServiceImageDeleteView",
     "ServiceImageSetPrimaryView",
     # Nuevas vistas admin
@@ -58,4 +67,6 @@ __all__ = [
     "AdminProviderVerificationView",
     "AdminServiceListView",
     "AdminServiceApprovalView",
+    "UploadSessionCreateView",
+    "UploadSessionView",
 ]
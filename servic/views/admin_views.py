@@ -5,6 +5,8 @@ from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from ..models import ServiceProviderProfile, Service, ProviderRequest
+from ..cache import stats as catalog_cache_stats
+from ..middleware.compression_middleware import stats as compression_stats
 from ..serializers import (
     ServiceProviderProfileSerializer,
     ServiceSerializer,
@@ -31,6 +33,8 @@ class AdminDashboardView(APIView):
             ).count(),
             "pending_services": Service.objects.filter(status="pending").count(),
             "active_services": Service.objects.filter(status="active").count(),
+            "catalog_cache": catalog_cache_stats.as_dict(),
+            "compression": compression_stats.as_dict(),
         }
         return Response(stats)
 
@@ -42,7 +46,7 @@ class AdminProviderListView(generics.ListAPIView):
     serializer_class = ServiceProviderProfileSerializer
 
     def get_queryset(self):
-        queryset = ServiceProviderProfile.objects.all()
+        queryset = ServiceProviderProfile.objects.select_related("user")
 
         # Filtros opcionales
         is_verified = self.request.query_params.get("is_verified")
@@ -52,10 +56,10 @@ class AdminProviderListView(generics.ListAPIView):
         return queryset.order_by("-created_at")
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        page = self.paginate_queryset(self.get_queryset())
 
         providers_data = []
-        for profile in queryset:
+        for profile in page:
             data = self.get_serializer(profile).data
             data["user_info"] = {
                 "id": profile.user.id,
@@ -65,7 +69,7 @@ class AdminProviderListView(generics.ListAPIView):
             }
             providers_data.append(data)
 
-        return Response(providers_data)
+        return self.get_paginated_response(providers_data)
 
 
 class AdminProviderVerificationView(APIView):
@@ -157,7 +161,9 @@ class AdminServiceListView(generics.ListAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
-        return queryset.order_by("-created_at")
+        return ServiceListSerializer.setup_eager_loading(queryset).order_by(
+            "-created_at"
+        )
 
 
 class AdminServiceApprovalView(APIView):
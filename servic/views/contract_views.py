@@ -13,6 +13,8 @@ from ..serializers.contract_serializers import (
     ServiceContractReviewSerializer,
     ServiceContractRejectSerializer,
 )
+from ..serializers.values import ServiceContractValuesSerializer
+from .mixins import SparseFieldsetViewMixin, ValuesListMixin
 
 
 class ServiceContractCreateView(generics.CreateAPIView):
@@ -34,8 +36,11 @@ class ServiceContractCreateView(generics.CreateAPIView):
         serializer.save(client=self.request.user)
 
 
-class ServiceContractListView(generics.ListAPIView):
+class ServiceContractListView(
+    SparseFieldsetViewMixin, ValuesListMixin, generics.ListAPIView
+):
     serializer_class = ServiceContractSerializer
+    values_serializer_class = ServiceContractValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -43,7 +48,9 @@ class ServiceContractListView(generics.ListAPIView):
         return ServiceContract.objects.filter(Q(client=user) | Q(provider=user))
 
 
-class ServiceContractDetailView(generics.RetrieveUpdateAPIView):
+class ServiceContractDetailView(
+    SparseFieldsetViewMixin, generics.RetrieveUpdateAPIView
+):
     serializer_class = ServiceContractSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -0,0 +1,43 @@
+from rest_framework import permissions
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from .. import media
+
+
+class IgnoreAcceptNegotiation(BaseContentNegotiation):
+    """
+    Elegir siempre el primer renderer sin mirar Accept. El archivo no pasa
+    por los renderers; solo los errores (401, 403, 404) se devuelven en JSON.
+    Un navegador que pide una imagen envía `Accept: image/webp,image/*`, y
+    con la negociación normal recibiría 406 en lugar del archivo.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class MediaView(APIView):
+    """
+    Sirve los archivos de MEDIA_ROOT. Los de `certifications/` solo los ven
+    los administradores y el prestador dueño; el resto es público. Ver
+    servic/media.py para Range, respuestas condicionales y X-Accel-Redirect.
+    """
+
+    # También la sesión del panel de administración (enlaces a certificados)
+    authentication_classes = [JWTAuthentication, SessionAuthentication]
+    permission_classes = [permissions.AllowAny]
+    content_negotiation_class = IgnoreAcceptNegotiation
+
+    def get(self, request, path):
+        full_path = media.resolve(path)
+        if not media.can_read(request.user, path):
+            if not request.user.is_authenticated:
+                raise NotAuthenticated()
+            raise PermissionDenied("No tiene permiso para ver este archivo")
+        return media.serve(request, path, full_path)
@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import Http404
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .. import uploads
+from ..models import UploadSession
+
+
+class SparseFieldsetViewMixin:
+    """
+    Aplica `prune_queryset` del serializador en lecturas para que ?fields= y
+    ?omit= también reduzcan columnas y relaciones cargadas.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if self.request.method == "GET" and hasattr(serializer_class, "prune_queryset"):
+            queryset = serializer_class.prune_queryset(queryset, self.request)
+        return queryset
+
+
+class ValuesListMixin:
+    """
+    Listado servido con `values_serializer_class` (filas de .values() y
+    conversores precompilados) cuando settings.FAST_LIST_SERIALIZATION está
+    activo. La respuesta es idéntica a la del serializador DRF de la vista.
+    """
+
+    values_serializer_class = None
+
+    def use_values_serializer(self):
+        return self.values_serializer_class is not None and getattr(
+            settings, "FAST_LIST_SERIALIZATION", False
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_serializer():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.values_serializer_class(request)
+        # El cursor lee de cada fila el primer campo de orden
+        ordering = ()
+        if self.paginator is not None and hasattr(self.paginator, "get_ordering"):
+            ordering = self.paginator.get_ordering(request, queryset, self)
+        rows = serializer.get_queryset(
+            queryset, extra_columns=[field.lstrip("-") for field in ordering]
+        )
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.many(page))
+        return Response(serializer.many(rows))
+
+
+class ChunkedUploadMixin:
+    """
+    Permite enviar `upload` (id de una subida por partes completa) en lugar
+    del archivo en `upload_field`. El archivo armado pasa por el mismo
+    serializador y validadores que una subida multipart; la subida se borra
+    cuando se guardó el objeto, en la misma transacción.
+    """
+
+    upload_field = None
+    upload_purpose = None
+
+    def get_upload_session(self, request):
+        """
+        La subida indicada en `upload`, bloqueada (uploads.claim): llamar
+        dentro de una transacción. Dos peticiones con el mismo id no crean dos
+        objetos: la segunda espera a la primera y recibe 404.
+        """
+        upload_id = request.data.get("upload")
+        if not upload_id:
+            return None
+        try:
+            session = uploads.claim(
+                upload_id, user=request.user, purpose=self.upload_purpose
+            )
+        except UploadSession.DoesNotExist:
+            raise Http404
+        except DjangoValidationError:
+            raise ValidationError({"upload": ["Identificador de subida inválido"]})
+        if not session.is_complete:
+            raise ValidationError(
+                {
+                    "upload": [
+                        f"Subida incompleta: {session.offset}/{session.size} bytes"
+                    ]
+                }
+            )
+        return session
+
+    @contextmanager
+    def upload_request_data(self, request):
+        """
+        (datos, subida): request.data tal cual si no se envió `upload`, o una
+        copia con el archivo armado en `upload_field` (abierto dentro del
+        bloque). Con `upload` el bloque corre en una transacción con la subida
+        bloqueada; la vista llama a uploads.discard(subida) dentro del bloque
+        si guardó el objeto.
+        """
+        if not request.data.get("upload"):
+            yield request.data, None
+            return
+        with transaction.atomic():
+            session = self.get_upload_session(request)
+            data = request.data
+            data = data.dict() if hasattr(data, "dict") else dict(data)
+            data.pop("upload")
+            with uploads.completed_upload(session) as file:
+                data[self.upload_field] = file
+                yield data, session
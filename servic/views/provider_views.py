@@ -3,18 +3,33 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import generics
-from ..models import ServiceProviderProfile, ProviderRequest
+from rest_framework.exceptions import ValidationError
+from django.db.models import Exists, OuterRef
+from ..models import (
+    ServiceProviderProfile,
+    ProviderRequest,
+    ProviderReputation,
+    Service,
+)
 from ..serializers import (
     ServiceProviderProfileSerializer,
     ProviderRequestSerializer,
     ProviderRequestCreateSerializer,
     ProviderRequestReviewSerializer,
+    ProviderReputationSerializer,
 )
+from ..pagination import ScoreCursorPagination
+from ..parsers import OrjsonParser
+from .. import uploads
+from .mixins import ChunkedUploadMixin
 
 
-class ServiceProviderProfileView(APIView):
+class ServiceProviderProfileView(ChunkedUploadMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
-    parser_classes = (MultiPartParser, FormParser)
+    parser_classes = (MultiPartParser, FormParser, OrjsonParser)
+    # El certificado también puede llegar como {"upload": id} (servic/uploads.py)
+    upload_field = "certification_file"
+    upload_purpose = "certification"
 
     def get(self, request, *args, **kwargs):
         try:
@@ -28,9 +43,6 @@ class ServiceProviderProfileView(APIView):
         return Response(serializer.data)
 
     def post(self, request, *args, **kwargs):
-        # Prints de depuración
-        print("FILES:", request.FILES)
-        print("DATA:", request.data)
         # Solo prestadores pueden crear perfil
         if request.user.user_type != "provider":
             return Response(
@@ -43,22 +55,29 @@ class ServiceProviderProfileView(APIView):
                 {"detail": "Ya existe un perfil de prestador de servicios"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        # Verificar que se haya enviado el archivo
-        if "certification_file" not in request.FILES:
-            return Response(
-                {"certification_file": ["El archivo de certificación es obligatorio"]},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        serializer = ServiceProviderProfileSerializer(data=request.data)
-        if serializer.is_valid():
+        with self.upload_request_data(request) as (data, session):
+            # Verificar que se haya enviado el archivo
+            if "certification_file" not in request.FILES and session is None:
+                return Response(
+                    {
+                        "certification_file": [
+                            "El archivo de certificación es obligatorio"
+                        ]
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            serializer = ServiceProviderProfileSerializer(data=data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             serializer.save(user=request.user)
-            request.user.is_profile_complete = True
-            request.user.save()
-            return Response(
-                {"message": "Perfil creado exitosamente", "data": serializer.data},
-                status=status.HTTP_201_CREATED,
-            )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            if session is not None:
+                uploads.discard(session)
+        request.user.is_profile_complete = True
+        request.user.save()
+        return Response(
+            {"message": "Perfil creado exitosamente", "data": serializer.data},
+            status=status.HTTP_201_CREATED,
+        )
 
     def put(self, request, *args, **kwargs):
         try:
@@ -68,15 +87,18 @@ class ServiceProviderProfileView(APIView):
                 {"detail": "No se encontró un perfil de prestador de servicios"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        serializer = ServiceProviderProfileSerializer(
-            profile, data=request.data, partial=True
-        )
-        if serializer.is_valid():
-            serializer.save()
-            return Response(
-                {"message": "Perfil actualizado exitosamente", "data": serializer.data}
+        with self.upload_request_data(request) as (data, session):
+            serializer = ServiceProviderProfileSerializer(
+                profile, data=data, partial=True
             )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            serializer.save()
+            if session is not None:
+                uploads.discard(session)
+        return Response(
+            {"message": "Perfil actualizado exitosamente", "data": serializer.data}
+        )
 
 
 class ProviderRequestView(generics.CreateAPIView):
@@ -126,3 +148,32 @@ class ProviderRequestDetailView(generics.RetrieveUpdateAPIView):
                 "request": ProviderRequestSerializer(instance).data,
             }
         )
+
+
+class ProviderLeaderboardView(generics.ListAPIView):
+    """
+    Ranking público de prestadores por reputación, leído de la tabla que
+    genera `compute_reputation`. ?category= limita a prestadores con algún
+    servicio activo en esa categoría.
+    """
+
+    serializer_class = ProviderReputationSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = ScoreCursorPagination
+
+    def get_queryset(self):
+        queryset = ProviderReputation.objects.select_related("provider")
+        category = self.request.query_params.get("category")
+        if category:
+            if not category.isdigit():
+                raise ValidationError({"category": "Debe ser un ID de categoría"})
+            queryset = queryset.filter(
+                Exists(
+                    Service.objects.filter(
+                        provider=OuterRef("provider"),
+                        category_id=category,
+                        status="active",
+                    )
+                )
+            )
+        return queryset
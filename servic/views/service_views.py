@@ -1,27 +1,49 @@
 from rest_framework import generics, permissions, status, filters
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from ..models import ServiceCategory, Service, ServiceImage
+from django.db import connection, transaction
+from django.db.models import Case, Count, IntegerField, Value, When
+from ..models import ServiceCategory, Service, ServiceImage, ServiceCard
 from ..serializers import (
     ServiceCategorySerializer,
     ServiceSerializer,
-    ServiceListSerializer,
+    ServiceCardSerializer,
     ServiceImageSerializer,
 )
 from ..permissions import IsProviderAndVerified
-
-
-class ServiceCategoryListView(generics.ListCreateAPIView):
+from ..pagination import NameCursorPagination
+from ..filters import ServiceSearchFilter, ServiceOrderingFilter
+from ..weekdays import MASKS_WITH_BIT, day_bit
+from ..cache import CatalogCacheMixin
+from .. import autocomplete, gallery, geo, uploads
+from ..etags import CategoryETagMixin, ServiceETagMixin
+from ..parsers import OrjsonParser
+from ..serializers.values import ServiceCardValuesSerializer
+from .mixins import ChunkedUploadMixin, SparseFieldsetViewMixin, ValuesListMixin
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 20
+MAX_BATCH_IMAGES = 20
+
+
+class ServiceCategoryListView(CategoryETagMixin, generics.ListCreateAPIView):
     queryset = ServiceCategory.objects.all()
     serializer_class = ServiceCategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter]
     search_fields = ["name", "description"]
+    pagination_class = NameCursorPagination
 
 
-class ServiceCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ServiceCategoryDetailView(
+    CategoryETagMixin, generics.RetrieveUpdateDestroyAPIView
+):
     queryset = ServiceCategory.objects.all()
     serializer_class = ServiceCategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
@@ -33,24 +55,48 @@ class ServiceCreateView(generics.CreateAPIView):
     parser_classes = (MultiPartParser, FormParser)
 
     def perform_create(self, serializer):
-        serializer.save(provider=self.request.user)
+        # Sin coordenadas propias, el servicio toma las del perfil del prestador
+        profile = self.request.user.provider_profile
+        if serializer.validated_data.get("latitude") is None:
+            serializer.save(
+                provider=self.request.user,
+                latitude=profile.latitude,
+                longitude=profile.longitude,
+            )
+        else:
+            serializer.save(provider=self.request.user)
 
 
-class ServiceListView(generics.ListAPIView):
-    serializer_class = ServiceListSerializer
+class ServiceListView(CatalogCacheMixin, ValuesListMixin, generics.ListAPIView):
+    """Catálogo público, leído desde la tabla desnormalizada ServiceCard"""
+
+    serializer_class = ServiceCardSerializer
+    values_serializer_class = ServiceCardValuesSerializer
     permission_classes = [permissions.AllowAny]
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        ServiceSearchFilter,
+        ServiceOrderingFilter,
     ]
     filterset_fields = ["category", "status", "price_type", "city", "state", "country"]
-    search_fields = ["title", "description", "location"]
-    ordering_fields = ["price", "created_at"]
-    ordering = ["-created_at"]
+    ordering_fields = ["price", "created_at", "popularity"]
+    ordering = ["-created_at", "-pk"]
+    cache_params = [
+        *filterset_fields,
+        "search",
+        "ordering",
+        "min_price",
+        "max_price",
+        "min_rating",
+        "available_day",
+        "near",
+        "radius_km",
+        "cursor",
+        "page_size",
+    ]
 
     def get_queryset(self):
-        queryset = Service.objects.filter(status="active")
+        queryset = ServiceCard.objects.filter(status="active")
 
         # Filtrar por rango de precio
         min_price = self.request.query_params.get("min_price")
@@ -60,18 +106,205 @@ class ServiceListView(generics.ListAPIView):
         if max_price:
             queryset = queryset.filter(price__lte=max_price)
 
+        # Filtrar por calificación promedio (los servicios sin calificar quedan fuera)
+        min_rating = self.request.query_params.get("min_rating")
+        if min_rating:
+            try:
+                min_rating = float(min_rating)
+            except ValueError:
+                min_rating = None
+            # La comparación también descarta nan; inf queda fuera del rango
+            if min_rating is None or not 1 <= min_rating <= 5:
+                raise ValidationError({"min_rating": "Debe ser un número entre 1 y 5"})
+            queryset = queryset.filter(rating_avg__gte=min_rating)
+
         # Filtrar por disponibilidad
         available_day = self.request.query_params.get("available_day")
         if available_day:
-            queryset = queryset.filter(available_days__icontains=available_day)
+            bit = day_bit(available_day)
+            if bit is None:
+                return queryset.none()
+            queryset = queryset.filter(available_weekdays__in=MASKS_WITH_BIT[bit])
+
+        # Filtrar por cercanía (?near=lat,lon&radius_km=)
+        near = self.request.query_params.get("near")
+        if near:
+            latitude, longitude, radius_km = self.parse_near(near)
+            queryset = geo.filter_near(queryset, latitude, longitude, radius_km)
 
         return queryset
 
+    def parse_near(self, near):
+        try:
+            latitude, longitude = (float(value) for value in near.split(","))
+            radius_km = float(
+                self.request.query_params.get("radius_km", DEFAULT_RADIUS_KM)
+            )
+        except ValueError:
+            raise ValidationError(
+                {"near": "Use el formato near=latitud,longitud y un radius_km numérico"}
+            )
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({"near": "Coordenadas fuera de rango"})
+        if not 0 < radius_km <= MAX_RADIUS_KM:
+            raise ValidationError(
+                {"radius_km": f"El radio debe estar entre 0 y {MAX_RADIUS_KM} km"}
+            )
+        return latitude, longitude, radius_km
+
+
+class ServiceFacetsView(ServiceListView):
+    """
+    Conteos por categoría, ciudad, provincia, tipo de precio y rango de precio
+    para los mismos filtros que el listado. Cada faceta se agrupa por separado
+    (el número de grupos es el de valores distintos de esa faceta, no el de
+    sus combinaciones): en PostgreSQL con una sola consulta GROUPING SETS, en
+    otras bases con una consulta agrupada por faceta.
+    Comparte la caché del catálogo con ServiceListView.
+    """
+
+    # Límites superiores de los rangos de precio; el último rango queda abierto
+    price_buckets = (50, 100, 250, 500, 1000)
+
+    # Columnas agrupadas por faceta (la primera es el valor)
+    facet_columns = {
+        "category": ("category_id", "category_name"),
+        "city": ("city",),
+        "state": ("state",),
+        "price_type": ("price_type",),
+        "price": ("price_bucket",),
+    }
+
+    def get_price_bucket_expression(self):
+        return Case(
+            *(
+                When(price__lt=limit, then=Value(index))
+                for index, limit in enumerate(self.price_buckets)
+            ),
+            default=Value(len(self.price_buckets)),
+            output_field=IntegerField(),
+        )
+
+    def get_facet_counts(self, queryset):
+        """{faceta: [(valores de facet_columns..., cantidad)]}"""
+        queryset = queryset.order_by().annotate(
+            price_bucket=self.get_price_bucket_expression()
+        )
+        if connection.vendor == "postgresql":
+            return self.get_grouping_sets_counts(queryset)
+        return {
+            name: list(queryset.values_list(*columns).annotate(count=Count("pk")))
+            for name, columns in self.facet_columns.items()
+        }
+
+    def get_grouping_sets_counts(self, queryset):
+        # El ORM no genera GROUPING SETS: se agrupa sobre la consulta filtrada
+        quote = connection.ops.quote_name
+        columns = [c for group in self.facet_columns.values() for c in group]
+        sql, params = queryset.values(*columns).query.sql_with_params()
+        sets = ", ".join(
+            "(%s)" % ", ".join(map(quote, group))
+            for group in self.facet_columns.values()
+        )
+        grouping = ", ".join(
+            f"GROUPING({quote(group[0])})" for group in self.facet_columns.values()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {', '.join(map(quote, columns))}, {grouping}, COUNT(*) "
+                f"FROM ({sql}) AS facets GROUP BY GROUPING SETS ({sets})",
+                params,
+            )
+            rows = cursor.fetchall()
+
+        counts = {name: [] for name in self.facet_columns}
+        facets = len(self.facet_columns)
+        for row in rows:
+            values, flags, count = row[: -facets - 1], row[-facets - 1 : -1], row[-1]
+            # GROUPING(columna) es 0 solo en el conjunto que agrupa esa columna
+            position = 0
+            for (name, group), flag in zip(self.facet_columns.items(), flags):
+                if flag == 0:
+                    counts[name].append(
+                        (*values[position : position + len(group)], count)
+                    )
+                position += len(group)
+        return counts
+
+    def list(self, request, *args, **kwargs):
+        counts = self.get_facet_counts(self.filter_queryset(self.get_queryset()))
+
+        def most_common(name):
+            return sorted(counts[name], key=lambda row: (-row[-1], str(row[0])))
+
+        prices = dict(counts["price"])
+        price_type_labels = dict(Service.PRICE_TYPE_CHOICES)
+        limits = (0, *self.price_buckets, None)
+        return Response(
+            {
+                # Cada servicio cae en exactamente un rango de precio
+                "total": sum(prices.values()),
+                "category": [
+                    {"value": pk, "label": name, "count": count}
+                    for pk, name, count in most_common("category")
+                ],
+                "city": [
+                    {"value": city, "count": count}
+                    for city, count in most_common("city")
+                ],
+                "state": [
+                    {"value": state, "count": count}
+                    for state, count in most_common("state")
+                ],
+                "price_type": [
+                    {
+                        "value": price_type,
+                        "label": price_type_labels.get(price_type, price_type),
+                        "count": count,
+                    }
+                    for price_type, count in most_common("price_type")
+                ],
+                "price": [
+                    {
+                        "min": limits[index],
+                        "max": limits[index + 1],
+                        "count": prices.get(index, 0),
+                    }
+                    for index in range(len(limits) - 1)
+                ],
+            }
+        )
+
+
+class ServiceAutocompleteView(generics.GenericAPIView):
+    """
+    Sugerencias para el buscador mientras se escribe (?q=plom&limit=10), desde
+    el índice de prefijos en memoria: no consulta la base en cada tecla.
+    """
 
-class ServiceDetailView(generics.RetrieveUpdateDestroyAPIView):
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_SUGGESTIONS))
+        except ValueError:
+            raise ValidationError({"limit": "Debe ser un número entero"})
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        query = request.query_params.get("q", "")
+        return Response({"results": autocomplete.index.suggest(query, limit)})
+
+
+class ServiceDetailView(
+    ServiceETagMixin,
+    CatalogCacheMixin,
+    SparseFieldsetViewMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     serializer_class = ServiceSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     parser_classes = (MultiPartParser, FormParser)
+    cache_params = ["fields", "omit"]
 
     def get_queryset(self):
         return Service.objects.all()
@@ -91,23 +324,82 @@ class ServiceDetailView(generics.RetrieveUpdateDestroyAPIView):
         return super().check_object_permissions(request, obj)
 
 
-class ServiceImageUploadView(generics.CreateAPIView):
+class ServiceImageUploadView(ChunkedUploadMixin, generics.CreateAPIView):
     serializer_class = ServiceImageSerializer
     permission_classes = [permissions.IsAuthenticated]
-    parser_classes = (MultiPartParser, FormParser)
+    parser_classes = (MultiPartParser, FormParser, OrjsonParser)
+    # También acepta {"upload": id} de una subida por partes (servic/uploads.py)
+    upload_field = "image"
+    upload_purpose = "service_image"
 
     def get_queryset(self):
         return ServiceImage.objects.filter(service__provider=self.request.user)
 
+    def create(self, request, *args, **kwargs):
+        with self.upload_request_data(request) as (data, session):
+            serializer = self.get_serializer(data=data)
+            serializer.is_valid(raise_exception=True)
+            self.perform_create(serializer)
+            if session is not None:
+                uploads.discard(session)
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
+
     def perform_create(self, serializer):
         service_id = self.kwargs.get("service_id")
-        service = get_object_or_404(Service, id=service_id, provider=self.request.user)
+        with transaction.atomic():
+            # Bloquear el servicio: dos subidas simultáneas no eligen dos principales
+            service = get_object_or_404(
+                Service.objects.select_for_update(),
+                id=service_id,
+                provider=self.request.user,
+            )
+            # Si el servicio no tiene imagen principal, esta pasa a serlo
+            has_primary = service.images.filter(is_primary=True).exists()
+            image = serializer.save(service=service, is_primary=not has_primary)
+            if has_primary and serializer.validated_data.get("is_primary"):
+                gallery.set_primary(image)
+
+
+class ServiceImageBatchUploadView(generics.GenericAPIView):
+    """
+    Sube varias imágenes de un servicio en una sola petición (campo `images`
+    repetido). Si alguna no es válida no se guarda ninguna.
+    """
 
-        # Si es la primera imagen, marcarla como principal
-        if not service.images.exists():
-            serializer.save(service=service, is_primary=True)
-        else:
-            serializer.save(service=service)
+    serializer_class = ServiceImageSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = (MultiPartParser, FormParser)
+
+    def post(self, request, *args, **kwargs):
+        files = request.FILES.getlist("images")
+        if not files:
+            raise ValidationError({"images": ["Debe enviar al menos una imagen"]})
+        if len(files) > MAX_BATCH_IMAGES:
+            raise ValidationError(
+                {"images": [f"Se permiten hasta {MAX_BATCH_IMAGES} imágenes por vez"]}
+            )
+        with transaction.atomic():
+            # Bloquear el servicio: dos lotes simultáneos no eligen dos principales
+            service = get_object_or_404(
+                Service.objects.select_for_update(),
+                id=self.kwargs["service_id"],
+                provider=request.user,
+            )
+            # Mismas validaciones que la subida de a una, antes de escribir nada
+            serializer = self.get_serializer(
+                data=[{"image": file} for file in files], many=True
+            )
+            serializer.is_valid(raise_exception=True)
+            images = gallery.add_images(
+                service, [item["image"] for item in serializer.validated_data]
+            )
+        return Response(
+            self.get_serializer(images, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
 
 
 class ServiceImageDeleteView(generics.DestroyAPIView):
@@ -118,13 +410,11 @@ class ServiceImageDeleteView(generics.DestroyAPIView):
         return ServiceImage.objects.filter(service__provider=self.request.user)
 
     def perform_destroy(self, instance):
-        # Si es la imagen principal, marcar otra como principal
-        if instance.is_primary:
-            next_image = self.get_queryset().exclude(id=instance.id).first()
-            if next_image:
-                next_image.is_primary = True
-                next_image.save()
-        instance.delete()
+        # Si es la imagen principal, otra del mismo servicio pasa a serlo
+        try:
+            gallery.delete_image(instance)
+        except ServiceImage.DoesNotExist:
+            raise Http404
 
 
 class ServiceImageSetPrimaryView(generics.UpdateAPIView):
@@ -136,12 +426,8 @@ class ServiceImageSetPrimaryView(generics.UpdateAPIView):
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
-
-        # Desmarcar todas las imágenes como principales
-        self.get_queryset().filter(service=instance.service).update(is_primary=False)
-
-        # Marcar la imagen seleccionada como principal
-        instance.is_primary = True
-        instance.save()
-
+        try:
+            gallery.set_primary(instance)
+        except ServiceImage.DoesNotExist:
+            raise Http404
         return Response(self.get_serializer(instance).data)
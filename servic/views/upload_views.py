@@ -0,0 +1,90 @@
+from django.http import Http404
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from .. import uploads
+from ..models import UploadSession
+from ..serializers import UploadSessionSerializer
+
+
+class UploadSessionCreateView(generics.CreateAPIView):
+    """
+    Inicia una subida por partes: el cliente declara nombre, tipo y tamaño
+    total, y luego envía el contenido por rangos a UploadSessionView.
+    """
+
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_create(self, serializer):
+        session = serializer.save(
+            user=self.request.user, expires_at=uploads.expiration()
+        )
+        uploads.create_part(session)
+
+
+class UploadSessionView(generics.RetrieveDestroyAPIView):
+    """
+    GET informa cuántos bytes se recibieron (para reanudar), PUT agrega el
+    rango indicado en Content-Range y DELETE cancela la subida.
+    """
+
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+
+    def put(self, request, *args, **kwargs):
+        session = self.get_object()
+        content_range = uploads.parse_content_range(
+            request.headers.get("Content-Range")
+        )
+        if content_range is None:
+            return Response(
+                {
+                    "detail": "Se requiere el encabezado Content-Range: bytes inicio-fin/total"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        start, end, total = content_range
+        length = end - start + 1
+        if total != session.size or end >= session.size:
+            return Response(
+                {
+                    "detail": "El rango excede el tamaño declarado",
+                    "offset": session.offset,
+                },
+                status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            )
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = None
+        if content_length != length:
+            return Response(
+                {"detail": "Content-Length no coincide con el rango enviado"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            # Se lee el cuerpo como flujo, sin pasar por los parsers
+            session = uploads.write_range(session.pk, start, request.stream, length)
+        except uploads.OffsetMismatch as exc:
+            return Response(
+                {"detail": "El rango no continúa lo ya recibido", "offset": exc.offset},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except uploads.UploadInProgress as exc:
+            return Response(
+                {
+                    "detail": "Otra parte de esta subida se está recibiendo",
+                    "offset": exc.offset,
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        except UploadSession.DoesNotExist:
+            raise Http404
+        return Response(self.get_serializer(session).data)
+
+    def perform_destroy(self, instance):
+        uploads.discard(instance)
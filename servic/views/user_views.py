@@ -2,6 +2,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from ..models import User, UserRoleChangeLog
+from ..etags import UserProfileETagMixin
 from ..serializers import (
     UserProfileSerializer,
     UserRoleChangeSerializer,
@@ -9,7 +10,7 @@ from ..serializers import (
 )
 
 
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class UserProfileView(UserProfileETagMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
 
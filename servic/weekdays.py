@@ -0,0 +1,49 @@
+import unicodedata
+
+# Días de la semana en el orden de datetime.weekday() (lunes = 0).
+# La disponibilidad de un servicio se guarda como máscara de bits: bit i = día i.
+DAY_NAMES = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+
+ALL_DAYS_MASK = (1 << len(DAY_NAMES)) - 1
+
+
+def _normalize(name):
+    name = unicodedata.normalize("NFKD", name.strip().lower())
+    return "".join(c for c in name if not unicodedata.combining(c))
+
+
+_DAY_BITS = {_normalize(name): 1 << i for i, name in enumerate(DAY_NAMES)}
+
+
+def day_bit(name):
+    """Bit de un día por nombre ("Miércoles", "miercoles"...), o None si no es válido"""
+    return _DAY_BITS.get(_normalize(name))
+
+
+def weekday_bit(weekday):
+    """Bit del día de datetime.weekday()"""
+    return 1 << weekday
+
+
+def mask_from_days(days):
+    """Convierte "Lunes,Martes" en máscara. Lanza ValueError con días inválidos"""
+    mask = 0
+    for name in days.split(","):
+        bit = day_bit(name)
+        if bit is None:
+            raise ValueError(name)
+        mask |= bit
+    return mask
+
+
+def days_from_mask(mask):
+    """Convierte una máscara en "Lunes,Martes" (orden de la semana)"""
+    return ",".join(name for i, name in enumerate(DAY_NAMES) if mask & (1 << i))
+
+
+# Todas las máscaras que incluyen cada bit: permiten expresar "incluye el día"
+# como un IN sobre la columna indexada en lugar de una operación bit a bit
+MASKS_WITH_BIT = {
+    1 << i: tuple(m for m in range(ALL_DAYS_MASK + 1) if m & (1 << i))
+    for i in range(len(DAY_NAMES))
+}
@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "servic.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -134,8 +135,115 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # JSON con orjson (mismos bytes que el renderer de DRF) y MessagePack con
+    # Accept: application/msgpack
+    "DEFAULT_RENDERER_CLASSES": (
+        "servic.renderers.OrjsonRenderer",
+        "servic.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "servic.parsers.OrjsonParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "servic.pagination.CreatedAtCursorPagination",
+    "PAGE_SIZE": 20,
+}
+
+# Caché
+# "catalog" guarda las respuestas del catálogo público (listado y detalle de
+# servicios); se invalida por señales, TIMEOUT es el TTL en segundos y
+# MAX_ENTRIES el tamaño máximo antes de descartar entradas (solo LocMemCache).
+# Con varios procesos (gunicorn) tiene que ser compartida: CATALOG_CACHE_URL
+# acepta redis://host:6379/0 o memcached://host:11211. Sin URL se usa una
+# caché en memoria por proceso, válida solo en desarrollo (check --deploy
+# la rechaza, ver servic/checks.py).
+CATALOG_CACHE_URL = os.environ.get("CATALOG_CACHE_URL", "")
+
+
+def catalog_cache(url):
+    timeout = int(os.environ.get("CATALOG_CACHE_TIMEOUT", 60))
+    if url.startswith(("redis://", "rediss://")):
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": url,
+            "TIMEOUT": timeout,
+        }
+    if url.startswith("memcached://"):
+        return {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": url.removeprefix("memcached://"),
+            "TIMEOUT": timeout,
+        }
+    return {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "servic-catalog",
+        "TIMEOUT": timeout,
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("CATALOG_CACHE_MAX_ENTRIES", 1000)),
+        },
+    }
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "catalog": catalog_cache(CATALOG_CACHE_URL),
 }
 
+# Motor de búsqueda del catálogo de servicios
+# - servic.search.postgres.PostgresSearchBackend: tsvector + GIN con ranking (producción)
+# - servic.search.memory.InMemorySearchBackend: índice invertido en memoria (tests / un solo proceso)
+SERVICE_SEARCH_BACKEND = os.environ.get(
+    "SERVICE_SEARCH_BACKEND", "servic.search.postgres.PostgresSearchBackend"
+)
+
+# Autocompletado (servic/autocomplete.py): cada proceso compara su copia del
+# índice con la versión compartida a lo sumo una vez cada tantos milisegundos
+AUTOCOMPLETE_SYNC_INTERVAL_MS = int(
+    os.environ.get("AUTOCOMPLETE_SYNC_INTERVAL_MS", 500)
+)
+
+# Listados de servicios y contratos serializados desde .values() con
+# conversores precompilados (ver servic/serializers/values.py)
+FAST_LIST_SERIALIZATION = os.environ.get(
+    "FAST_LIST_SERIALIZATION", "False"
+).lower() in ("1", "true", "yes")
+
+# Compresión de respuestas de la API (servic/middleware/compression_middleware.py)
+# Niveles por algoritmo y, opcionalmente, por nombre de URL; None desactiva el
+# algoritmo en esa ruta. Las métricas por ruta se ven en el panel de admin.
+COMPRESSION_PATH_PREFIX = "/api/"
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 512))
+COMPRESSION_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+COMPRESSION_ROUTE_LEVELS = {
+    # Listados grandes y repetitivos: más nivel compensa
+    "list-contracts": {"zstd": 6, "br": 5},
+    "admin-service-list": {"zstd": 6, "br": 5},
+}
+
+# Versiones reducidas de las imágenes de servicios (servic/renditions.py):
+# lado máximo en píxeles por tamaño, calidad JPEG/WebP y procesos del pool
+# (0 las genera dentro de la petición, útil en tests)
+IMAGE_RENDITION_SIZES = {"thumb": 160, "card": 480, "large": 1200}
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_RENDITION_WORKERS = int(os.environ.get("IMAGE_RENDITION_WORKERS", 2))
+
+# Subidas por partes (servic/uploads.py): tamaño máximo (el mismo de los
+# validadores de imágenes y certificados) y horas sin actividad antes de borrarlas
+CHUNKED_UPLOAD_MAX_SIZE = 5 * 1024 * 1024
+CHUNKED_UPLOAD_EXPIRATION_HOURS = 24
+
+# Entrega de archivos media (servic/media.py). Con "x-accel-redirect" (nginx)
+# o "x-sendfile" (Apache, lighttpd) Django solo autoriza y el proxy envía el
+# archivo; sin backend se envía con FileResponse.
+MEDIA_SENDFILE_BACKEND = os.environ.get("MEDIA_SENDFILE_BACKEND") or None
+# Location interna de nginx con alias a MEDIA_ROOT
+MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+MEDIA_CACHE_MAX_AGE = 24 * 60 * 60
+
 # JWT settings
 from datetime import timedelta
 